@@ -11,6 +11,7 @@ from dataclasses import dataclass, field
 
 from backend.kaspa.wallet import KaspaWallet, KaspaAddress
 from backend.kaspa.transaction import SwarmMessage
+from backend.swarm.blob_store import BlobStore, get_blob_store
 
 
 @dataclass
@@ -49,6 +50,10 @@ class BaseAgent(ABC):
         self.running = False
         self.message_queue: asyncio.Queue = asyncio.Queue()
         self.orchestrator = None  # Will be set by orchestrator
+        self.scheduler = None  # Set when run by the AgentScheduler instead of start()
+        self.blobs: BlobStore = get_blob_store()  # Large task inputs, by digest
+        self.stats_listener = None  # Swarm totals to notify when our stats change
+        self._stats: Optional[Dict] = None
         
     async def initialize(self):
         """Set up agent wallet and start monitoring."""
@@ -89,6 +94,12 @@ class BaseAgent(ABC):
     async def receive_message(self, message: SwarmMessage):
         """Called by orchestrator to deliver messages to agent."""
         await self.message_queue.put(message)
+        if self.scheduler is not None:
+            self.scheduler.wake(self)
+    
+    def on_scheduled(self):
+        """Arm timers for periodic work when run by the scheduler (instead of decision_loop)."""
+        pass
     
     @abstractmethod
     async def process_message(self, message: SwarmMessage):
@@ -104,35 +115,64 @@ class BaseAgent(ABC):
         self,
         to_address: str,
         message: SwarmMessage
-    ) -> str:
-        """Send message to another agent or broadcast."""
+    ) -> asyncio.Future:
+        """
+        Send message to another agent or broadcast.
+        
+        The transaction is queued on the wallet's submission pipeline rather
+        than awaited, so the agent keeps deciding while it drains. Returns a
+        future resolving to the transaction ID (or a "failed_*" code).
+        """
         from backend.kaspa.transaction import TransactionEncoder
         
-        amount = TransactionEncoder.encode_message(message)
+        # The message travels in the payload; the amount is just the dust minimum
+        payload = TransactionEncoder.encode_payload(message)
         
-        # DEBUG
-        print(f"DEBUG: calling send_transaction. wallet type: {type(self.wallet)}")
-        print(f"DEBUG: send_transaction varnames: {self.wallet.send_transaction.__code__.co_varnames}")
-
-        # Send through blockchain
-        tx_id = await self.wallet.send_transaction(
+        # Queue through blockchain (waits only if the pipeline is backed up)
+        tx_future = await self.wallet.submit_transaction(
             from_addr=self.state.address,
             to_addr=to_address,
-            amount=amount
+            amount=TransactionEncoder.BASE_AMOUNT,
+            label=message.msg_type.name.lower(),
+            payload=payload
         )
         
         # If we have an orchestrator (mock mode), also route through it
         if self.orchestrator:
-            await self.orchestrator.broadcast_message(message, self)
+            await self.orchestrator.broadcast_message(message, self, to_address)
         
-        return tx_id
+        return tx_future
     
     async def stop(self):
         """Stop the agent."""
         self.running = False
     
     def get_stats(self) -> Dict:
-        """Get agent statistics for monitoring."""
+        """
+        Get agent statistics for monitoring.
+        
+        The record is cached and updated in place by refresh_stats(), so it
+        costs nothing to read however often the dashboard polls.
+        """
+        if self._stats is None:
+            self._stats = self._build_stats()
+        return self._stats
+    
+    def refresh_stats(self):
+        """Update the stats record after a state change and report it to the swarm totals."""
+        if self._stats is None:
+            self._stats = self._build_stats()
+            return
+        old_active = self._stats["active_tasks"]
+        old_completed = self._stats["completed_tasks"]
+        self._stats.update(self._build_stats())
+        if self.stats_listener is not None:
+            self.stats_listener.changed(
+                self._stats["active_tasks"] - old_active,
+                self._stats["completed_tasks"] - old_completed,
+            )
+    
+    def _build_stats(self) -> Dict:
         return {
             "agent_id": self.state.agent_id,
             "role": self.state.role,
@@ -13,12 +13,14 @@ Coordinators are responsible for:
 import asyncio
 import random
 import time
-from typing import Dict
+from typing import Dict, Optional
 
 from backend.agents.base_agent import BaseAgent
 from backend.kaspa.wallet import KaspaWallet
 from backend.kaspa.transaction import MessageType, SwarmMessage, TransactionEncoder
+from backend.swarm.bus import task_topic
 from backend.swarm.task_types import Task, TaskType, verify_solution
+from backend.swarm.timer_wheel import Timer, TimerWheel
 
 
 class CoordinatorAgent(BaseAgent):
@@ -33,32 +35,51 @@ class CoordinatorAgent(BaseAgent):
         self.broadcast_address = TransactionEncoder.create_broadcast_address()
         self.min_interval = 5.0  # Configurable task frequency
         self.max_interval = 15.0
+        self.bidding_window = 10.0  # Seconds of bidding before assignment
+        self.solution_grace = 2.0   # Buffer past the deadline for network/processing delay
+        self.task_timers: Dict[int, Timer] = {}  # Pending lifecycle timer per task
+        self._timers: Optional[TimerWheel] = None   # Own wheel when running without an orchestrator
         
     async def decision_loop(self):
         """Periodically create and post tasks."""
         while self.running:
             # Wait random interval (configurable)
             await asyncio.sleep(random.uniform(self.min_interval, self.max_interval))
-            
-            # Generate new task
-            task = self.generate_task()
-            self.active_tasks[task.task_id] = task
-            
-            # Log task creation to orchestrator
-            if self.orchestrator:
-                self.orchestrator.log_task_event(task.task_id, "created", {
-                    "description": task.description,
-                    "reward": task.reward,
-                    "coordinator": self.state.agent_id,
-                    "task_type": task.task_type.value
-                })
-            
-            # Broadcast task to swarm
-            await self.broadcast_task(task)
-            
-            # Start task assignment process
-            asyncio.create_task(self.handle_task_lifecycle(task))
-            
+            await self.post_task()
+    
+    def on_scheduled(self):
+        self.scheduler.call_later(random.uniform(self.min_interval, self.max_interval), self._post_task_timer)
+    
+    async def _post_task_timer(self):
+        # Re-arm first so a failing post doesn't stop the schedule
+        if self.scheduler is None:
+            return
+        self.scheduler.call_later(random.uniform(self.min_interval, self.max_interval), self._post_task_timer)
+        if self.running:
+            await self.post_task()
+    
+    async def post_task(self) -> Task:
+        """Create a task, announce it and start its lifecycle."""
+        # Generate new task
+        task = self.generate_task()
+        self.active_tasks[task.task_id] = task
+        
+        # Log task creation to orchestrator
+        if self.orchestrator:
+            self.orchestrator.log_task_event(task.task_id, "created", {
+                "description": task.description,
+                "reward": task.reward,
+                "coordinator": self.state.agent_id,
+                "task_type": task.task_type.value
+            })
+        
+        # Broadcast task to swarm
+        await self.broadcast_task(task)
+        
+        # Start task assignment process
+        self.start_lifecycle(task)
+        return task
+    
     def generate_task(self) -> Task:
         """
         Generate a task for the swarm.
@@ -128,20 +149,41 @@ class CoordinatorAgent(BaseAgent):
             data={
                 "description": task.description,
                 "task_type": task.task_type.value,
-                "input_data": task.input_data,
+                # Large datasets travel as blob references, not inline
+                "input_data": await self.blobs.offload(task.input_data),
                 "reward": task.reward,
                 "deadline": task.deadline
             },
             timestamp=int(time.time())
         )
         
+        # Open the task's topic first so bids racing the announcement are routed here
+        if self.orchestrator:
+            self.orchestrator.bus.subscribe(task_topic(self.state.address.address, task.task_id), self)
+        
         await self.send_message(self.broadcast_address, message)
         print(f"📢 Task {task.task_id} announced by {self.state.agent_id}")
     
-    async def handle_task_lifecycle(self, task: Task):
-        """Manage task from announcement to completion."""
-        # Wait for bidding period (10 seconds)
-        await asyncio.sleep(10)
+    @property
+    def timers(self) -> TimerWheel:
+        """The swarm's shared timer wheel, or this coordinator's own outside a swarm."""
+        if self.orchestrator:
+            return self.orchestrator.timers
+        if self._timers is None:
+            self._timers = TimerWheel()
+        return self._timers
+    
+    def start_lifecycle(self, task: Task):
+        """Schedule the end of the task's bidding window on the timer wheel."""
+        self.task_timers[task.task_id] = self.timers.schedule(
+            self.bidding_window, self.close_bidding, task
+        )
+    
+    async def close_bidding(self, task: Task):
+        """Bidding window over: assign to the best bidder, or fail the task."""
+        self.task_timers.pop(task.task_id, None)
+        if task.completed or task.task_id not in self.active_tasks:
+            return
         
         # Assign to best bidder
         if task.bids:
@@ -171,20 +213,32 @@ class CoordinatorAgent(BaseAgent):
             )
             await self.send_message(best_bid['agent'], assignment_message)
             
-            # Wait for solution
-            remaining_time = task.deadline - time.time()
-            if remaining_time > 0:
-                await asyncio.sleep(remaining_time)
-            
-            # Give a small buffer for network/processing delay
-            await asyncio.sleep(2.0)
+            # Wait for solution, plus a small buffer for network/processing delay
+            if not task.completed and task.task_id in self.active_tasks:
+                self.task_timers[task.task_id] = self.timers.schedule(
+                    max(task.deadline - time.time(), 0) + self.solution_grace, self.expire_task, task
+                )
+            return
         
-        # Check if task was completed
+        await self.expire_task(task)
+    
+    async def expire_task(self, task: Task):
+        """Deadline passed: fail the task unless it was completed."""
+        self.task_timers.pop(task.task_id, None)
         if not task.completed:
             if self.orchestrator:
                 self.orchestrator.log_task_event(task.task_id, "failed", {})
             print(f"⏰ Task {task.task_id} expired without solution")
-            del self.active_tasks[task.task_id]
+            self.close_task(task)
+    
+    def close_task(self, task: Task):
+        """Forget a finished task; late bids and solutions for it are dropped by the bus."""
+        self.active_tasks.pop(task.task_id, None)
+        timer = self.task_timers.pop(task.task_id, None)
+        if timer is not None:
+            timer.cancel()
+        if self.orchestrator:
+            self.orchestrator.bus.drop(task_topic(self.state.address.address, task.task_id))
     
     async def process_message(self, message: SwarmMessage):
         """Process bids and solutions from solvers."""
@@ -200,7 +254,7 @@ class CoordinatorAgent(BaseAgent):
         
         task = self.active_tasks[message.task_id]
         
-        if task.completed or task.is_expired():
+        if task.completed or task.is_expired(self.orchestrator.timers.clock if self.orchestrator else None):
             return
         
         bid_amount = message.data.get("bid", 0)
@@ -238,14 +292,15 @@ class CoordinatorAgent(BaseAgent):
                         "solver": message.sender
                     })
                 
-                # Send reward
-                await self.wallet.send_transaction(
-                    from_address=self.state.address,
-                    to_address=message.sender,
-                    amount_sompi=task.reward
+                # Send reward (queued on the submission pipeline)
+                await self.wallet.submit_transaction(
+                    from_addr=self.state.address,
+                    to_addr=message.sender,
+                    amount=task.reward,
+                    label="reward"
                 )
                 
                 print(f"🎉 Task {task.task_id} completed! Solution: {solution} | Reward sent to {message.sender[:20]}...")
                 
                 # Clean up
-                del self.active_tasks[task.task_id]
+                self.close_task(task)
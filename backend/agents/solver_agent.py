@@ -41,13 +41,16 @@ class SolverAgent(BaseAgent):
         """Continuously evaluate and work on tasks."""
         while self.running:
             await asyncio.sleep(2)
-            
-            # Work on assigned tasks
-            for task_id in list(self.state.active_tasks):
-                if task_id in self.assigned_tasks:
-                    asyncio.create_task(self.work_on_task(task_id))
-                    # Remove from active list to avoid duplicate work
-                    self.state.active_tasks.remove(task_id)
+            self.start_assigned_work()
+    
+    def start_assigned_work(self):
+        """Start working on every active task that has been assigned."""
+        for task_id in list(self.state.active_tasks):
+            if task_id in self.assigned_tasks:
+                asyncio.create_task(self.work_on_task(task_id))
+                # Remove from active list to avoid duplicate work
+                self.state.active_tasks.remove(task_id)
+                self.refresh_stats()
     
     async def process_message(self, message: SwarmMessage):
         """Process task announcements and assignments."""
@@ -59,10 +62,13 @@ class SolverAgent(BaseAgent):
     async def handle_assignment(self, message: SwarmMessage):
         """Handle task assignment."""
         task_id = message.task_id
-        if task_id in self.available_tasks:
+        # Bids are worked on optimistically, so the task may already be done
+        if task_id in self.available_tasks and task_id in self.state.active_tasks:
             # Move from available to assigned
             self.assigned_tasks[task_id] = self.available_tasks[task_id]
             print(f"📥 {self.state.agent_id} received assignment for task {task_id}")
+            if self.scheduler is not None:
+                self.start_assigned_work()
     
     async def evaluate_task(self, message: SwarmMessage):
         """Decide whether to bid on task."""
@@ -118,6 +124,11 @@ class SolverAgent(BaseAgent):
         if task_id not in self.state.active_tasks and task_id not in self.assigned_tasks:
             self.state.active_tasks.append(task_id)
             self.assigned_tasks[task_id] = self.available_tasks.get(task_id, {})
+        self.refresh_stats()
+        
+        # Scheduled agents have no polling loop: start straight away
+        if self.scheduler is not None:
+            self.start_assigned_work()
     
     async def work_on_task(self, task_id: int):
         """
@@ -166,6 +177,17 @@ class SolverAgent(BaseAgent):
             coordinator_address=""
         )
         
+        # Fetch offloaded inputs only now that we're actually working on it
+        try:
+            temp_task.input_data = await self.blobs.resolve(temp_task.input_data)
+        except KeyError as e:
+            print(f"❌ {self.state.agent_id} can't load input for task {task_id}: {e}")
+            self.assigned_tasks.pop(task_id, None)
+            if task_id in self.state.active_tasks:
+                self.state.active_tasks.remove(task_id)
+                self.refresh_stats()
+            return
+        
         solution = solve_task(temp_task)
         
         print(f"💡 {self.state.agent_id} found solution for task {task_id}: {solution}")
@@ -182,6 +204,7 @@ class SolverAgent(BaseAgent):
             self.state.active_tasks.remove(task_id)
         self.state.completed_tasks += 1
         self.state.successful_bids += 1
+        self.refresh_stats()
         
         # Increase reputation
         self.reputation = min(200.0, self.reputation + 1.5)
@@ -200,9 +223,9 @@ class SolverAgent(BaseAgent):
         
         print(f"📤 {self.state.agent_id} submitted solution for task {task_id}")
     
-    def get_stats(self) -> Dict:
+    def _build_stats(self) -> Dict:
         """Override to include skill_level and specialization."""
-        stats = super().get_stats()
+        stats = super()._build_stats()
         stats["skill_level"] = self.skill_level
         stats["specialization"] = self.specialization
         return stats
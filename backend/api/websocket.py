@@ -9,14 +9,17 @@ Provides:
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import asyncio
-import json
 from typing import List
 import os
 
+from backend.kaspa import codec
 from backend.swarm.protocol import SwarmOrchestrator
 from backend.kaspa.wallet import KaspaWallet
+from backend.kaspa.simnet import SimulatedLedger
+from backend.swarm.blob_store import get_blob_store
+from backend.swarm.sharding import ShardedSwarm
 
 
 app = FastAPI(
@@ -74,7 +77,7 @@ class SwarmBroadcaster:
         while self.running:
             if self.manager.active_connections:
                 stats = self.orchestrator.get_swarm_stats()
-                message = json.dumps({
+                message = codec.dumps({
                     "type": "swarm_update",
                     "data": stats
                 })
@@ -106,15 +109,153 @@ async def get_coordinator_balance():
     """Get the coordinator's balance from the swarm state."""
     try:
         if orchestrator:
-            for agent in orchestrator.agents:
-                if agent.state.role == "coordinator" and agent.state.address:
-                    balance_sompi = agent.state.address.balance
-                    balance_kas = balance_sompi / 100_000_000
-                    return {"balance": balance_sompi, "balance_kas": f"{balance_kas:.2f}"}
+            agent = orchestrator.agents.first("coordinator")
+            if agent and agent.state.address:
+                balance_sompi = agent.state.address.balance
+                balance_kas = balance_sompi / 100_000_000
+                return {"balance": balance_sompi, "balance_kas": f"{balance_kas:.2f}"}
     except Exception:
         pass
     return {"balance": 0, "balance_kas": "0.00"}
 
+@app.get("/api/endpoints")
+async def get_endpoint_health():
+    """Get per-endpoint latency, error rate and circuit state for wRPC/REST fallbacks."""
+    if not wallet:
+        return JSONResponse(status_code=503, content={"error": "Wallet not initialized"})
+    snapshot = wallet.endpoints.snapshot()
+    rpc = wallet.connections.rpc
+    snapshot["rpc_pool"] = rpc.stats() if rpc else None
+    return snapshot
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Get per-method call counts, latency percentiles, error kinds and in-flight gauges."""
+    if not wallet:
+        return JSONResponse(status_code=503, content={"error": "Wallet not initialized"})
+    rpc = wallet.connections.rpc
+    return {
+        "wallet": wallet.metrics.snapshot(),
+        "rpc": rpc.metrics.snapshot() if rpc else None,
+        "gauges": {
+            "rpc_pending_requests": rpc.pending_requests if rpc else 0,
+            "pipeline_in_flight": wallet.pipeline.in_flight if wallet.pipeline else 0,
+            "confirmations_pending": len(wallet.tracker.pending),
+        },
+    }
+
+@app.get("/api/pipeline")
+async def get_pipeline_stats():
+    """Get transaction submission pipeline depth, throughput and latency."""
+    if not wallet:
+        return JSONResponse(status_code=503, content={"error": "Wallet not initialized"})
+    if not wallet.pipeline:
+        return {"submitted": 0, "in_flight": 0}
+    return wallet.pipeline.stats()
+
+@app.get("/api/confirmations")
+async def get_confirmation_stats():
+    """Get transaction acceptance tracking and submit→accept latency per message type."""
+    if not wallet:
+        return JSONResponse(status_code=503, content={"error": "Wallet not initialized"})
+    return wallet.tracker.stats()
+
+@app.get("/api/ingestion")
+async def get_ingestion_stats():
+    """Get on-chain message ingestion counters (CHAIN_INGESTION=true only)."""
+    if not orchestrator or not orchestrator.ingestor:
+        return JSONResponse(status_code=404, content={"error": "Chain ingestion not enabled"})
+    return orchestrator.ingestor.stats()
+
+@app.get("/api/bus")
+async def get_bus_stats():
+    """Get task-scoped routing counters (open task topics, delivered and unrouted messages)."""
+    if not orchestrator:
+        return JSONResponse(status_code=503, content={"error": "Swarm not initialized"})
+    if isinstance(orchestrator, ShardedSwarm):
+        return JSONResponse(status_code=404, content={"error": "Kept per shard in sharded mode"})
+    return orchestrator.bus.stats()
+
+@app.get("/api/shards")
+async def get_shard_stats():
+    """Get shard hub routing counters and connected workers (SWARM_SHARDS > 1 only)."""
+    if not isinstance(orchestrator, ShardedSwarm):
+        return JSONResponse(status_code=404, content={"error": "Swarm is not sharded"})
+    return orchestrator.hub.stats()
+
+@app.get("/api/remote-workers")
+async def get_remote_workers():
+    """Get connected worker nodes with their solvers, credits and queue depth."""
+    if isinstance(orchestrator, ShardedSwarm) or not orchestrator or not orchestrator.remote:
+        return JSONResponse(status_code=404, content={"error": "Remote workers not enabled"})
+    return orchestrator.remote.stats()
+
+@app.get("/api/scheduler")
+async def get_scheduler_stats():
+    """Get agent scheduler wakeups, handled messages and timers (AGENT_SCHEDULER=true only)."""
+    if isinstance(orchestrator, ShardedSwarm) or not orchestrator or not orchestrator.scheduler:
+        return JSONResponse(status_code=404, content={"error": "Agent scheduler not enabled"})
+    return orchestrator.scheduler.stats()
+
+@app.get("/api/timers")
+async def get_timer_stats():
+    """Get timer wheel stats: pending task deadlines and bidding windows, fired and cancelled timers."""
+    if not orchestrator:
+        return JSONResponse(status_code=503, content={"error": "Swarm not initialized"})
+    if isinstance(orchestrator, ShardedSwarm):
+        return JSONResponse(status_code=404, content={"error": "Kept per shard in sharded mode"})
+    return orchestrator.timers.stats()
+
+@app.get("/api/tasks")
+async def get_tasks(limit: int = 50):
+    """Get the most recent tasks with their lifecycle events."""
+    if not orchestrator:
+        return JSONResponse(status_code=503, content={"error": "Swarm not initialized"})
+    if isinstance(orchestrator, ShardedSwarm):
+        return JSONResponse(status_code=404, content={"error": "Kept per shard in sharded mode"})
+    return {"tasks": orchestrator.task_history.recent(limit), "stats": orchestrator.task_history.stats()}
+
+@app.get("/api/tasks/archive")
+async def get_archived_tasks(offset: int = 0, limit: int = 50):
+    """Page through tasks evicted from the in-memory history, newest first."""
+    if not orchestrator:
+        return JSONResponse(status_code=503, content={"error": "Swarm not initialized"})
+    if isinstance(orchestrator, ShardedSwarm):
+        return JSONResponse(status_code=404, content={"error": "Kept per shard in sharded mode"})
+    return orchestrator.task_history.archived(offset, limit)
+
+@app.get("/api/tasks/{task_id}")
+async def get_task(task_id: int):
+    """Get one task's lifecycle, from memory or the archive."""
+    if not orchestrator:
+        return JSONResponse(status_code=503, content={"error": "Swarm not initialized"})
+    if isinstance(orchestrator, ShardedSwarm):
+        return JSONResponse(status_code=404, content={"error": "Kept per shard in sharded mode"})
+    entry = orchestrator.task_history.get(task_id)
+    if entry is None:
+        return JSONResponse(status_code=404, content={"error": "Task not found"})
+    return entry
+
+@app.get("/api/blobs")
+async def get_blob_stats():
+    """Get blob store size, dedup and cache hit counters."""
+    return get_blob_store().stats()
+
+@app.get("/api/blobs/{digest}")
+async def get_blob(digest: str):
+    """Fetch a task input blob by its SHA-256 digest."""
+    data = await get_blob_store().get(digest)
+    if data is None:
+        return JSONResponse(status_code=404, content={"error": "Blob not found"})
+    return Response(content=data, media_type="application/json")
+
+@app.get("/api/ledger")
+async def get_ledger_stats():
+    """Get simulated ledger state (mock mode with MOCK_LEDGER=true only)."""
+    if not wallet or not wallet.ledger:
+        return JSONResponse(status_code=404, content={"error": "Simulated ledger not enabled"})
+    return wallet.ledger.stats()
+
 @app.on_event("startup")
 async def startup():
     """Initialize swarm on startup."""
@@ -126,16 +267,55 @@ async def startup():
     num_solvers = int(os.getenv("NUM_SOLVERS", "8"))
     rpc_url = os.getenv("KASPA_RPC_URL", "https://api.kaspa.org")
     
+    # Optional in-process ledger so mock mode exercises real transactions
+    ledger = None
+    if mock_mode and os.getenv("MOCK_LEDGER", "false").lower() == "true":
+        ledger = SimulatedLedger(
+            bps=float(os.getenv("MOCK_LEDGER_BPS", "10")),
+            acceptance_delay=float(os.getenv("MOCK_LEDGER_ACCEPTANCE_DELAY", "1.0")),
+            verify_signatures=os.getenv("MOCK_LEDGER_VERIFY_SIGNATURES", "false").lower() == "true",
+        )
+        ledger.start()
+        print(f"🧪 Simulated ledger active ({ledger.bps:g} BPS)")
+    
     # Initialize wallet
-    wallet = KaspaWallet(rpc_url=rpc_url, mock_mode=mock_mode)
+    wallet = KaspaWallet(rpc_url=rpc_url, mock_mode=mock_mode, ledger=ledger)
     
-    # Initialize orchestrator
-    orchestrator = SwarmOrchestrator(
-        wallet=wallet,
-        num_coordinators=num_coordinators,
-        num_solvers=num_solvers,
-        mock_mode=mock_mode
-    )
+    # Initialize orchestrator (sharded: agents run in worker processes)
+    shards = int(os.getenv("SWARM_SHARDS", "1"))
+    if shards > 1:
+        orchestrator = ShardedSwarm(
+            shard_count=shards,
+            num_coordinators=num_coordinators,
+            num_solvers=num_solvers,
+            mock_mode=mock_mode,
+            socket_path=os.getenv("SWARM_SHARD_SOCKET") or None,
+            shard_config={
+                "rpc_url": rpc_url,
+                "balance_refresh_interval": float(os.getenv("BALANCE_REFRESH_INTERVAL", "10")),
+                "balance_refresh_chunk": int(os.getenv("BALANCE_REFRESH_CHUNK_SIZE", "500")),
+                "task_history_size": int(os.getenv("TASK_HISTORY_SIZE", "1000")),
+                "task_archive_path": os.getenv("TASK_ARCHIVE_PATH") or None,
+                "use_scheduler": os.getenv("AGENT_SCHEDULER", "false").lower() == "true",
+            },
+        )
+    else:
+        orchestrator = SwarmOrchestrator(
+            wallet=wallet,
+            num_coordinators=num_coordinators,
+            num_solvers=num_solvers,
+            mock_mode=mock_mode,
+            balance_refresh_interval=float(os.getenv("BALANCE_REFRESH_INTERVAL", "10")),
+            balance_refresh_chunk=int(os.getenv("BALANCE_REFRESH_CHUNK_SIZE", "500")),
+            chain_ingestion=os.getenv("CHAIN_INGESTION", "false").lower() == "true",
+            task_history_size=int(os.getenv("TASK_HISTORY_SIZE", "1000")),
+            task_archive_path=os.getenv("TASK_ARCHIVE_PATH") or None,
+            remote_workers_port=int(os.getenv("REMOTE_WORKERS_PORT", "0")),
+            remote_workers_host=os.getenv("REMOTE_WORKERS_HOST", "0.0.0.0"),
+            remote_workers_token=os.getenv("REMOTE_WORKERS_TOKEN") or None,
+            use_scheduler=os.getenv("AGENT_SCHEDULER", "false").lower() == "true",
+            scheduler_workers=int(os.getenv("AGENT_SCHEDULER_WORKERS", "32")),
+        )
     
     await orchestrator.initialize_swarm()
     
@@ -304,7 +484,7 @@ async def websocket_endpoint(websocket: WebSocket):
         # Send initial state
         if orchestrator:
             stats = orchestrator.get_swarm_stats()
-            await websocket.send_text(json.dumps({
+            await websocket.send_text(codec.dumps({
                 "type": "initial_state",
                 "data": stats
             }))
@@ -315,13 +495,13 @@ async def websocket_endpoint(websocket: WebSocket):
                 # Receive messages from client (for future interactive features)
                 data = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
                 # Echo for now
-                await websocket.send_text(json.dumps({
+                await websocket.send_text(codec.dumps({
                     "type": "echo",
                     "data": data
                 }))
             except asyncio.TimeoutError:
                 # Send ping to keep connection alive
-                await websocket.send_text(json.dumps({"type": "ping"}))
+                await websocket.send_text(codec.dumps({"type": "ping"}))
     
     except WebSocketDisconnect:
         manager.disconnect(websocket)
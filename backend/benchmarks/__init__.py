@@ -0,0 +1 @@
+"""Micro-benchmarks for the swarm's hot paths (run each module with python -m)."""
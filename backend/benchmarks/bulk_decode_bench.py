@@ -0,0 +1,79 @@
+"""
+Bulk decoding of a replayed chain history: decode_batch versus calling
+decode_transaction once per row.
+
+The history mixes payload-encoded messages with legacy amount-encoded
+transactions, the way a replay across the encoding change looks. The
+per-row decoder is timed on a sample and extrapolated.
+
+Run:
+    python -m backend.benchmarks.bulk_decode_bench [--rows N] [--legacy-share F]
+"""
+
+import argparse
+import random
+import time
+
+from backend.benchmarks.payload_bench import sample_messages
+from backend.kaspa import bulk_decode
+from backend.kaspa.transaction import MessageType, TransactionEncoder
+
+
+def history(rows: int, legacy_share: float):
+    """Columns for `rows` transactions built from a pool of distinct messages."""
+    pool = sample_messages(min(rows, 20_000))
+    encoded = [TransactionEncoder.encode_payload(m) for m in pool]
+    legacy = [TransactionEncoder.encode_message(m) for m in pool]
+    rng = random.Random(3)
+    amounts, payloads, senders, timestamps = [], [], [], []
+    for i in range(rows):
+        j = i % len(pool)
+        if rng.random() < legacy_share:
+            amounts.append(legacy[j])
+            payloads.append(b"")
+        else:
+            amounts.append(TransactionEncoder.BASE_AMOUNT)
+            payloads.append(encoded[j])
+        senders.append(pool[j].sender)
+        timestamps.append(pool[j].timestamp)
+    return amounts, payloads, senders, timestamps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--legacy-share", type=float, default=0.2, help="fraction of amount-encoded rows")
+    parser.add_argument("--sample", type=int, default=50_000, help="rows timed with the per-row decoder")
+    args = parser.parse_args()
+
+    amounts, payloads, senders, timestamps = history(args.rows, args.legacy_share)
+    print(f"{args.rows:,} rows, {args.legacy_share:.0%} legacy, numpy {'on' if bulk_decode.np is not None else 'off'}")
+
+    start = time.perf_counter()
+    batch = bulk_decode.decode_batch(amounts, payloads, senders, timestamps)
+    bulk = time.perf_counter() - start
+
+    sample = min(args.sample, args.rows)
+    start = time.perf_counter()
+    for i in range(sample):
+        TransactionEncoder.decode_transaction({
+            "amount": amounts[i], "payload": payloads[i],
+            "sender": senders[i], "timestamp": timestamps[i],
+        })
+    per_row = (time.perf_counter() - start) / sample
+
+    bids = batch.rows(MessageType.TASK_BID)
+    [batch.message(i) for i in bids[:1000]]   # warm the sender address cache
+    start = time.perf_counter()
+    first = [batch.message(i) for i in bids[:1000]]
+    on_demand = (time.perf_counter() - start) / max(len(first), 1)
+
+    print(f"  {'decode_batch':<22}{bulk:>9.2f} s  {bulk / args.rows * 1e6:>7.2f} µs/row")
+    print(f"  {'decode_transaction':<22}{per_row * args.rows:>9.2f} s  {per_row * 1e6:>7.2f} µs/row (from {sample:,} rows)")
+    print(f"  speedup x{per_row * args.rows / bulk:.1f}; SwarmMessage on demand: {on_demand * 1e6:.2f} µs each")
+    print(f"  {batch.counts()}")
+    print(f"  bid total {int(sum(batch.bid[i] for i in bids)):,} sompi over {len(bids):,} bids")
+
+
+if __name__ == "__main__":
+    main()
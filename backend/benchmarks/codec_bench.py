@@ -0,0 +1,112 @@
+"""
+Encode/decode cost of each available JSON codec on realistic payloads:
+
+- the dashboard's `swarm_update` message (get_swarm_stats of a mock swarm
+  with a full task and transaction history)
+- a getUtxosByAddresses response for a batch of agent addresses
+
+Run:
+    python -m backend.benchmarks.codec_bench [--coordinators N] [--solvers N] [--utxos N]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+import timeit
+
+from backend.kaspa import codec as codec_module
+from backend.kaspa.wallet import KaspaWallet
+from backend.kaspa.simnet import SimulatedLedger
+from backend.kaspa.wrpc_client import RpcMessage
+from backend.swarm.protocol import SwarmOrchestrator
+
+
+async def swarm_update_payload(coordinators: int, solvers: int) -> dict:
+    """A swarm_update message as the broadcaster sends it, with full histories."""
+    wallet = KaspaWallet(mock_mode=True)
+    orchestrator = SwarmOrchestrator(wallet, coordinators, solvers, mock_mode=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        await orchestrator.initialize_swarm()
+
+    coordinator_agents = orchestrator.agents.role("coordinator")
+    solver_agents = orchestrator.agents.role("solver")
+    agents = list(orchestrator.agents)
+    for task_id in range(200):
+        coordinator = coordinator_agents[task_id % coordinators].state.agent_id
+        solver = solver_agents[task_id % solvers].state.agent_id
+        orchestrator.log_task_event(task_id, "created", {
+            "description": f"Find the largest prime below {task_id * 1000}",
+            "reward": 100_000, "task_type": "prime_finding", "coordinator": coordinator,
+        })
+        orchestrator.log_task_event(task_id, "assigned", {"solver": solver, "bid_amount": 90_000})
+        orchestrator.log_task_event(task_id, "completed", {"solution": task_id * 997, "solver": solver})
+    for i in range(30):
+        agent = agents[i % len(agents)]
+        orchestrator.transaction_history.append({
+            "timestamp": time.time(), "from": agent.state.agent_id,
+            "from_address": agent.state.address.address, "msg_type": 1,
+            "task_id": i, "task_type": "prime_finding",
+        })
+
+    payload = {"type": "swarm_update", "data": orchestrator.get_swarm_stats()}
+    await wallet.close()
+    return payload
+
+
+async def utxo_response_payload(addresses: int, utxos_per_address: int) -> dict:
+    """A getUtxosByAddresses response frame for a batch of funded addresses."""
+    ledger = SimulatedLedger()
+    wallet = KaspaWallet(mock_mode=True, ledger=ledger)
+    os.environ["MOCK_LEDGER_FUNDING_UTXOS"] = str(utxos_per_address)
+    with contextlib.redirect_stdout(io.StringIO()):
+        funded = [await wallet.create_address() for _ in range(addresses)]
+    entries = await ledger.get_utxos_by_addresses([a.address for a in funded])
+    await wallet.close()
+    return {"id": 1, "method": "getUtxosByAddresses", "params": {"entries": entries}}
+
+
+def per_call_us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def bench(label: str, payload: dict, number: int, typed_cls=None):
+    print(f"\n{label}  ({len(codec_module.JsonCodec().dumps(payload)) / 1024:.1f} KiB)")
+    print(f"  {'codec':<10}{'encode µs':>12}{'decode µs':>12}{'typed µs':>12}")
+    for name in codec_module.available():
+        c = codec_module.get_codec(name)
+        encoded = c.dumps(payload)
+        assert c.loads(encoded) == codec_module.JsonCodec().loads(encoded)
+        encode = per_call_us(lambda: c.dumps(payload), number)
+        decode = per_call_us(lambda: c.loads(encoded), number)
+        typed = f"{per_call_us(lambda: c.decode(encoded, typed_cls), number):.1f}" if typed_cls else "-"
+        print(f"  {name:<10}{encode:>12.1f}{decode:>12.1f}{typed:>12}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--coordinators", type=int, default=10)
+    parser.add_argument("--solvers", type=int, default=100)
+    parser.add_argument("--addresses", type=int, default=110)
+    parser.add_argument("--utxos", type=int, default=10, help="UTXOs per address")
+    parser.add_argument("--number", type=int, default=200, help="calls per timing run")
+    args = parser.parse_args()
+
+    print(f"Codecs available: {', '.join(codec_module.available())} (active: {codec_module.codec.name})")
+    bench(
+        f"swarm_update, {args.coordinators + args.solvers} agents",
+        await swarm_update_payload(args.coordinators, args.solvers),
+        args.number,
+    )
+    bench(
+        f"getUtxosByAddresses, {args.addresses} addresses x {args.utxos} UTXOs",
+        await utxo_response_payload(args.addresses, args.utxos),
+        args.number,
+        typed_cls=RpcMessage,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
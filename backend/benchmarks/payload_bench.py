@@ -0,0 +1,97 @@
+"""
+Encode/decode cost of the binary payload envelope versus the legacy amount
+encoding and a JSON payload carrying the same messages.
+
+Bulk decoding is what a chain follower does for every block, so the
+benchmark times decode_payloads over a realistic mix of announcements,
+bids, assignments and solutions (task IDs well past the old 99 ceiling).
+
+Run:
+    python -m backend.benchmarks.payload_bench [--messages N] [--number N]
+"""
+
+import argparse
+import dataclasses
+import random
+import time
+import timeit
+
+from backend.bech32_util import encode_address
+from backend.kaspa import codec
+from backend.kaspa.transaction import MessageType, SwarmMessage, TransactionEncoder
+
+
+def sample_messages(count: int, senders: int = 100) -> list:
+    rng = random.Random(7)
+    addresses = [encode_address("kaspatest", "pk", rng.randbytes(32)) for _ in range(senders)]
+    messages = []
+    for i in range(count):
+        task_id = 1_000 + i // 4
+        kind = i % 4
+        sender = addresses[rng.randrange(senders)]
+        if kind == 0:
+            data = {
+                "description": f"Find the largest prime below {task_id * 1000}",
+                "task_type": "prime_finding",
+                "input_data": {"limit": task_id * 1000},
+                "reward": 100_000,
+                "deadline": time.time() + 60,
+            }
+            msg_type = MessageType.TASK_ANNOUNCEMENT
+        elif kind == 1:
+            data, msg_type = {"bid": rng.randrange(50_000, 100_000)}, MessageType.TASK_BID
+        elif kind == 2:
+            data = {"coordinator": sender, "deadline": time.time() + 30}
+            msg_type = MessageType.TASK_ASSIGNMENT
+        else:
+            data, msg_type = {"solution": task_id * 997}, MessageType.SOLUTION_SUBMISSION
+        messages.append(SwarmMessage(
+            msg_type=msg_type, sender=sender, task_id=task_id, data=data, timestamp=time.time()
+        ))
+    return messages
+
+
+def per_message_us(fn, number: int, count: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--number", type=int, default=5, help="passes per timing run")
+    args = parser.parse_args()
+
+    messages = sample_messages(args.messages)
+    payloads = [TransactionEncoder.encode_payload(m) for m in messages]
+    json_payloads = [codec.dumps_bytes(dataclasses.asdict(m)) for m in messages]
+    amounts = [TransactionEncoder.encode_message(m) for m in messages]
+
+    decoded = TransactionEncoder.decode_payloads(payloads)
+    assert len(decoded) == len(messages)
+    assert all(d.task_id == m.task_id and d.data == m.data for d, m in zip(decoded, messages))
+
+    n = len(messages)
+    print(f"{n} messages, task IDs {messages[0].task_id}-{messages[-1].task_id}")
+    print(f"  {'encoding':<12}{'avg bytes':>10}{'encode µs':>12}{'decode µs':>12}")
+    rows = [
+        ("payload", sum(map(len, payloads)) / n,
+         lambda: [TransactionEncoder.encode_payload(m) for m in messages],
+         lambda: TransactionEncoder.decode_payloads(payloads)),
+        (f"json/{codec.codec.name}", sum(map(len, json_payloads)) / n,
+         lambda: [codec.dumps_bytes(dataclasses.asdict(m)) for m in messages],
+         lambda: [codec.loads(p) for p in json_payloads]),
+        ("amount", 0,
+         lambda: [TransactionEncoder.encode_message(m) for m in messages],
+         lambda: [TransactionEncoder.decode_transaction({"amount": a}) for a in amounts]),
+    ]
+    for label, size, encode, decode in rows:
+        print(
+            f"  {label:<12}{size:>10.0f}"
+            f"{per_message_us(encode, args.number, n):>12.2f}"
+            f"{per_message_us(decode, args.number, n):>12.2f}"
+        )
+    print("  (amount encoding loses the sender, all data fields and task IDs above 99)")
+
+
+if __name__ == "__main__":
+    main()
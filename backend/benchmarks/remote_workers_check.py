@@ -0,0 +1,134 @@
+"""
+End-to-end check of remote solver workers on localhost:
+
+- starts an orchestrator with coordinators only and a RemoteSolverServer
+- launches N `python -m backend.swarm.remote` worker processes
+- checks that every worker registers its solvers, that the remote solvers
+  complete tasks, and that killing one worker unregisters its solvers
+
+Workers run with an empty BLOB_STORE_DIR, so offloaded task inputs have to
+be fetched from the server over the worker connection.
+
+Run:
+    python -m backend.benchmarks.remote_workers_check [--workers N] [--solvers N] [--tasks N]
+Exits non-zero if a check fails.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from backend.kaspa.wallet import KaspaWallet
+from backend.swarm.protocol import SwarmOrchestrator
+from backend.swarm.remote import RemoteSolverServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_worker(port: int, worker_id: str, solvers: int) -> subprocess.Popen:
+    env = dict(os.environ, PYTHONPATH=ROOT, BLOB_STORE_DIR="", MOCK_MODE="true")
+    return subprocess.Popen(
+        [sys.executable, "-m", "backend.swarm.remote", "--host", "127.0.0.1", "--port", str(port),
+         "--solvers", str(solvers), "--worker-id", worker_id],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_for(condition, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.1)
+    return True
+
+
+async def check(workers: int, solvers: int, tasks: int, coordinators: int, timeout: float) -> list:
+    port = free_port()
+    heartbeat = 1.0
+    wallet = KaspaWallet(mock_mode=True)
+    orchestrator = SwarmOrchestrator(wallet, coordinators, 0, mock_mode=True, balance_refresh_interval=0)
+    processes = []
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        await orchestrator.initialize_swarm()
+        for coordinator in orchestrator.agents.role("coordinator"):
+            coordinator.min_interval, coordinator.max_interval = 0.5, 1.0
+        orchestrator.remote = RemoteSolverServer(orchestrator, "127.0.0.1", port, heartbeat_interval=heartbeat)
+        await orchestrator.remote.start()
+        swarm = asyncio.create_task(orchestrator.start_swarm())
+        try:
+            processes = [start_worker(port, f"w{i}", solvers) for i in range(workers)]
+
+            registered = await wait_for(
+                lambda: len(orchestrator.remote.connections) == workers
+                and orchestrator.agents.count("solver") == workers * solvers,
+                timeout,
+            )
+            results.append((
+                "registration", registered,
+                f"{len(orchestrator.remote.connections)}/{workers} workers, "
+                f"{orchestrator.agents.count('solver')}/{workers * solvers} solvers",
+            ))
+
+            completed = await wait_for(lambda: orchestrator.task_history.count("completed") >= tasks, timeout)
+            results.append((
+                "task completion", completed,
+                f"{orchestrator.task_history.count('completed')}/{tasks} tasks completed by remote solvers, "
+                f"{orchestrator.remote.blobs.stats()['hits']} blobs served",
+            ))
+
+            processes[0].send_signal(signal.SIGKILL)
+            lost = await wait_for(
+                lambda: "w0" not in orchestrator.remote.connections
+                and orchestrator.agents.count("solver") == (workers - 1) * solvers,
+                heartbeat * 3 + 5,
+            )
+            results.append((
+                "unregistration on worker loss", lost,
+                f"{orchestrator.agents.count('solver')}/{(workers - 1) * solvers} solvers left, "
+                f"{orchestrator.remote.stats()['disconnects']} disconnects",
+            ))
+        finally:
+            await orchestrator.stop_swarm()
+            swarm.cancel()
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.wait()
+            await wallet.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--solvers", type=int, default=3, help="solvers per worker")
+    parser.add_argument("--tasks", type=int, default=10, help="completed tasks to wait for")
+    parser.add_argument("--coordinators", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per check")
+    args = parser.parse_args()
+    if args.workers < 2:
+        parser.error("--workers must be at least 2 (one of them is killed)")
+
+    results = asyncio.run(check(args.workers, args.solvers, args.tasks, args.coordinators, args.timeout))
+    for name, ok, detail in results:
+        print(f"  {'PASS' if ok else 'FAIL'}  {name:<32}{detail}")
+    sys.exit(0 if results and all(ok for _, ok, _ in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Per-agent polling loops versus the event-driven AgentScheduler:
+
+- idle CPU: process CPU time per wall second with agents running and no
+  traffic at all
+- assignment-to-work latency: from delivering a TASK_ASSIGNMENT to a
+  sampled solver until it starts working on the task. Each solver is first
+  put in the state a bid leaves it in (task known and active, not yet
+  assigned), and the assignments are delivered at random offsets spread
+  over several poll periods, so the figures don't depend on where the
+  solvers' shared polling tick happens to fall. The solve itself is skipped.
+
+Run:
+    python -m backend.benchmarks.scheduler_bench [--agents 1000 10000] [--idle S] [--sample N] [--spread S]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import random
+import statistics
+import time
+
+from backend.kaspa.transaction import MessageType, SwarmMessage
+from backend.kaspa.wallet import KaspaWallet
+from backend.swarm.protocol import SwarmOrchestrator
+
+POLL_PERIOD = 2.0   # SolverAgent.decision_loop's sleep
+
+
+async def measure(agents: int, use_scheduler: bool, idle: float, sample: int, spread: float) -> dict:
+    wallet = KaspaWallet(mock_mode=True)
+    orchestrator = SwarmOrchestrator(
+        wallet, 0, agents, mock_mode=True, balance_refresh_interval=0, use_scheduler=use_scheduler
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        await orchestrator.initialize_swarm()
+        swarm = asyncio.create_task(orchestrator.start_swarm())
+        await asyncio.sleep(2.0)    # let every loop settle into its idle cycle
+
+        cpu, wall = time.process_time(), time.perf_counter()
+        await asyncio.sleep(idle)
+        idle_cpu = (time.process_time() - cpu) / (time.perf_counter() - wall)
+
+        solvers = orchestrator.agents.role("solver")
+        chosen = random.sample(solvers, min(sample, len(solvers)))
+        delivered, started = {}, {}
+        for task_id, solver in enumerate(chosen, start=1):
+            # Where a bid leaves the solver: task known and active, waiting for the assignment
+            solver.available_tasks[task_id] = {
+                "reward": 10_000, "description": "bench", "task_type": "prime_finding",
+                "input_data": {"target": 100}, "deadline": time.time() + 60, "coordinator": "kaspatest:bench",
+            }
+            solver.state.active_tasks.append(task_id)
+
+            async def work_on_task(task_id, solver=solver):
+                started.setdefault(solver, time.perf_counter())
+            solver.work_on_task = work_on_task
+
+        async def assign(solver, task_id: int, delay: float):
+            await asyncio.sleep(delay)
+            delivered[solver] = time.perf_counter()
+            await solver.receive_message(SwarmMessage(
+                msg_type=MessageType.TASK_ASSIGNMENT,
+                sender="kaspatest:bench",
+                task_id=task_id,
+                data={"coordinator": "kaspatest:bench", "deadline": time.time() + 60},
+                timestamp=int(time.time()),
+            ))
+
+        await asyncio.gather(*(
+            assign(solver, task_id, random.uniform(0, spread))
+            for task_id, solver in enumerate(chosen, start=1)
+        ))
+        deadline = time.perf_counter() + POLL_PERIOD + 3.0
+        while len(started) < len(chosen) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+
+        await orchestrator.stop_swarm()
+        swarm.cancel()
+        await wallet.close()
+
+    latencies = sorted((started[s] - delivered[s]) * 1e3 for s in started)
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "idle_cpu": idle_cpu,
+        "started": f"{len(started)}/{len(chosen)}",
+        "p50": quantiles[49] if latencies else float("nan"),
+        "p90": quantiles[89] if latencies else float("nan"),
+        "p99": quantiles[98] if latencies else float("nan"),
+        "max": latencies[-1] if latencies else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--agents", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--idle", type=float, default=5.0, help="seconds of idle CPU sampling")
+    parser.add_argument("--sample", type=int, default=200, help="solvers timed for assignment-to-work")
+    parser.add_argument("--spread", type=float, default=2 * POLL_PERIOD,
+                        help="seconds the assignments are spread over (at least one poll period)")
+    args = parser.parse_args()
+
+    print(f"  {'agents':>7}  {'mode':<10}{'idle CPU':>10}{'started':>10}"
+          f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for agents in args.agents:
+        for use_scheduler in (False, True):
+            result = asyncio.run(measure(agents, use_scheduler, args.idle, args.sample, max(args.spread, POLL_PERIOD)))
+            print(f"  {agents:>7}  {'scheduler' if use_scheduler else 'loops':<10}"
+                  f"{result['idle_cpu']:>9.1%}{result['started']:>10}"
+                  f"{result['p50']:>10.1f}{result['p90']:>10.1f}{result['p99']:>10.1f}{result['max']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+JSON codec for the wRPC and dashboard WebSocket hot paths.
+
+Uses the fastest serializer installed — orjson, then msgspec, then the
+stdlib json module — behind one interface, so callers never import a JSON
+library directly. Set JSON_CODEC=orjson|msgspec|json to force one.
+
+All codecs produce the same JSON: dataclasses become objects, sets and
+tuples become arrays, non-string dict keys are stringified.
+
+`decode(data, SomeDataclass)` decodes straight into a dataclass: msgspec
+does it in one pass, the others decode to a dict and keep the fields the
+dataclass declares (unknown keys are ignored, missing ones use defaults).
+"""
+
+import dataclasses
+import json
+import os
+from typing import Any, Dict, List, Type, TypeVar, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+T = TypeVar("T")
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types a serializer doesn't handle natively."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "tolist"):   # numpy arrays and scalars
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _build(cls: Type[T], data: Any) -> T:
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object for {cls.__name__}")
+    names = {f.name for f in dataclasses.fields(cls)}
+    return cls(**{k: v for k, v in data.items() if k in names})
+
+
+class JsonCodec:
+    """Stdlib json — always available."""
+    name = "json"
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, default=_default, separators=(",", ":"))
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        return self.dumps(obj).encode()
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def decode(self, data: Union[str, bytes], cls: Type[T]) -> T:
+        return _build(cls, self.loads(data))
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson — Rust-backed, returns bytes."""
+    name = "orjson"
+
+    def __init__(self):
+        self._option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj: Any) -> str:
+        return self.dumps_bytes(obj).decode()
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default, option=self._option)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    """msgspec — C-backed, with typed decoding into dataclasses."""
+    name = "msgspec"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder(enc_hook=_default)
+        self._decoder = msgspec.json.Decoder()
+        self._typed: Dict[type, Any] = {}
+
+    def dumps(self, obj: Any) -> str:
+        return self._encoder.encode(obj).decode()
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def decode(self, data: Union[str, bytes], cls: Type[T]) -> T:
+        decoder = self._typed.get(cls)
+        if decoder is None:
+            decoder = self._typed[cls] = msgspec.json.Decoder(cls)
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+
+_CODECS = {
+    "orjson": (OrjsonCodec, orjson),
+    "msgspec": (MsgspecCodec, msgspec),
+    "json": (JsonCodec, json),
+}
+
+
+def available() -> List[str]:
+    """Names of the codecs that can be used here, fastest first."""
+    return [name for name, (_, module) in _CODECS.items() if module is not None]
+
+
+def get_codec(name: str = "") -> JsonCodec:
+    """A codec by name, or the fastest available one."""
+    if name:
+        if name not in _CODECS:
+            raise ValueError(f"Unknown JSON codec: {name}")
+        cls, module = _CODECS[name]
+        if module is None:
+            raise ValueError(f"JSON codec {name} is not installed")
+        return cls()
+    return _CODECS[available()[0]][0]()
+
+
+codec = get_codec(os.getenv("JSON_CODEC", ""))
+
+dumps = codec.dumps
+dumps_bytes = codec.dumps_bytes
+loads = codec.loads
+decode = codec.decode
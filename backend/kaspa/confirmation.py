@@ -0,0 +1,205 @@
+"""
+Transaction confirmation tracking.
+
+Follows every transaction the wallet broadcasts until it is accepted or
+dropped, by polling the node (or the simulated ledger):
+
+- In the mempool          → still pending
+- Not in the mempool, inputs gone from the UTXO set → accepted
+- Not in the mempool, inputs still unspent          → missing; after
+  `drop_after` consecutive misses it is rebroadcast, and after
+  `max_rebroadcasts` it is declared dropped and its reserved UTXOs are
+  released back to the wallet
+
+Submit → accept latency is recorded per message type; that number is what
+the swarm's coordination SLA depends on.
+
+One poll cycle costs one getMempoolEntry per pending transaction, issued
+concurrently (at most `lookup_concurrency` at a time), plus a single
+getUtxosByAddresses for all pending senders. A lookup that fails with
+anything but "not found" leaves its transaction alone for that cycle.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from kaspa.metrics import LatencyHistogram
+
+
+PENDING = "pending"
+ACCEPTED = "accepted"
+DROPPED = "dropped"
+
+
+@dataclass
+class TrackedTransaction:
+    """A broadcast transaction awaiting acceptance."""
+    tx_id: str
+    tx_json: Dict
+    address: str                      # sender, whose UTXOs the inputs spend
+    outpoints: List[Tuple[str, int]]  # reserved inputs
+    label: str                        # message type, for per-type latency
+    submitted_at: float = field(default_factory=time.time)
+    status: str = PENDING
+    misses: int = 0
+    rebroadcasts: int = 0
+    finished_at: Optional[float] = None
+
+
+class ConfirmationTracker:
+    """Polls pending transactions to acceptance and records their latency."""
+
+    def __init__(
+        self,
+        wallet,
+        poll_interval: float = 1.0,
+        drop_after: int = 5,
+        max_rebroadcasts: int = 2,
+        history_size: int = 200,
+        lookup_concurrency: int = 32,
+    ):
+        self.wallet = wallet
+        self.poll_interval = poll_interval
+        self.drop_after = drop_after              # consecutive misses before acting
+        self.max_rebroadcasts = max_rebroadcasts
+        self.lookup_concurrency = max(1, lookup_concurrency)
+
+        self.pending: Dict[str, TrackedTransaction] = {}
+        self.recent: deque = deque(maxlen=history_size)
+        self.latency: Dict[str, LatencyHistogram] = {}
+
+        self.accepted = 0
+        self.dropped = 0
+        self.rebroadcast_count = 0
+        self.lookup_errors = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def track(self, tx_id: str, tx_json: Dict, address: str, outpoints: List[Tuple[str, int]], label: str):
+        """Start following a freshly broadcast transaction."""
+        self.pending[tx_id] = TrackedTransaction(
+            tx_id=tx_id,
+            tx_json=tx_json,
+            address=address,
+            outpoints=list(outpoints),
+            label=label or "transfer",
+        )
+        self.start()
+
+    # ── Polling ─────────────────────────────────────────────
+
+    async def _poll_loop(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self.pending:
+                continue
+            try:
+                await self.poll()
+            except Exception as e:
+                print(f"⚠️ Confirmation poll failed: {e}")
+
+    async def poll(self):
+        """Run one status check over every pending transaction."""
+        if not await self.wallet._ensure_rpc():
+            return
+        rpc = self.wallet._rpc
+        pending = list(self.pending.values())
+
+        # One batched UTXO query for every sender with something pending
+        addresses = list({t.address for t in pending})
+        entries = await rpc.get_utxos_by_addresses(addresses)
+        unspent: Set[Tuple[str, int]] = {
+            (e["outpoint"]["transactionId"], int(e["outpoint"].get("index", 0)))
+            for e in entries
+        }
+
+        limit = asyncio.Semaphore(self.lookup_concurrency)
+
+        async def lookup(tracked: TrackedTransaction) -> bool:
+            async with limit:
+                return await rpc.get_mempool_entry(tracked.tx_id) is not None
+
+        results = await asyncio.gather(*(lookup(t) for t in pending), return_exceptions=True)
+        if any(isinstance(r, (ConnectionError, TimeoutError, asyncio.TimeoutError)) for r in results):
+            return  # node unreachable — don't count this as a miss
+
+        for tracked, in_mempool in zip(pending, results):
+            if tracked.tx_id not in self.pending:
+                continue
+            if isinstance(in_mempool, BaseException):
+                # The node answered with some other error: status unknown, skip this cycle
+                self.lookup_errors += 1
+                continue
+            if in_mempool:
+                tracked.misses = 0
+            elif not any(op in unspent for op in tracked.outpoints):
+                self._accept(tracked)
+            else:
+                await self._missing(tracked)
+
+    def _accept(self, tracked: TrackedTransaction):
+        tracked.status = ACCEPTED
+        tracked.finished_at = time.time()
+        self.latency.setdefault(tracked.label, LatencyHistogram()).observe(
+            tracked.finished_at - tracked.submitted_at
+        )
+        self.accepted += 1
+        self._finish(tracked)
+
+    async def _missing(self, tracked: TrackedTransaction):
+        tracked.misses += 1
+        if tracked.misses < self.drop_after:
+            return
+        tracked.misses = 0
+
+        if tracked.rebroadcasts < self.max_rebroadcasts:
+            tracked.rebroadcasts += 1
+            self.rebroadcast_count += 1
+            print(f"🔁 Rebroadcasting {tracked.tx_id[:16]}... (attempt {tracked.rebroadcasts})")
+            await self.wallet._broadcast(tracked.tx_json)
+            return
+
+        tracked.status = DROPPED
+        tracked.finished_at = time.time()
+        self.dropped += 1
+        print(f"🗑️ Transaction {tracked.tx_id[:16]}... dropped; releasing {len(tracked.outpoints)} UTXOs")
+        self.wallet._release(tracked.address, tracked.outpoints)
+        self._finish(tracked)
+
+    def _finish(self, tracked: TrackedTransaction):
+        self.pending.pop(tracked.tx_id, None)
+        self.recent.append({
+            "tx_id": tracked.tx_id,
+            "label": tracked.label,
+            "status": tracked.status,
+            "submitted_at": tracked.submitted_at,
+            "finished_at": tracked.finished_at,
+            "latency_ms": round((tracked.finished_at - tracked.submitted_at) * 1000, 1),
+            "rebroadcasts": tracked.rebroadcasts,
+        })
+
+    def stats(self) -> Dict:
+        return {
+            "pending": len(self.pending),
+            "accepted": self.accepted,
+            "dropped": self.dropped,
+            "rebroadcasts": self.rebroadcast_count,
+            "lookup_errors": self.lookup_errors,
+            "latency_by_type": {label: h.snapshot() for label, h in self.latency.items()},
+            "recent": list(self.recent)[-50:],
+        }
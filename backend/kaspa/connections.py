@@ -0,0 +1,99 @@
+"""
+Process-wide Kaspa connections shared by every wallet and agent.
+
+One pooled `httpx.AsyncClient` serves all REST calls (keep-alive, bounded
+connection count) and one lazily connected `RpcPool` serves all wRPC calls,
+so the number of sockets and TLS handshakes against the node no longer
+grows with swarm size. The pool can hold several sockets per node and
+several nodes (KASPA_WS_URLS, KASPA_RPC_POOL_SIZE).
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+import httpx
+
+from kaspa.rpc_pool import RpcPool
+
+
+DEFAULT_WS_URL = "ws://127.0.0.1:18210"
+
+
+class KaspaConnections:
+    """Shared HTTP connection pool and wRPC connection pool."""
+
+    def __init__(
+        self,
+        ws_url: str = DEFAULT_WS_URL,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        ws_urls: Optional[List[str]] = None,
+        rpc_pool_size: int = 1,
+    ):
+        self.ws_url = ws_url
+        self.ws_urls = ws_urls or [ws_url]
+        self.rpc_pool_size = rpc_pool_size
+        self.http = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+            ),
+        )
+        self.rpc: Optional[RpcPool] = None
+        self._rpc_lock = asyncio.Lock()
+
+    @property
+    def rpc_connected(self) -> bool:
+        """True while at least one pooled socket is live (pings detect dead ones)."""
+        return self.rpc is not None and self.rpc.connected
+
+    async def ensure_rpc(self) -> bool:
+        """Connect the shared wRPC pool once; concurrent callers wait on the same attempt."""
+        if self.rpc_connected:
+            return True
+
+        async with self._rpc_lock:
+            # Another caller may have connected while we waited
+            if self.rpc_connected:
+                return True
+
+            # Reconnects only the pool members that are down; live sockets stay
+            if self.rpc is None:
+                self.rpc = RpcPool(self.ws_urls, connections_per_node=self.rpc_pool_size)
+            if await self.rpc.connect():
+                try:
+                    info = await self.rpc.get_server_info()
+                    print(f"🌐 Kaspa node: {info.get('serverVersion', 'unknown')}")
+                except Exception:
+                    pass
+
+            return self.rpc_connected
+
+    async def close(self):
+        """Close the HTTP pool and every wRPC socket."""
+        await self.http.aclose()
+        if self.rpc:
+            await self.rpc.close()
+            self.rpc = None
+        _shared.pop(self.ws_url, None)
+
+
+_shared: Dict[str, KaspaConnections] = {}
+
+
+def get_connections(ws_url: Optional[str] = None) -> KaspaConnections:
+    """Return the process-wide connections for a wRPC endpoint, creating them on first use."""
+    ws_url = ws_url or os.getenv("KASPA_WS_URL", DEFAULT_WS_URL)
+    if ws_url not in _shared:
+        # KASPA_WS_URLS lists extra nodes to spread load over, e.g. "ws://a:18210,ws://b:18210"
+        extra = [u.strip() for u in os.getenv("KASPA_WS_URLS", "").split(",") if u.strip()]
+        _shared[ws_url] = KaspaConnections(
+            ws_url=ws_url,
+            max_connections=int(os.getenv("KASPA_HTTP_MAX_CONNECTIONS", "20")),
+            max_keepalive=int(os.getenv("KASPA_HTTP_MAX_KEEPALIVE", "10")),
+            ws_urls=[ws_url] + [u for u in extra if u != ws_url],
+            rpc_pool_size=int(os.getenv("KASPA_RPC_POOL_SIZE", "1")),
+        )
+    return _shared[ws_url]
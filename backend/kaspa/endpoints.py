@@ -0,0 +1,179 @@
+"""
+Endpoint health tracking for the wallet's wRPC/REST fallbacks.
+
+Every backend the wallet can talk to (the local wRPC node plus the public
+REST APIs) is tracked as an Endpoint with a smoothed latency and error rate.
+
+Circuit breaker per endpoint:
+- CLOSED:    normal operation, calls go through
+- OPEN:      too many consecutive failures, calls skip it without waiting
+             for a timeout
+- HALF_OPEN: cooldown elapsed, a single probe call is let through; success
+             closes the circuit, failure re-opens it
+
+Callers iterate `candidates()`, which yields healthy endpoints fastest-first,
+and report back with `record_success` / `record_failure`.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+# Endpoint kinds
+WRPC = "wrpc"
+REST = "rest"
+SIMNET = "simnet"   # in-process SimulatedLedger (mock mode)
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class Endpoint:
+    """Health record for a single wRPC or REST endpoint."""
+    name: str
+    kind: str                      # WRPC, REST or SIMNET
+    url: str
+    priority: int = 0              # registration order, used until latency is known
+    state: str = CLOSED
+    latency_ewma: Optional[float] = None   # seconds
+    error_rate: float = 0.0        # EWMA of failures (0.0 - 1.0)
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    opened_at: float = 0.0         # monotonic time the circuit last opened
+    probe_started: float = 0.0     # monotonic time of the last half-open probe
+    last_error: str = ""
+    last_used: float = 0.0         # wall clock, for the API
+
+    def score(self) -> float:
+        """Expected cost of a call: latency inflated by the error rate."""
+        return (self.latency_ewma or 0.0) * (1.0 + 4.0 * self.error_rate)
+
+
+class EndpointManager:
+    """
+    Tracks latency/error rates per endpoint and routes calls to the
+    fastest healthy one.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        alpha: float = 0.3,
+    ):
+        self.failure_threshold = failure_threshold  # consecutive failures to open
+        self.cooldown = cooldown                    # seconds before half-open probe
+        self.alpha = alpha                          # EWMA smoothing factor
+        self._endpoints: Dict[str, Endpoint] = {}
+
+    def register(self, name: str, kind: str, url: str) -> Endpoint:
+        """Register an endpoint (idempotent by name)."""
+        if name not in self._endpoints:
+            self._endpoints[name] = Endpoint(
+                name=name, kind=kind, url=url, priority=len(self._endpoints)
+            )
+        return self._endpoints[name]
+
+    def get(self, name: str) -> Optional[Endpoint]:
+        return self._endpoints.get(name)
+
+    def candidates(self, kinds: Optional[List[str]] = None) -> List[Endpoint]:
+        """
+        Endpoints worth calling, best first.
+
+        Open circuits are skipped until their cooldown expires; then exactly
+        one caller gets to probe them (half-open), ahead of the healthy ones.
+        Endpoints with measured latency are ordered by score; untried ones
+        follow in registration order.
+        """
+        now = time.monotonic()
+        probes = []
+        healthy = []
+
+        for ep in self._endpoints.values():
+            if kinds and ep.kind not in kinds:
+                continue
+
+            if ep.state == OPEN and now - ep.opened_at >= self.cooldown:
+                ep.state = HALF_OPEN
+
+            if ep.state == HALF_OPEN:
+                # One probe per cooldown; a probe slot whose caller never
+                # reported back (e.g. returned early) expires with it.
+                if now - ep.probe_started >= self.cooldown:
+                    ep.probe_started = now
+                    probes.append(ep)
+            elif ep.state == CLOSED:
+                healthy.append(ep)
+
+        healthy.sort(key=lambda e: (
+            e.latency_ewma is None,
+            e.score() if e.latency_ewma is not None else e.priority,
+        ))
+        return probes + healthy
+
+    def record_success(self, ep: Endpoint, latency: float):
+        """Record a successful call and close the circuit."""
+        ep.successes += 1
+        ep.consecutive_failures = 0
+        ep.last_used = time.time()
+        ep.error_rate = (1 - self.alpha) * ep.error_rate
+        if ep.latency_ewma is None:
+            ep.latency_ewma = latency
+        else:
+            ep.latency_ewma = self.alpha * latency + (1 - self.alpha) * ep.latency_ewma
+
+        if ep.state != CLOSED:
+            print(f"🟢 Endpoint {ep.name} recovered ({latency * 1000:.0f} ms)")
+        ep.state = CLOSED
+
+    def record_failure(self, ep: Endpoint, error: Exception, latency: Optional[float] = None):
+        """Record a failed call; open the circuit past the threshold."""
+        ep.failures += 1
+        ep.consecutive_failures += 1
+        ep.last_used = time.time()
+        ep.last_error = str(error) or type(error).__name__
+        ep.error_rate = self.alpha + (1 - self.alpha) * ep.error_rate
+        if latency is not None and ep.latency_ewma is not None:
+            ep.latency_ewma = self.alpha * latency + (1 - self.alpha) * ep.latency_ewma
+
+        if ep.state == HALF_OPEN or ep.consecutive_failures >= self.failure_threshold:
+            if ep.state != OPEN:
+                print(f"🔴 Endpoint {ep.name} circuit open: {ep.last_error}")
+            ep.state = OPEN
+            ep.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict:
+        """Current endpoint state for the API."""
+        now = time.monotonic()
+        endpoints = []
+        for ep in self._endpoints.values():
+            retry_in = 0.0
+            if ep.state == OPEN:
+                retry_in = max(0.0, self.cooldown - (now - ep.opened_at))
+            total = ep.successes + ep.failures
+            endpoints.append({
+                "name": ep.name,
+                "kind": ep.kind,
+                "url": ep.url,
+                "state": ep.state,
+                "latency_ms": round(ep.latency_ewma * 1000, 1) if ep.latency_ewma is not None else None,
+                "error_rate": round(ep.error_rate, 3),
+                "successes": ep.successes,
+                "failures": ep.failures,
+                "failure_ratio": round(ep.failures / total, 3) if total else 0.0,
+                "consecutive_failures": ep.consecutive_failures,
+                "last_error": ep.last_error,
+                "last_used": ep.last_used,
+                "retry_in": round(retry_in, 1),
+            })
+        return {
+            "failure_threshold": self.failure_threshold,
+            "cooldown": self.cooldown,
+            "endpoints": endpoints,
+        }
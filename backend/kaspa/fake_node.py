@@ -0,0 +1,285 @@
+"""
+Fake kaspad wRPC server for wire-level testing and benchmarking.
+
+Speaks the same JSON-over-WebSocket protocol as KaspaRpcClient, backed by a
+SimulatedLedger, so the client, the wallet and wait_for_sync.py can run
+in CI with no network.
+
+Supported methods:
+- getServerInfo, getUtxosByAddresses, getBalanceByAddress, submitTransaction,
+  getMempoolEntry
+- notifyUtxosChanged, notifyVirtualDaaScoreChanged, notifyBlockAdded
+  ({"command": "Start"|"Stop"})
+
+Each request is served in its own task, so responses may come back out of
+order, as they can from a real node. Fault injection: fixed latency plus
+jitter, a rate of RPC errors, a rate of silently dropped requests (client
+sees a timeout), and `disconnect_all()` to simulate a node restart.
+
+Run standalone (configured via FAKE_NODE_* env vars):
+    python -m backend.kaspa.fake_node
+"""
+
+import asyncio
+import os
+import random
+import sys
+from typing import Dict, List, Optional, Set
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from kaspa import codec
+from kaspa.simnet import SimulatedLedger, SimBlock
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+
+class _Connection:
+    """Per-client state: socket, send lock and subscriptions."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.send_lock = asyncio.Lock()
+        self.utxo_addresses: Set[str] = set()
+        self.daa_subscribed = False
+        self.blocks_subscribed = False
+
+    async def send(self, message: Dict):
+        async with self.send_lock:
+            await self.ws.send(codec.dumps(message))
+
+
+class FakeKaspaNode:
+    """Asyncio WebSocket server emulating a kaspad wRPC JSON endpoint."""
+
+    def __init__(
+        self,
+        ledger: Optional[SimulatedLedger] = None,
+        host: str = "127.0.0.1",
+        port: int = 18210,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+    ):
+        self.ledger = ledger or SimulatedLedger()
+        self.host = host
+        self.port = port
+        self.latency = latency        # seconds added to every response
+        self.jitter = jitter          # extra uniform random latency, seconds
+        self.error_rate = error_rate  # fraction of requests answered with an RPC error
+        self.drop_rate = drop_rate    # fraction of requests never answered
+
+        self._server = None
+        self._connections: List[_Connection] = []
+        self.requests = 0
+        self.errors_injected = 0
+        self.drops_injected = 0
+
+        self.ledger.block_listeners.append(self._on_block)
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self):
+        if websockets is None:
+            raise RuntimeError("websockets not installed")
+        self.ledger.start()
+        self._server = await websockets.serve(self._handle, self.host, self.port)
+        if self.port == 0:
+            # Ephemeral port requested — report the one we got
+            self.port = next(iter(self._server.sockets)).getsockname()[1]
+        print(f"🧪 Fake kaspad listening on {self.url}")
+
+    async def stop(self):
+        await self.disconnect_all()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.ledger.stop()
+
+    async def disconnect_all(self):
+        """Drop every client connection (simulates a node restart)."""
+        for conn in list(self._connections):
+            try:
+                await conn.ws.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict:
+        return {
+            "connections": len(self._connections),
+            "requests": self.requests,
+            "errors_injected": self.errors_injected,
+            "drops_injected": self.drops_injected,
+            "ledger": self.ledger.stats(),
+        }
+
+    # ── Connection handling ─────────────────────────────────
+
+    async def _handle(self, ws, path=None):
+        conn = _Connection(ws)
+        self._connections.append(conn)
+        tasks: Set[asyncio.Task] = set()
+        try:
+            async for raw in ws:
+                task = asyncio.create_task(self._serve(conn, raw))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except Exception:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._connections.remove(conn)
+
+    async def _serve(self, conn: _Connection, raw: str):
+        try:
+            request = codec.loads(raw)
+        except ValueError:
+            return
+        rid = request.get("id")
+        method = request.get("method", "")
+        params = request.get("params") or {}
+        self.requests += 1
+
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.drop_rate and random.random() < self.drop_rate:
+            self.drops_injected += 1
+            return
+
+        if self.error_rate and random.random() < self.error_rate:
+            self.errors_injected += 1
+            await self._reply_error(conn, rid, method, "injected error")
+            return
+
+        try:
+            result = await self._dispatch(conn, method, params)
+        except Exception as e:
+            await self._reply_error(conn, rid, method, str(e))
+            return
+
+        try:
+            await conn.send({"id": rid, "method": method, "params": result})
+        except Exception:
+            pass
+
+    async def _reply_error(self, conn: _Connection, rid, method: str, message: str):
+        try:
+            await conn.send({"id": rid, "method": method, "error": {"message": message}})
+        except Exception:
+            pass
+
+    async def _dispatch(self, conn: _Connection, method: str, params: Dict) -> Dict:
+        ledger = self.ledger
+
+        if method == "getServerInfo":
+            return await ledger.get_server_info()
+
+        if method == "getUtxosByAddresses":
+            return {"entries": await ledger.get_utxos_by_addresses(params.get("addresses", []))}
+
+        if method == "getBalanceByAddress":
+            return {"balance": await ledger.get_balance_by_address(params.get("address", ""))}
+
+        if method == "submitTransaction":
+            tx_id = await ledger.submit_transaction(
+                params.get("transaction", {}), params.get("allowOrphan", False)
+            )
+            return {"transactionId": tx_id}
+
+        if method == "getMempoolEntry":
+            entry = await ledger.get_mempool_entry(params.get("transactionId", ""))
+            if entry is None:
+                raise ValueError(f"transaction {params.get('transactionId', '')} not found in mempool")
+            return {"entry": entry}
+
+        if method == "notifyUtxosChanged":
+            addresses = set(params.get("addresses", []))
+            if params.get("command", "Start") == "Stop":
+                conn.utxo_addresses -= addresses
+            else:
+                conn.utxo_addresses |= addresses
+            return {}
+
+        if method == "notifyVirtualDaaScoreChanged":
+            conn.daa_subscribed = params.get("command", "Start") != "Stop"
+            return {}
+
+        if method == "notifyBlockAdded":
+            conn.blocks_subscribed = params.get("command", "Start") != "Stop"
+            return {}
+
+        raise ValueError(f"Unknown method: {method}")
+
+    # ── Notifications ───────────────────────────────────────
+
+    def _on_block(self, block: SimBlock):
+        block_message = None
+        for conn in self._connections:
+            if conn.blocks_subscribed:
+                if block_message is None:
+                    block_message = block.notification()
+                self._notify(conn, "blockAddedNotification", block_message)
+            if conn.daa_subscribed:
+                self._notify(conn, "virtualDaaScoreChangedNotification", {
+                    "virtualDaaScore": block.daa_score,
+                })
+            if conn.utxo_addresses and (block.added or block.removed):
+                added = [u for u in block.added if u["address"] in conn.utxo_addresses]
+                removed = [u for u in block.removed if u["address"] in conn.utxo_addresses]
+                if added or removed:
+                    self._notify(conn, "utxosChangedNotification", {
+                        "added": added,
+                        "removed": removed,
+                    })
+
+    def _notify(self, conn: _Connection, method: str, params: Dict):
+        async def send():
+            try:
+                await conn.send({"method": method, "params": params})
+            except Exception:
+                pass
+        asyncio.create_task(send())
+
+
+async def main():
+    ledger = SimulatedLedger(
+        bps=float(os.getenv("FAKE_NODE_BPS", "10")),
+        acceptance_delay=float(os.getenv("FAKE_NODE_ACCEPTANCE_DELAY", "1.0")),
+        verify_signatures=os.getenv("FAKE_NODE_VERIFY_SIGNATURES", "false").lower() == "true",
+    )
+    # FAKE_NODE_FUND="kaspatest:qq...:100000000,kaspatest:qr...:5000000"
+    for entry in filter(None, os.getenv("FAKE_NODE_FUND", "").split(",")):
+        address, amount = entry.rsplit(":", 1)
+        ledger.fund(address.strip(), int(amount))
+
+    node = FakeKaspaNode(
+        ledger=ledger,
+        host=os.getenv("FAKE_NODE_HOST", "127.0.0.1"),
+        port=int(os.getenv("FAKE_NODE_PORT", "18210")),
+        latency=float(os.getenv("FAKE_NODE_LATENCY", "0")),
+        jitter=float(os.getenv("FAKE_NODE_JITTER", "0")),
+        error_rate=float(os.getenv("FAKE_NODE_ERROR_RATE", "0")),
+        drop_rate=float(os.getenv("FAKE_NODE_DROP_RATE", "0")),
+    )
+    await node.start()
+    try:
+        await asyncio.Future()
+    finally:
+        await node.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,193 @@
+"""
+Lightweight latency and call metrics.
+
+Fixed log-spaced buckets keep `observe()` to a bisect and two additions,
+cheap enough to call on every transaction or RPC.
+
+CallMetrics adds per-method call counters, error counts by kind, in-flight
+gauges and a one-minute call rate on top of the histograms, for the wRPC
+client and the wallet (see /api/metrics).
+"""
+
+import asyncio
+import bisect
+import functools
+import time
+from typing import Callable, Dict, List, Optional
+
+
+# Bucket upper bounds in milliseconds; the last bucket is open-ended
+DEFAULT_BUCKETS_MS = [
+    1, 2, 5, 10, 20, 50, 100, 200, 500,
+    1_000, 2_000, 5_000, 10_000, 30_000, 60_000,
+]
+
+
+class LatencyHistogram:
+    """Bucketed latency distribution with count, sum, min and max."""
+
+    def __init__(self, buckets_ms: Optional[List[float]] = None):
+        self.bounds = list(buckets_ms or DEFAULT_BUCKETS_MS)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0    # seconds
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.bounds, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Approximate q-th percentile (0-100) in ms, interpolated within its bucket."""
+        if not self.count:
+            return None
+        lo_ms, hi_ms = self.min * 1000, self.max * 1000
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else hi_ms
+                value = lower + (upper - lower) * (rank - seen) / n
+                return round(min(max(value, lo_ms), hi_ms), 1)
+            seen += n
+        return round(hi_ms, 1)
+
+    def snapshot(self) -> Dict:
+        buckets = {f"le_{b}ms": n for b, n in zip(self.bounds, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 1) if self.count else None,
+            "min_ms": round(self.min * 1000, 1) if self.min is not None else None,
+            "max_ms": round(self.max * 1000, 1) if self.max is not None else None,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "buckets": buckets,
+        }
+
+
+def error_kind(error: BaseException) -> str:
+    """Coarse error taxonomy used to bucket failures."""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return "timeout"
+    if isinstance(error, asyncio.CancelledError):
+        return "cancelled"
+    if isinstance(error, ConnectionError):
+        return "connection"
+    if str(error).startswith("RPC error"):
+        return "rpc_error"
+    if isinstance(error, ValueError):
+        return "invalid"
+    return type(error).__name__
+
+
+class CallStats:
+    """Counters, in-flight gauge and latency histogram for one method."""
+
+    RATE_WINDOW = 60  # seconds
+
+    def __init__(self):
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.latency = LatencyHistogram()
+        # Calls finished per second over the last RATE_WINDOW seconds (ring buffer)
+        self._ring = [0] * self.RATE_WINDOW
+        self._ring_second = [0] * self.RATE_WINDOW
+
+    def rate(self, now: float) -> float:
+        current = int(now)
+        recent = sum(
+            n for n, second in zip(self._ring, self._ring_second)
+            if current - second < self.RATE_WINDOW
+        )
+        return recent / self.RATE_WINDOW
+
+    def snapshot(self, now: float) -> Dict:
+        latency = self.latency.snapshot()
+        latency.pop("buckets")
+        latency.pop("count")    # same as calls
+        return {
+            "calls": self.calls,
+            "errors": sum(self.errors.values()),
+            "errors_by_kind": dict(self.errors),
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "calls_per_sec_1m": round(self.rate(now), 2),
+            **latency,
+        }
+
+
+class CallMetrics:
+    """Per-method call metrics plus free-form counters."""
+
+    def __init__(self):
+        self.methods: Dict[str, CallStats] = {}
+        self.counters: Dict[str, int] = {}
+
+    def start(self, method: str) -> float:
+        stats = self.methods.get(method)
+        if stats is None:
+            stats = self.methods[method] = CallStats()
+        stats.in_flight += 1
+        if stats.in_flight > stats.max_in_flight:
+            stats.max_in_flight = stats.in_flight
+        return time.perf_counter()
+
+    def finish(self, method: str, started: float, error: Optional[str] = None):
+        """Close a call opened with start(); `error` is its kind, if it failed."""
+        elapsed = time.perf_counter() - started
+        stats = self.methods[method]
+        stats.in_flight -= 1
+        stats.calls += 1
+        stats.latency.observe(elapsed)
+        if error:
+            stats.errors[error] = stats.errors.get(error, 0) + 1
+
+        second = int(time.time())
+        slot = second % CallStats.RATE_WINDOW
+        if stats._ring_second[slot] != second:
+            stats._ring_second[slot] = second
+            stats._ring[slot] = 0
+        stats._ring[slot] += 1
+
+    def incr(self, counter: str, n: int = 1):
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def snapshot(self) -> Dict:
+        now = time.time()
+        return {
+            "methods": {name: stats.snapshot(now) for name, stats in sorted(self.methods.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+def instrumented(method: str, failure: Optional[Callable] = None):
+    """
+    Record calls of an async method in `self.metrics` under `method`.
+
+    Raised exceptions count as errors by error_kind(); `failure(result)` can
+    also flag a returned value as a failure by returning its kind.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            started = self.metrics.start(method)
+            try:
+                result = await fn(self, *args, **kwargs)
+            except BaseException as e:
+                self.metrics.finish(method, started, error_kind(e))
+                raise
+            self.metrics.finish(method, started, failure(result) if failure else None)
+            return result
+        return wrapper
+    return decorator
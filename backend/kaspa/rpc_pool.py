@@ -0,0 +1,206 @@
+"""
+wRPC connection pool — spreads RPC load over several sockets and nodes.
+
+Holds `connections_per_node` KaspaRpcClient connections to each node URL and
+exposes the same high-level API as a single client, so the wallet and the
+confirmation tracker can use either one.
+
+Routing:
+- Requests go to the connected member with the fewest outstanding requests
+  (ties broken by smoothed latency), so slow sockets drain instead of
+  queueing more work.
+- Each member has its own circuit breaker (EndpointManager); a member that
+  keeps timing out or disconnecting is skipped until its cooldown expires.
+- Reads that fail on the connection level are retried on the next member.
+  submitTransaction is not: the node may already have the transaction.
+- Subscriptions are sticky: every subscription is opened on one designated
+  member and stays there, so notifications aren't duplicated across nodes.
+  If that member drops, its client re-subscribes once it reconnects.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from kaspa.endpoints import EndpointManager, Endpoint, WRPC, HALF_OPEN
+from kaspa.metrics import CallMetrics
+from kaspa.wrpc_client import KaspaRpcClient, Subscription
+
+
+_CONNECTION_ERRORS = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+
+
+@dataclass
+class PoolMember:
+    """One pooled connection and its health record."""
+    url: str
+    client: KaspaRpcClient
+    endpoint: Endpoint
+    requests: int = 0
+    last_connect_attempt: float = 0.0   # monotonic
+
+
+class RpcPool:
+    """Least-outstanding-requests pool of wRPC connections across one or more nodes."""
+
+    def __init__(
+        self,
+        urls: List[str],
+        connections_per_node: int = 1,
+        failure_threshold: int = 3,
+        cooldown: float = 10.0,
+    ):
+        if not urls:
+            raise ValueError("RpcPool needs at least one node URL")
+        self.urls = list(urls)
+        self.connections_per_node = max(1, connections_per_node)
+        self.health = EndpointManager(failure_threshold=failure_threshold, cooldown=cooldown)
+        # One set of per-method metrics for every socket in the pool
+        self.metrics = CallMetrics()
+        self.members: List[PoolMember] = []
+        for url in self.urls:
+            for i in range(self.connections_per_node):
+                self.members.append(PoolMember(
+                    url=url,
+                    client=KaspaRpcClient(ws_url=url, metrics=self.metrics),
+                    endpoint=self.health.register(f"{url}#{i}", WRPC, url),
+                ))
+        self._subscription_member: Optional[PoolMember] = None
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return any(m.client.connected for m in self.members)
+
+    @property
+    def pending_requests(self) -> int:
+        return sum(m.client.pending_requests for m in self.members)
+
+    async def connect(self) -> bool:
+        """Connect every member that isn't connected; True if any member is up."""
+        async with self._connect_lock:
+            # Members already retrying on their own are left to it
+            down = [m for m in self.members if not m.client.connected and not m.client.reconnecting]
+            if down:
+                await asyncio.gather(*(self._connect_member(m) for m in down))
+        return self.connected
+
+    async def _connect_member(self, member: PoolMember) -> bool:
+        member.last_connect_attempt = time.monotonic()
+        start = time.monotonic()
+        if await member.client.connect():
+            self.health.record_success(member.endpoint, time.monotonic() - start)
+            return True
+        self.health.record_failure(member.endpoint, ConnectionError(f"connect to {member.url} failed"))
+        return False
+
+    def _reconnect_later(self, member: PoolMember):
+        """Reconnect a member that never connected, at most once per cooldown."""
+        if member.client.reconnecting:
+            return
+        if time.monotonic() - member.last_connect_attempt < self.health.cooldown:
+            return
+        member.last_connect_attempt = time.monotonic()
+        asyncio.create_task(self._connect_member(member))
+
+    def _route(self) -> List[PoolMember]:
+        """Members to try, best first."""
+        allowed = {ep.name for ep in self.health.candidates(kinds=[WRPC])}
+        ready = []
+        for member in self.members:
+            if not member.client.connected:
+                self._reconnect_later(member)
+            elif member.endpoint.name in allowed:
+                ready.append(member)
+        ready.sort(key=lambda m: (
+            m.endpoint.state != HALF_OPEN,   # let a due probe through first
+            m.client.pending_requests,
+            m.endpoint.score(),
+        ))
+        return ready
+
+    async def _call(self, method: str, *args, retry: bool = True):
+        last_error: Exception = ConnectionError("No healthy wRPC connection in pool")
+        for member in self._route():
+            start = time.monotonic()
+            member.requests += 1
+            try:
+                result = await getattr(member.client, method)(*args)
+            except _CONNECTION_ERRORS as e:
+                self.health.record_failure(member.endpoint, e, time.monotonic() - start)
+                last_error = e
+                if not retry:
+                    raise
+                self.metrics.incr("pool_retries")
+                continue
+            except Exception:
+                # The node answered, just with an RPC error — the connection is fine
+                self.health.record_success(member.endpoint, time.monotonic() - start)
+                raise
+            self.health.record_success(member.endpoint, time.monotonic() - start)
+            return result
+        raise last_error
+
+    # ── KaspaRpcClient-compatible API ───────────────────────
+
+    async def get_server_info(self) -> Dict:
+        return await self._call("get_server_info")
+
+    async def get_utxos_by_addresses(self, addresses: List[str]) -> List[Dict]:
+        return await self._call("get_utxos_by_addresses", addresses)
+
+    async def submit_transaction(self, transaction: Dict, allow_orphan: bool = False) -> str:
+        return await self._call("submit_transaction", transaction, allow_orphan, retry=False)
+
+    async def get_mempool_entry(self, transaction_id: str) -> Optional[Dict]:
+        return await self._call("get_mempool_entry", transaction_id)
+
+    async def get_balance_by_address(self, address: str) -> int:
+        return await self._call("get_balance_by_address", address)
+
+    # ── Sticky subscriptions ────────────────────────────────
+
+    def _subscriber(self) -> KaspaRpcClient:
+        member = self._subscription_member
+        if member is None or not (member.client.connected or member.client.reconnecting):
+            route = self._route()
+            if not route:
+                raise ConnectionError("No healthy wRPC connection in pool")
+            member = self._subscription_member = route[0]
+        return member.client
+
+    async def subscribe_utxos_changed(self, addresses: List[str], buffer_size: int = 1000) -> Subscription:
+        return await self._subscriber().subscribe_utxos_changed(addresses, buffer_size)
+
+    async def subscribe_virtual_daa_score_changed(self, buffer_size: int = 1000) -> Subscription:
+        return await self._subscriber().subscribe_virtual_daa_score_changed(buffer_size)
+
+    async def subscribe_block_added(self, buffer_size: int = 1000) -> Subscription:
+        return await self._subscriber().subscribe_block_added(buffer_size)
+
+    async def unsubscribe(self, sub: Subscription):
+        await sub.client.unsubscribe(sub)
+
+    def stats(self) -> Dict:
+        health = {ep["name"]: ep for ep in self.health.snapshot()["endpoints"]}
+        return {
+            "nodes": self.urls,
+            "connections_per_node": self.connections_per_node,
+            "connected": sum(m.client.connected for m in self.members),
+            "pending_requests": self.pending_requests,
+            "members": [
+                {
+                    **health[m.endpoint.name],
+                    "connected": m.client.connected,
+                    "pending": m.client.pending_requests,
+                    "requests": m.requests,
+                    "subscriptions": m is self._subscription_member,
+                }
+                for m in self.members
+            ],
+        }
+
+    async def close(self):
+        await asyncio.gather(*(m.client.close() for m in self.members), return_exceptions=True)
+        self._subscription_member = None
@@ -0,0 +1,390 @@
+"""
+Simulated Kaspa ledger for mock mode.
+
+An in-process stand-in for a kaspad node so the wallet's full
+fetch → select → build → sign → submit path runs offline:
+
+- In-memory UTXO set indexed by outpoint and by address
+- Mempool with double-spend and balance checks (optional Schnorr verification)
+- Block production at a configurable BPS; a transaction is accepted in the
+  first block produced at least `acceptance_delay` seconds after submission
+- Same async API as KaspaRpcClient, so KaspaWallet can use it as its wRPC client
+
+Intended for load-testing wallet throughput without a node.
+"""
+
+import asyncio
+import hashlib
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from bech32_util import encode_address, decode_address
+
+from kaspa.sighash import (
+    Transaction, TransactionInput, TransactionOutput,
+    Outpoint, ScriptPublicKey, UtxoEntry,
+    calc_schnorr_signature_hash, make_p2pk_script,
+)
+from kaspa.schnorr import schnorr_verify
+from kaspa.wrpc_client import Subscription, BLOCK_ADDED
+
+
+Outpt = Tuple[str, int]  # (transaction id hex, output index)
+
+
+@dataclass
+class SimBlock:
+    """A produced block, the transactions it accepted and its UTXO diff."""
+    hash: str
+    daa_score: int
+    timestamp: float
+    transactions: List[Dict] = field(default_factory=list)
+    added: List[Dict] = field(default_factory=list)     # UTXO entries created
+    removed: List[Dict] = field(default_factory=list)   # UTXO entries spent
+
+    def notification(self) -> Dict:
+        """The block as a node's blockAddedNotification params."""
+        return {"block": {
+            "header": {
+                "hash": self.hash,
+                "daaScore": self.daa_score,
+                "timestamp": int(self.timestamp * 1000),
+            },
+            "transactions": self.transactions,
+            "verboseData": {"hash": self.hash},
+        }}
+
+
+def transaction_id(tx_json: Dict) -> str:
+    """
+    Deterministic transaction ID for a wRPC-style transaction.
+
+    Like Kaspa's, it covers everything except signature scripts, so a
+    re-signed transaction keeps its ID.
+    """
+    h = blake2b(digest_size=32, key=b"TransactionID")
+    h.update(str(tx_json.get("version", 0)).encode())
+    for inp in tx_json.get("inputs", []):
+        prev = inp["previousOutpoint"]
+        h.update(bytes.fromhex(prev["transactionId"]))
+        h.update(int(prev["index"]).to_bytes(4, "little"))
+        h.update(int(inp.get("sequence", 0)).to_bytes(8, "little"))
+    for out in tx_json.get("outputs", []):
+        h.update(int(out["amount"]).to_bytes(8, "little"))
+        h.update(bytes.fromhex(out["scriptPublicKey"]["scriptPublicKey"]))
+    h.update(int(tx_json.get("lockTime", 0)).to_bytes(8, "little"))
+    h.update(bytes.fromhex(tx_json.get("subnetworkId", "")))
+    h.update(bytes.fromhex(tx_json.get("payload", "")))
+    return h.hexdigest()
+
+
+def tx_from_json(tx_json: Dict) -> Transaction:
+    """Rebuild a Transaction from its wRPC JSON form (inverse of KaspaWallet._tx_to_json)."""
+    inputs = [
+        TransactionInput(
+            previous_outpoint=Outpoint(
+                transaction_id=bytes.fromhex(inp["previousOutpoint"]["transactionId"]),
+                index=int(inp["previousOutpoint"]["index"]),
+            ),
+            signature_script=bytes.fromhex(inp.get("signatureScript", "")),
+            sequence=int(inp.get("sequence", 0)),
+            sig_op_count=int(inp.get("sigOpCount", 1)),
+        )
+        for inp in tx_json.get("inputs", [])
+    ]
+    outputs = [
+        TransactionOutput(
+            value=int(out["amount"]),
+            script_public_key=ScriptPublicKey(
+                version=int(out["scriptPublicKey"].get("version", 0)),
+                script=bytes.fromhex(out["scriptPublicKey"]["scriptPublicKey"]),
+            ),
+        )
+        for out in tx_json.get("outputs", [])
+    ]
+    return Transaction(
+        version=int(tx_json.get("version", 0)),
+        inputs=inputs,
+        outputs=outputs,
+        lock_time=int(tx_json.get("lockTime", 0)),
+        subnetwork_id=bytes.fromhex(tx_json.get("subnetworkId", "")),
+        gas=int(tx_json.get("gas", 0)),
+        payload=bytes.fromhex(tx_json.get("payload", "")),
+    )
+
+
+class SimulatedLedger:
+    """In-memory UTXO set, mempool and block producer."""
+
+    def __init__(
+        self,
+        bps: float = 10.0,
+        acceptance_delay: float = 1.0,
+        max_block_txs: int = 300,
+        max_mempool: int = 50_000,
+        verify_signatures: bool = False,
+        address_prefix: str = "kaspatest",
+    ):
+        self.bps = bps                            # blocks per second
+        self.acceptance_delay = acceptance_delay  # min seconds from submit to acceptance
+        self.max_block_txs = max_block_txs
+        self.max_mempool = max_mempool
+        self.verify_signatures = verify_signatures
+        self.address_prefix = address_prefix
+
+        self.utxos: Dict[Outpt, Dict] = {}
+        self.by_address: Dict[str, Set[Outpt]] = {}
+        self.mempool: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+        self.mempool_spends: Set[Outpt] = set()
+        self.daa_score = 0
+        self.blocks: deque = deque(maxlen=1000)
+
+        self.submitted = 0
+        self.accepted = 0
+        self.rejected = 0
+        self._funding_counter = 0
+        self._task: Optional[asyncio.Task] = None
+        
+        # Called with every produced block (e.g. by FakeKaspaNode for notifications)
+        self.block_listeners: List[Callable[[SimBlock], None]] = []
+        # Block streams opened through subscribe_block_added()
+        self.block_subscriptions: List[Subscription] = []
+
+    # ── Lifecycle ───────────────────────────────────────────
+
+    def start(self):
+        """Start block production (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._block_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _block_loop(self):
+        interval = 1.0 / self.bps
+        while True:
+            await asyncio.sleep(interval)
+            self.produce_block()
+
+    # ── Ledger operations ───────────────────────────────────
+
+    def _address_of(self, script_hex: str) -> str:
+        script = bytes.fromhex(script_hex)
+        if len(script) == 34 and script[0] == 0x20 and script[-1] == 0xac:
+            return encode_address(self.address_prefix, "pk", script[1:33])
+        return ""
+
+    def _add_utxo(self, outpoint: Outpt, amount: int, spk: Dict, is_coinbase: bool) -> Dict:
+        address = self._address_of(spk["scriptPublicKey"])
+        utxo = self.utxos[outpoint] = {
+            "address": address,
+            "outpoint": {"transactionId": outpoint[0], "index": outpoint[1]},
+            "utxoEntry": {
+                "amount": str(amount),
+                "scriptPublicKey": spk,
+                "blockDaaScore": str(self.daa_score),
+                "isCoinbase": is_coinbase,
+            },
+        }
+        self.by_address.setdefault(address, set()).add(outpoint)
+        return utxo
+
+    def _spend_utxo(self, outpoint: Outpt) -> Dict:
+        utxo = self.utxos.pop(outpoint)
+        owned = self.by_address.get(utxo["address"])
+        if owned is not None:
+            owned.discard(outpoint)
+        return utxo
+
+    def fund(self, address: str, amount: int, public_key: Optional[bytes] = None) -> Outpt:
+        """Mint a coinbase-style UTXO paying `amount` to a P2PK address."""
+        if public_key is None:
+            public_key = decode_address(address)["payload"]
+        self._funding_counter += 1
+        tx_id = hashlib.sha256(f"simnet_funding_{self._funding_counter}".encode()).hexdigest()
+        spk = make_p2pk_script(public_key)
+        self._add_utxo(
+            (tx_id, 0), amount,
+            {"version": spk.version, "scriptPublicKey": spk.script.hex()},
+            is_coinbase=True,
+        )
+        return (tx_id, 0)
+
+    def validate(self, tx_json: Dict) -> int:
+        """Check a transaction against the UTXO set and mempool. Returns the fee."""
+        total_in = 0
+        seen: Set[Outpt] = set()
+        entries: List[UtxoEntry] = []
+        for inp in tx_json.get("inputs", []):
+            prev = inp["previousOutpoint"]
+            outpoint = (prev["transactionId"], int(prev["index"]))
+            if outpoint in seen:
+                raise ValueError(f"duplicate input {outpoint[0][:16]}:{outpoint[1]}")
+            seen.add(outpoint)
+            if outpoint in self.mempool_spends:
+                raise ValueError(f"double spend of {outpoint[0][:16]}:{outpoint[1]} (already in mempool)")
+            utxo = self.utxos.get(outpoint)
+            if utxo is None:
+                raise ValueError(f"missing outpoint {outpoint[0][:16]}:{outpoint[1]}")
+            entry = utxo["utxoEntry"]
+            total_in += int(entry["amount"])
+            entries.append(UtxoEntry(
+                amount=int(entry["amount"]),
+                script_public_key=ScriptPublicKey(
+                    version=int(entry["scriptPublicKey"]["version"]),
+                    script=bytes.fromhex(entry["scriptPublicKey"]["scriptPublicKey"]),
+                ),
+                block_daa_score=int(entry["blockDaaScore"]),
+                is_coinbase=entry["isCoinbase"],
+            ))
+
+        if not entries:
+            raise ValueError("transaction has no inputs")
+
+        total_out = sum(int(out["amount"]) for out in tx_json.get("outputs", []))
+        if total_out > total_in:
+            raise ValueError(f"outputs {total_out} exceed inputs {total_in}")
+
+        if self.verify_signatures:
+            tx = tx_from_json(tx_json)
+            for i, entry in enumerate(entries):
+                sig_script = tx.inputs[i].signature_script
+                if len(sig_script) != 66 or sig_script[0] != 65:
+                    raise ValueError(f"input {i}: malformed signature script")
+                hash_type = sig_script[65]
+                sighash = calc_schnorr_signature_hash(tx, i, hash_type, entry)
+                pubkey = entry.script_public_key.script[1:33]
+                if not schnorr_verify(sighash, pubkey, sig_script[1:65]):
+                    raise ValueError(f"input {i}: invalid signature")
+
+        return total_in - total_out
+
+    def produce_block(self) -> SimBlock:
+        """Accept eligible mempool transactions into a new block."""
+        now = time.time()
+        self.daa_score += 1
+        block = SimBlock(
+            hash=hashlib.sha256(f"simnet_block_{self.daa_score}".encode()).hexdigest(),
+            daa_score=self.daa_score,
+            timestamp=now,
+        )
+
+        for tx_id, (tx_json, submitted_at) in list(self.mempool.items()):
+            # Mempool is in submission order, so the rest are younger still
+            if now - submitted_at < self.acceptance_delay or len(block.transactions) >= self.max_block_txs:
+                break
+            del self.mempool[tx_id]
+            for inp in tx_json["inputs"]:
+                prev = inp["previousOutpoint"]
+                outpoint = (prev["transactionId"], int(prev["index"]))
+                self.mempool_spends.discard(outpoint)
+                block.removed.append(self._spend_utxo(outpoint))
+            for index, out in enumerate(tx_json["outputs"]):
+                block.added.append(self._add_utxo(
+                    (tx_id, index), int(out["amount"]), out["scriptPublicKey"], is_coinbase=False
+                ))
+            block.transactions.append({**tx_json, "verboseData": {"transactionId": tx_id}})
+            self.accepted += 1
+
+        self.blocks.append(block)
+        if self.block_subscriptions:
+            notification = block.notification()
+            for sub in self.block_subscriptions:
+                sub._push(notification)
+        for listener in self.block_listeners:
+            try:
+                listener(block)
+            except Exception as e:
+                print(f"⚠️ Ledger block listener failed: {e}")
+        return block
+
+    def stats(self) -> Dict:
+        return {
+            "daa_score": self.daa_score,
+            "bps": self.bps,
+            "utxo_count": len(self.utxos),
+            "mempool_size": len(self.mempool),
+            "submitted": self.submitted,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+        }
+
+    # ── KaspaRpcClient-compatible API ───────────────────────
+
+    async def connect(self) -> bool:
+        self.start()
+        return True
+
+    async def get_server_info(self) -> Dict:
+        return {
+            "serverVersion": "simnet",
+            "networkId": "simnet",
+            "isSynced": True,
+            "hasUtxoIndex": True,
+            "virtualDaaScore": self.daa_score,
+        }
+
+    async def get_utxos_by_addresses(self, addresses: List[str]) -> List[Dict]:
+        entries = []
+        for address in addresses:
+            for outpoint in self.by_address.get(address, ()):
+                entries.append(self.utxos[outpoint])
+        return entries
+
+    async def get_mempool_entry(self, transaction_id: str) -> Optional[Dict]:
+        entry = self.mempool.get(transaction_id)
+        if entry is None:
+            return None
+        tx_json, submitted_at = entry
+        return {"transaction": tx_json, "fee": 0, "isOrphan": False}
+
+    async def get_balance_by_address(self, address: str) -> int:
+        return sum(
+            int(self.utxos[outpoint]["utxoEntry"]["amount"])
+            for outpoint in self.by_address.get(address, ())
+        )
+
+    async def subscribe_block_added(self, buffer_size: int = 1000) -> Subscription:
+        sub = Subscription(self, BLOCK_ADDED, buffer_size=buffer_size)
+        self.block_subscriptions.append(sub)
+        return sub
+
+    async def unsubscribe(self, sub: Subscription):
+        sub._end()
+        if sub in self.block_subscriptions:
+            self.block_subscriptions.remove(sub)
+
+    async def submit_transaction(self, transaction: Dict, allow_orphan: bool = False) -> str:
+        self.submitted += 1
+        tx_id = transaction_id(transaction)
+        if tx_id in self.mempool:
+            return tx_id
+        try:
+            if len(self.mempool) >= self.max_mempool:
+                raise ValueError("mempool full")
+            self.validate(transaction)
+        except ValueError as e:
+            self.rejected += 1
+            raise Exception(f"RPC error: {e}")
+
+        self.mempool[tx_id] = (transaction, time.time())
+        for inp in transaction["inputs"]:
+            prev = inp["previousOutpoint"]
+            self.mempool_spends.add((prev["transactionId"], int(prev["index"])))
+        return tx_id
+
+    async def close(self):
+        await self.stop()
@@ -0,0 +1,180 @@
+"""
+Staged transaction submission pipeline.
+
+Decouples agents from the fetch → select → build → sign → submit path:
+
+    submit() ──► prepare lanes ──► RPC lanes ──► future resolved with tx ID
+                 (fetch, select,   (broadcast)
+                  build, sign)
+
+- Every stage has bounded queues, so overload shows up as `submit()` waiting
+  (backpressure) instead of an unbounded pile of coroutines.
+- A sender is pinned to one prepare lane and one RPC lane, so its
+  transactions are built and broadcast in submission order.
+- The number of RPC lanes caps concurrent broadcasts against the node.
+- Callers get an asyncio.Future resolving to the same result string
+  KaspaWallet.send_transaction returns ("failed_*" on failure).
+- In simulated mode there is nothing to build or broadcast: jobs skip the
+  lanes and resolve after send_transaction's simulated delay, so the lanes
+  only throttle real broadcasts.
+"""
+
+import asyncio
+import functools
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Set
+
+
+@dataclass
+class SubmissionJob:
+    """A queued transaction moving through the pipeline."""
+    from_addr: Any            # KaspaAddress
+    to_addr: str
+    amount: int
+    label: str
+    future: asyncio.Future
+    payload: bytes = b""      # encoded swarm message
+    enqueued_at: float = field(default_factory=time.monotonic)
+    prepared: Any = None      # PreparedTransaction, set by the prepare stage
+
+
+class SubmissionPipeline:
+    """Bounded, per-sender-ordered prepare/broadcast pipeline for a KaspaWallet."""
+
+    def __init__(
+        self,
+        wallet,
+        prepare_lanes: int = 4,
+        rpc_concurrency: int = 16,
+        queue_size: int = 100,
+    ):
+        self.wallet = wallet
+        self.prepare_lanes = max(1, prepare_lanes)
+        self.rpc_concurrency = max(1, rpc_concurrency)
+        self.queue_size = queue_size
+
+        self._prepare_queues: List[asyncio.Queue] = []
+        self._rpc_queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
+        self._simulated: Set[asyncio.Task] = set()
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.total_latency = 0.0
+
+    def start(self):
+        """Create the lane queues and their workers."""
+        if self._workers:
+            return
+        self._prepare_queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(self.prepare_lanes)]
+        self._rpc_queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(self.rpc_concurrency)]
+        self._workers = (
+            [asyncio.create_task(self._prepare_worker(q)) for q in self._prepare_queues] +
+            [asyncio.create_task(self._rpc_worker(q)) for q in self._rpc_queues]
+        )
+
+    async def stop(self):
+        """Stop the workers and fail anything still queued."""
+        for worker in self._workers + list(self._simulated):
+            worker.cancel()
+        await asyncio.gather(*self._workers, *self._simulated, return_exceptions=True)
+        self._workers = []
+        for queue in self._prepare_queues + self._rpc_queues:
+            while not queue.empty():
+                self._finish(queue.get_nowait(), "failed_cancelled")
+
+    @staticmethod
+    def _lane(address: str, lanes: int) -> int:
+        return zlib.crc32(address.encode()) % lanes
+
+    async def submit(
+        self, from_addr, to_addr: str, amount: int, label: str = "transfer", payload: bytes = b""
+    ) -> asyncio.Future:
+        """Queue a transaction; waits only while the sender's lane is full."""
+        job = SubmissionJob(
+            from_addr=from_addr,
+            to_addr=to_addr,
+            amount=amount,
+            label=label,
+            payload=payload,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self.submitted += 1
+        self.in_flight += 1
+        if self.wallet.simulated:
+            task = asyncio.create_task(self._simulate(job))
+            self._simulated.add(task)
+            task.add_done_callback(functools.partial(self._simulated_done, job))
+            return job.future
+        await self._prepare_queues[self._lane(from_addr.address, self.prepare_lanes)].put(job)
+        return job.future
+
+    def _finish(self, job: SubmissionJob, result: str):
+        self.in_flight -= 1
+        if result.startswith("failed"):
+            self.failed += 1
+        else:
+            self.completed += 1
+            self.total_latency += time.monotonic() - job.enqueued_at
+        if not job.future.done():
+            job.future.set_result(result)
+
+    async def _simulate(self, job: SubmissionJob):
+        result = await self.wallet.send_transaction(
+            job.from_addr, job.to_addr, job.amount, job.label, job.payload
+        )
+        self._finish(job, result)
+
+    def _simulated_done(self, job: SubmissionJob, task: asyncio.Task):
+        self._simulated.discard(task)
+        if task.cancelled():
+            self._finish(job, "failed_cancelled")
+
+    async def _prepare_worker(self, queue: asyncio.Queue):
+        while True:
+            job = await queue.get()
+            try:
+                job.prepared = await self.wallet._prepare_transaction(
+                    job.from_addr, job.to_addr, job.amount, job.payload
+                )
+                if job.prepared is None:
+                    self._finish(job, "failed_no_utxos")
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._finish(job, self.wallet._failure_code(e))
+                continue
+            # Blocks while the RPC lane is full — backpressure into this lane
+            await self._rpc_queues[self._lane(job.from_addr.address, self.rpc_concurrency)].put(job)
+
+    async def _rpc_worker(self, queue: asyncio.Queue):
+        while True:
+            job = await queue.get()
+            try:
+                result = await self.wallet._submit_prepared(job.from_addr, job.prepared, job.label)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.wallet._release(job.from_addr.address, job.prepared.outpoints)
+                result = self.wallet._failure_code(e)
+            self._finish(job, result)
+
+    def stats(self) -> Dict:
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "prepare_queued": sum(q.qsize() for q in self._prepare_queues),
+            "rpc_queued": sum(q.qsize() for q in self._rpc_queues),
+            "simulated_pending": len(self._simulated),
+            "prepare_lanes": self.prepare_lanes,
+            "rpc_concurrency": self.rpc_concurrency,
+            "queue_size": self.queue_size,
+            "avg_latency_ms": round(self.total_latency / self.completed * 1000, 1) if self.completed else 0.0,
+        }
@@ -1,15 +1,25 @@
 """
 Transaction encoding/decoding protocol for agent communication.
 
-Since Kaspa doesn't have smart contracts, we encode messages in transaction amounts.
+Since Kaspa doesn't have smart contracts, swarm messages ride on ordinary
+transactions. Messages are carried in a compact binary envelope in the
+transaction payload (covered by the signature through hash_payload); the
+older scheme that packed them into the amount is kept for decoding legacy
+transactions.
+
 This module handles the encoding/decoding logic for swarm coordination.
 """
 
 from enum import Enum
 from dataclasses import dataclass
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import Optional, Dict, Iterable, List, Tuple, Union
+import struct
 import time
 
+from backend.bech32_util import encode_address, decode_address, ADDRESS_VERSION, ADDRESS_PAYLOAD_LENGTH
+from backend.kaspa import codec
+
 
 class MessageType(Enum):
     """Agent communication message types encoded in transactions."""
@@ -32,10 +42,97 @@ class SwarmMessage:
     tx_id: str = ""
 
 
+# ── Payload envelope ────────────────────────────────────────
+#
+#   header  magic "KSW" | version u8 | msg type u8 | flags u8 | task id u64 | timestamp u32
+#   sender  address version u8 | 32/33-byte key (or 0xFF | len u8 | utf-8 for non-Kaspa ids)
+#   fields  count u8, then per field: tag u8 | value type u8 | length u32 | value
+#
+# All integers little-endian. Every field carries its length, so decoders
+# skip tags and value types they don't know; a new version number is only
+# needed when the header or sender layout changes.
+
+PAYLOAD_MAGIC = b"KSW"
+PAYLOAD_VERSION = 1
+
+_HEADER = struct.Struct("<3sBBBQI")
+_FIELD = struct.Struct("<BBI")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+FLAG_HAS_TASK_ID = 0x01
+
+# Field value types
+T_INT = 1      # i64
+T_FLOAT = 2    # f64
+T_STR = 3      # utf-8
+T_BYTES = 4
+T_BOOL = 5     # u8
+T_JSON = 6     # anything else (lists, dicts, None)
+T_BIGINT = 7   # signed big-endian, for ints outside i64
+
+# Well-known data keys get a one-byte tag; any other key is sent by name (tag 0)
+FIELD_TAGS = {
+    "bid": 1,
+    "reward": 2,
+    "solution": 3,
+    "description": 4,
+    "task_type": 5,
+    "input_data": 6,
+    "deadline": 7,
+    "coordinator": 8,
+}
+_TAG_NAMES = {tag: name for name, tag in FIELD_TAGS.items()}
+_MESSAGE_TYPES = {t.value: t for t in MessageType}
+_NAMED_FIELD = 0
+
+_SENDER_RAW = 0xFF
+_ADDRESS_TYPES = {version: name for name, version in ADDRESS_VERSION.items()}
+_ADDRESS_LENGTHS = {ADDRESS_VERSION[name]: n for name, n in ADDRESS_PAYLOAD_LENGTH.items()}
+
+
+@lru_cache(maxsize=4096)
+def _sender_to_bytes(sender: str) -> bytes:
+    try:
+        decoded = decode_address(sender)
+        return bytes([ADDRESS_VERSION[decoded["type"]]]) + decoded["payload"]
+    except ValueError:
+        raw = sender.encode()[:255]
+        return bytes([_SENDER_RAW, len(raw)]) + raw
+
+
+@lru_cache(maxsize=4096)
+def _sender_from_bytes(prefix: str, version: int, key: bytes) -> str:
+    return encode_address(prefix, _ADDRESS_TYPES[version], key)
+
+
+def _encode_value(value) -> Tuple[int, bytes]:
+    if isinstance(value, bool):
+        return T_BOOL, b"\x01" if value else b"\x00"
+    if isinstance(value, int):
+        if -(1 << 63) <= value < (1 << 63):
+            return T_INT, _I64.pack(value)
+        return T_BIGINT, value.to_bytes(value.bit_length() // 8 + 1, "big", signed=True)
+    if isinstance(value, float):
+        return T_FLOAT, _F64.pack(value)
+    if isinstance(value, str):
+        return T_STR, value.encode()
+    if isinstance(value, (bytes, bytearray)):
+        return T_BYTES, bytes(value)
+    return T_JSON, codec.dumps_bytes(value)
+
+
 class TransactionEncoder:
     """
     Encode/decode swarm messages in Kaspa transactions.
     
+    PAYLOAD ENCODING (current):
+    encode_payload() packs the full message — type, 64-bit task ID, sender
+    and typed data fields — into the transaction payload. The amount is then
+    just BASE_AMOUNT, and one transaction describes itself completely.
+    
+    The amount encoding below is kept for reading legacy transactions.
+    
     ENCODING SCHEME:
     Since Kaspa is UTXO-based without smart contracts:
     1. Use amount field for data encoding
@@ -55,6 +152,108 @@ class TransactionEncoder:
     
     BASE_AMOUNT = 1000  # Minimum transaction amount in sompi
     
+    @staticmethod
+    def encode_payload(msg: SwarmMessage) -> bytes:
+        """Serialize a message into the versioned binary payload envelope."""
+        flags = FLAG_HAS_TASK_ID if msg.task_id is not None else 0
+        parts = [
+            _HEADER.pack(
+                PAYLOAD_MAGIC, PAYLOAD_VERSION, msg.msg_type.value, flags,
+                msg.task_id or 0, int(msg.timestamp) & 0xFFFFFFFF,
+            ),
+            _sender_to_bytes(msg.sender),
+            bytes([len(msg.data)]),
+        ]
+        if len(msg.data) > 255:
+            raise ValueError("A message can carry at most 255 data fields")
+        for name, value in msg.data.items():
+            value_type, raw = _encode_value(value)
+            tag = FIELD_TAGS.get(name, _NAMED_FIELD)
+            if tag == _NAMED_FIELD:
+                key = name.encode()
+                raw = bytes([len(key)]) + key + raw
+            parts.append(_FIELD.pack(tag, value_type, len(raw)))
+            parts.append(raw)
+        return b"".join(parts)
+    
+    @staticmethod
+    def decode_payload(payload: Union[bytes, bytearray, memoryview], prefix: str = "kaspatest") -> Optional[SwarmMessage]:
+        """
+        Parse a payload envelope back into a message.
+        
+        Returns None for payloads that aren't swarm messages (wrong magic,
+        unknown version or message type, truncated data).
+        """
+        if not isinstance(payload, bytes):
+            payload = bytes(payload)
+        if payload[:3] != PAYLOAD_MAGIC:
+            return None
+        try:
+            _, version, type_code, flags, task_id, timestamp = _HEADER.unpack_from(payload)
+            msg_type = _MESSAGE_TYPES.get(type_code)
+            if version != PAYLOAD_VERSION or msg_type is None:
+                return None
+            
+            pos = _HEADER.size
+            sender_version = payload[pos]
+            if sender_version == _SENDER_RAW:
+                end = pos + 2 + payload[pos + 1]
+                sender = payload[pos + 2:end].decode()
+            else:
+                end = pos + 1 + _ADDRESS_LENGTHS[sender_version]
+                sender = _sender_from_bytes(prefix, sender_version, payload[pos + 1:end])
+            
+            count = payload[end]
+            pos = end + 1
+            data = {}
+            for _ in range(count):
+                tag, value_type, length = _FIELD.unpack_from(payload, pos)
+                pos += _FIELD.size
+                end = pos + length
+                if end > len(payload):
+                    return None
+                if tag == _NAMED_FIELD:
+                    key_end = pos + 1 + payload[pos]
+                    name = payload[pos + 1:key_end].decode()
+                    pos = key_end
+                else:
+                    name = _TAG_NAMES.get(tag)
+                    if name is None:
+                        pos = end
+                        continue  # field from a newer sender
+                if value_type == T_INT:
+                    data[name] = _I64.unpack_from(payload, pos)[0]
+                elif value_type == T_STR:
+                    data[name] = payload[pos:end].decode()
+                elif value_type == T_FLOAT:
+                    data[name] = _F64.unpack_from(payload, pos)[0]
+                elif value_type == T_JSON:
+                    data[name] = codec.loads(payload[pos:end])
+                elif value_type == T_BOOL:
+                    data[name] = payload[pos] != 0
+                elif value_type == T_BYTES:
+                    data[name] = payload[pos:end]
+                elif value_type == T_BIGINT:
+                    data[name] = int.from_bytes(payload[pos:end], "big", signed=True)
+                # Unknown value types (from a newer sender) are skipped
+                pos = end
+        except (ValueError, KeyError, IndexError, struct.error):
+            return None
+        
+        return SwarmMessage(
+            msg_type=msg_type,
+            sender=sender,
+            task_id=task_id if flags & FLAG_HAS_TASK_ID else None,
+            data=data,
+            timestamp=timestamp,
+        )
+    
+    @staticmethod
+    def decode_payloads(payloads: Iterable[bytes], prefix: str = "kaspatest") -> List[SwarmMessage]:
+        """Decode many payloads, skipping the ones that aren't swarm messages."""
+        decode = TransactionEncoder.decode_payload
+        return [m for m in (decode(p, prefix) for p in payloads) if m is not None]
+    
     @staticmethod
     def encode_task_announcement(task_id: int) -> int:
         """Encode task announcement message."""
@@ -72,7 +271,7 @@ class TransactionEncoder:
     
     @staticmethod
     def encode_message(msg: SwarmMessage) -> int:
-        """Convert message to transaction amount."""
+        """Convert message to transaction amount (legacy; see encode_payload)."""
         amount = TransactionEncoder.BASE_AMOUNT
         amount += msg.msg_type.value * 100
         
@@ -93,12 +292,24 @@ class TransactionEncoder:
         
         Expected tx_data format:
         {
+            "payload": hex str or bytes (preferred, if present),
             "amount": int,
             "sender": str,
             "timestamp": int,
             "tx_id": str
         }
         """
+        payload = tx_data.get("payload")
+        if payload:
+            try:
+                raw = bytes.fromhex(payload) if isinstance(payload, str) else payload
+            except ValueError:
+                raw = b""
+            message = TransactionEncoder.decode_payload(raw)
+            if message is not None:
+                message.tx_id = tx_data.get("tx_id", "")
+                return message
+        
         try:
             amount = tx_data.get("amount", 0)
             
@@ -140,5 +351,6 @@ class TransactionEncoder:
     @staticmethod
     def create_broadcast_address() -> str:
         """Create a special broadcast address for task announcements."""
-        # Using a recognizable pattern for broadcast
-        return "kaspatest:qr0000000000000000000000000000000000000000"
+        # Using a recognizable pattern for broadcast: the all-zero P2PK key.
+        # It must be a valid address so the output script can be built.
+        return encode_address("kaspatest", "pk", bytes(32))
@@ -7,13 +7,17 @@ os.environ.setdefault('COORDINATOR_PRIVATE_KEY', 'dda7c644ef54fe5989dd194bed1364
 from kaspa.wrpc_client import KaspaRpcClient
 
 ADDR = os.environ['COORDINATOR_ADDRESS']
+# Point at a fake node (python -m backend.kaspa.fake_node) to run without kaspad
+WS_URL = os.environ.get('KASPA_WS_URL', 'ws://127.0.0.1:18210')
 
 async def wait_for_sync():
-    c = KaspaRpcClient('ws://127.0.0.1:18210')
+    c = KaspaRpcClient(WS_URL)
     if not await c.connect():
         print("Cannot connect"); return False
     
     print("Waiting for node to sync...")
+    # Re-check on every DAA score change instead of sleeping a fixed 5s
+    daa_updates = await c.subscribe_virtual_daa_score_changed(buffer_size=1)
     while True:
         info = await c.get_server_info()
         synced = info.get("isSynced", False)
@@ -22,7 +26,11 @@ async def wait_for_sync():
         if synced:
             print(f"\n✅ Node synced! DAA={daa}")
             break
-        await asyncio.sleep(5)
+        try:
+            await asyncio.wait_for(daa_updates.__anext__(), timeout=5)
+        except (asyncio.TimeoutError, StopAsyncIteration):
+            pass
+    await daa_updates.close()
     
     # Check balance
     bal = await c.get_balance_by_address(ADDR)
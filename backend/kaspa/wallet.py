@@ -8,12 +8,13 @@ Manages:
 - Schnorr signing
 - Transaction broadcasting
 
-When MOCK_MODE=true, uses simulated transactions.
+When MOCK_MODE=true, uses simulated transactions — or, with a SimulatedLedger
+attached (MOCK_LEDGER=true), runs the full build/sign/submit path offline.
 When MOCK_MODE=false, constructs and broadcasts real Kaspa transactions.
 """
 
 import asyncio
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Set, Tuple
 import httpx
 from dataclasses import dataclass
 import secrets
@@ -35,7 +36,12 @@ from kaspa.sighash import (
     SIG_HASH_ALL, NATIVE_SUBNETWORK_ID
 )
 from kaspa.schnorr import build_signature_script, get_public_key
-from kaspa.wrpc_client import KaspaRpcClient
+from kaspa.connections import KaspaConnections, get_connections
+from kaspa.endpoints import EndpointManager, WRPC, REST, SIMNET
+from kaspa.simnet import SimulatedLedger
+from kaspa.submission import SubmissionPipeline
+from kaspa.confirmation import ConfirmationTracker
+from kaspa.metrics import CallMetrics, error_kind, instrumented
 
 
 # Minimum fee per transaction in sompi (0.0001 KAS per UTXO typically)
@@ -43,6 +49,25 @@ MIN_FEE_PER_INPUT = 10_000  # 0.0001 KAS
 DEFAULT_FEE = 10_000        # Base fee for simple tx
 
 
+# Failures that say something about the endpoint rather than the request
+# (ConnectionError is an OSError; REST 5xx answers are raised as one)
+_TRANSPORT_ERRORS = (OSError, TimeoutError, asyncio.TimeoutError, httpx.TransportError)
+
+
+def _failed_result(result) -> Optional[str]:
+    """Metrics failure hook: the wallet reports failures as "failed_*" strings."""
+    if isinstance(result, str) and result.startswith("failed"):
+        return result
+    return None
+
+
+def _failed_broadcast(result) -> Optional[str]:
+    """Metrics failure hook for _broadcast: None means no endpoint took the transaction."""
+    if result is None:
+        return "unreachable"
+    return _failed_result(result)
+
+
 @dataclass
 class KaspaAddress:
     """Represents a Kaspa wallet address with credentials."""
@@ -52,6 +77,15 @@ class KaspaAddress:
     balance: int = 0        # in sompi
 
 
+@dataclass
+class PreparedTransaction:
+    """A signed transaction ready to broadcast."""
+    tx_json: Dict
+    amount: int
+    fee: int
+    outpoints: List[Tuple[str, int]]   # reserved inputs (transaction id, index)
+
+
 class KaspaWallet:
     """
     Manages Kaspa wallet operations for agents.
@@ -63,41 +97,120 @@ class KaspaWallet:
     
     In mock mode:
     - Returns simulated transaction hashes
+    - Or, with a SimulatedLedger, uses real keys and transactions against
+      the in-process ledger instead of a node
     """
     
-    def __init__(self, rpc_url: str = "https://api.kaspa.org/testnet", mock_mode: bool = False):
+    def __init__(
+        self,
+        rpc_url: str = "https://api.kaspa.org/testnet",
+        mock_mode: bool = False,
+        connections: Optional[KaspaConnections] = None,
+        ledger: Optional[SimulatedLedger] = None,
+        address_namespace: str = "",
+        use_env_credentials: bool = True,
+    ):
         self.rpc_url = rpc_url
         self.mock_mode = mock_mode
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.ledger = ledger
         self._address_counter = 0
+        # Keeps simulated addresses distinct between wallets in different processes
+        self.address_namespace = address_namespace
+        # Only one wallet may hand out the funded COORDINATOR_* key: wallets
+        # in other processes would select and spend the same UTXOs
+        self.use_env_credentials = use_env_credentials
+        
+        # UTXOs spent by our own in-flight transactions, per address
+        self._reserved: Dict[str, Set[Tuple[str, int]]] = {}
+        # Per-address results of the last refresh_balances() cycle
+        self.balance_cache: Dict[str, int] = {}
+        self.utxo_cache: Dict[str, List[Dict]] = {}
+        self.last_refresh = 0.0
+        # Per-operation latency/errors/in-flight, plus fallback counters
+        self.metrics = CallMetrics()
+        # Staged submission pipeline, created on first submit_transaction()
+        self.pipeline: Optional[SubmissionPipeline] = None
+        # Follows broadcast transactions to acceptance (starts on first track)
+        self.tracker = ConfirmationTracker(
+            self,
+            poll_interval=float(os.getenv("TX_CONFIRM_POLL_INTERVAL", "1.0")),
+            drop_after=int(os.getenv("TX_CONFIRM_DROP_AFTER", "5")),
+            max_rebroadcasts=int(os.getenv("TX_CONFIRM_MAX_REBROADCASTS", "2")),
+            lookup_concurrency=int(os.getenv("TX_CONFIRM_CONCURRENCY", "32")),
+        )
         
-        # wRPC client for real transactions
-        self._rpc: Optional[KaspaRpcClient] = None
-        self._rpc_connected = False
+        # Shared HTTP pool + wRPC client — one per process, not per wallet.
+        # wRPC endpoint defaults to local kaspad node (run with --rpclisten-json=default)
+        self.connections = connections or get_connections()
+        self._ws_url = self.connections.ws_url
         
-        # wRPC endpoint — default to local kaspad node (run with --rpclisten-json=default)
-        self._ws_url = os.getenv("KASPA_WS_URL", "ws://127.0.0.1:18210")
+        # Health tracking / circuit breaking for wRPC and REST fallbacks
+        self.endpoints = EndpointManager(
+            failure_threshold=int(os.getenv("ENDPOINT_FAILURE_THRESHOLD", "3")),
+            cooldown=float(os.getenv("ENDPOINT_COOLDOWN", "30")),
+        )
+        if self.ledger:
+            self.endpoints.register("simnet", SIMNET, "simnet://local")
+        else:
+            self.endpoints.register("wrpc", WRPC, self._ws_url)
+            for base_url in ["https://api-tn10.kaspa.org", self.rpc_url]:
+                self.endpoints.register(base_url, REST, base_url)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self.connections.http
+
+    @property
+    def _rpc(self):
+        """The wRPC client, or the simulated ledger standing in for it."""
+        if self.ledger:
+            return self.ledger
+        return self.connections.rpc
+
+    @property
+    def simulated(self) -> bool:
+        """True when mock mode should short-circuit instead of using a ledger."""
+        return self.mock_mode and self.ledger is None
 
     async def _ensure_rpc(self) -> bool:
-        """Ensure wRPC connection is established."""
+        """Ensure the shared wRPC connection is established."""
+        if self.ledger:
+            return await self.ledger.connect()
         if self.mock_mode:
             return True
-        
-        if self._rpc_connected and self._rpc:
-            return True
-        
-        self._rpc = KaspaRpcClient(ws_url=self._ws_url)
-        connected = await self._rpc.connect()
-        self._rpc_connected = connected
-        
-        if connected:
-            try:
-                info = await self._rpc.get_server_info()
-                print(f"🌐 Kaspa node: {info.get('serverVersion', 'unknown')}")
-            except Exception:
-                pass
-        
-        return connected
+        return await self.connections.ensure_rpc()
+
+    async def subscribe_block_added(self, buffer_size: int = 1000):
+        """Stream added blocks from the node (or the simulated ledger)."""
+        if self.simulated:
+            raise ConnectionError("No chain to follow in simulated mode")
+        if not await self._ensure_rpc():
+            raise ConnectionError("wRPC not connected")
+        return await self._rpc.subscribe_block_added(buffer_size)
+
+    def for_agent(self, agent_id: str) -> "AgentWallet":
+        """Per-agent view of this wallet that can only sign with its own keys."""
+        return AgentWallet(self, agent_id)
+
+    def _endpoint_failed(self, ep, error: Exception, start: float):
+        """Record an endpoint failure (the wRPC client notices dead sockets itself)."""
+        self.endpoints.record_failure(ep, error, time.monotonic() - start)
+        # Every failure sends the caller on to the next endpoint (or gives up)
+        self.metrics.incr(f"fallbacks.{ep.kind}.{error_kind(error)}")
+
+    def _endpoint_rejected(self, ep, error: Exception, start: float):
+        """Record a request the endpoint answered with a rejection: it's healthy, the request isn't."""
+        self.endpoints.record_success(ep, time.monotonic() - start)
+        self.metrics.incr(f"rejections.{ep.kind}")
+
+    @staticmethod
+    def _check_http(resp: httpx.Response):
+        """Raise for a non-200 REST answer: overload and 5xx as endpoint failures, other 4xx as rejections."""
+        if resp.status_code == 200:
+            return
+        if resp.status_code >= 500 or resp.status_code in (408, 429):
+            raise ConnectionError(f"HTTP {resp.status_code}")
+        raise Exception(f"RPC error: HTTP {resp.status_code}: {resp.text[:200]}")
 
     async def create_address(self) -> KaspaAddress:
         """Generate new Kaspa address (SECP256k1) or load from Env."""
@@ -105,7 +218,7 @@ class KaspaWallet:
         env_addr = os.getenv("COORDINATOR_ADDRESS")
         env_key = os.getenv("COORDINATOR_PRIVATE_KEY")
         
-        if env_addr and env_key and not self.mock_mode:
+        if env_addr and env_key and self.use_env_credentials and not self.mock_mode:
             if self._address_counter == 0: 
                 self._address_counter += 1
                 # Derive public key from private key
@@ -118,9 +231,9 @@ class KaspaWallet:
                     balance=0
                 )
 
-        if self.mock_mode:
+        if self.simulated:
             self._address_counter += 1
-            address_hash = hashlib.sha256(f"agent_{self._address_counter}".encode()).hexdigest()[:40]
+            address_hash = hashlib.sha256(f"{self.address_namespace}agent_{self._address_counter}".encode()).hexdigest()[:40]
             return KaspaAddress(
                 address=f"kaspatest:qq{address_hash}",
                 private_key=secrets.token_hex(32),
@@ -140,68 +253,151 @@ class KaspaWallet:
         address = encode_address("kaspatest", "pk", x_only_pub_key)
         
         self._address_counter += 1
+        
+        # Simulated ledger: mint starting funds, split across several UTXOs
+        # so one agent can have more than one transaction in flight
+        balance = 0
+        if self.ledger:
+            balance = int(os.getenv("MOCK_LEDGER_FUNDING", "10000000"))
+            num_utxos = max(1, int(os.getenv("MOCK_LEDGER_FUNDING_UTXOS", "10")))
+            for _ in range(num_utxos):
+                self.ledger.fund(address, balance // num_utxos, x_only_pub_key)
+        
         return KaspaAddress(
             address=address,
             private_key=private_key_hex,
             public_key=x_only_pub_key.hex(),
-            balance=0
+            balance=balance
         )
 
+    @instrumented("get_balance")
     async def get_balance(self, address: str) -> int:
-        """Get balance in sompi."""
-        if self.mock_mode:
+        """Get balance in sompi (raises ConnectionError if no endpoint answers)."""
+        if self.simulated:
             return 10_000_000
         
-        # Try wRPC first
-        if await self._ensure_rpc():
+        for ep in self.endpoints.candidates():
+            start = time.monotonic()
             try:
-                balance = await self._rpc.get_balance_by_address(address)
-                return balance
+                if ep.kind in (WRPC, SIMNET):
+                    if not await self._ensure_rpc():
+                        raise ConnectionError("wRPC unavailable")
+                    balance = await self._rpc.get_balance_by_address(address)
+                else:
+                    resp = await self.client.get(f"{ep.url}/addresses/{address}/balance", timeout=10.0)
+                    self._check_http(resp)
+                    balance = int(resp.json().get("balance", 0))
+            except _TRANSPORT_ERRORS as e:
+                self._endpoint_failed(ep, e, start)
+                continue
             except Exception as e:
-                pass
+                self._endpoint_rejected(ep, e, start)
+                raise
+            self.endpoints.record_success(ep, time.monotonic() - start)
+            return balance
         
-        # Fallback to REST API
-        try:
-            response = await self.client.post(
-                f"{self.rpc_url}/messages", 
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "getBalanceByAddress",
-                    "params": {"address": address}
-                }
-            )
-            data = response.json()
-            return int(data.get("result", {}).get("balance", 0))
-        except Exception as e:
-            return 0
+        raise ConnectionError("Cannot fetch balance — all endpoints unreachable")
 
+    @instrumented("get_utxos")
     async def get_utxos(self, address: str) -> List[Dict]:
         """Fetch UTXOs for an address via wRPC or REST API."""
-        # Try wRPC first
-        try:
-            if await self._ensure_rpc():
-                utxos = await self._rpc.get_utxos_by_addresses([address])
-                if utxos:
-                    return utxos
-        except Exception:
-            pass
-        
-        # Fallback: REST API
-        rest_urls = [
-            "https://api-tn10.kaspa.org",
-            self.rpc_url
-        ]
-        for base_url in rest_urls:
+        # Fastest healthy endpoint first; open circuits are skipped outright
+        empty_answer = None
+        for ep in self.endpoints.candidates():
+            start = time.monotonic()
             try:
-                resp = await self.client.get(f"{base_url}/addresses/{address}/utxos", timeout=10.0)
-                if resp.status_code == 200:
-                    return resp.json()
-            except Exception:
+                if ep.kind in (WRPC, SIMNET):
+                    if not await self._ensure_rpc():
+                        raise ConnectionError("wRPC unavailable")
+                    utxos = await self._rpc.get_utxos_by_addresses([address])
+                else:
+                    resp = await self.client.get(f"{ep.url}/addresses/{address}/utxos", timeout=10.0)
+                    self._check_http(resp)
+                    utxos = resp.json()
+            except _TRANSPORT_ERRORS as e:
+                self._endpoint_failed(ep, e, start)
                 continue
+            except Exception as e:
+                self._endpoint_rejected(ep, e, start)
+                raise
+            self.endpoints.record_success(ep, time.monotonic() - start)
+            # An empty wRPC answer may just be a node without --utxoindex; ask REST too
+            if utxos or ep.kind != WRPC:
+                return utxos
+            empty_answer = utxos
         
+        if empty_answer is not None:
+            return empty_answer
+        raise ConnectionError("Cannot fetch UTXOs — all endpoints unreachable")
+
+    @instrumented("get_utxos_batch")
+    async def get_utxos_batch(self, addresses: List[str]) -> Dict[str, List[Dict]]:
+        """Fetch UTXOs for many addresses in a single request, grouped by address."""
+        empty_answer = None
+        for ep in self.endpoints.candidates():
+            start = time.monotonic()
+            try:
+                if ep.kind in (WRPC, SIMNET):
+                    if not await self._ensure_rpc():
+                        raise ConnectionError("wRPC unavailable")
+                    entries = await self._rpc.get_utxos_by_addresses(addresses)
+                else:
+                    resp = await self.client.post(
+                        f"{ep.url}/addresses/utxos", json={"addresses": addresses}, timeout=30.0
+                    )
+                    self._check_http(resp)
+                    entries = resp.json()
+            except _TRANSPORT_ERRORS as e:
+                self._endpoint_failed(ep, e, start)
+                continue
+            except Exception as e:
+                self._endpoint_rejected(ep, e, start)
+                raise
+            self.endpoints.record_success(ep, time.monotonic() - start)
+
+            grouped: Dict[str, List[Dict]] = {address: [] for address in addresses}
+            for entry in entries:
+                if entry.get("address") in grouped:
+                    grouped[entry["address"]].append(entry)
+            # Same --utxoindex caveat as get_utxos: an empty wRPC answer gets a second opinion
+            if entries or ep.kind != WRPC:
+                return grouped
+            empty_answer = grouped
+
+        if empty_answer is not None:
+            return empty_answer
         raise ConnectionError("Cannot fetch UTXOs — all endpoints unreachable")
 
+    @instrumented("refresh_balances")
+    async def refresh_balances(self, addresses: List[str], chunk_size: int = 500) -> Dict[str, int]:
+        """
+        Refresh the balance and UTXO caches for many addresses at once.
+
+        Costs one request per `chunk_size` addresses instead of one per
+        address. Addresses whose chunk fails keep their previous cached
+        values. Returns the refreshed balances (nothing in simulated mode).
+        """
+        if self.simulated:
+            return {}
+
+        chunk_size = max(1, chunk_size)
+        unique = list(dict.fromkeys(addresses))
+        chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+        results = await asyncio.gather(*(self.get_utxos_batch(c) for c in chunks), return_exceptions=True)
+
+        refreshed: Dict[str, int] = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ Balance refresh failed for {len(chunk)} addresses: {result}")
+                continue
+            for address, utxos in result.items():
+                self.utxo_cache[address] = utxos
+                refreshed[address] = self.balance_cache[address] = sum(
+                    int(u.get("utxoEntry", {}).get("amount", "0")) for u in utxos
+                )
+        self.last_refresh = time.time()
+        return refreshed
+
     def _select_utxos(self, utxos: List[Dict], amount: int, fee: int) -> tuple:
         """
         Select UTXOs to cover the amount + fee.
@@ -243,9 +439,11 @@ class KaspaWallet:
         amount: int,
         change_address: str,
         change_amount: int,
+        payload: bytes = b'',
     ) -> tuple:
         """
         Build a Transaction object from UTXOs and desired outputs.
+        `payload` carries the encoded swarm message (covered by the sighash).
         Returns (Transaction, list of UtxoEntry for signing).
         """
         inputs = []
@@ -313,7 +511,7 @@ class KaspaWallet:
             lock_time=0,
             subnetwork_id=NATIVE_SUBNETWORK_ID,
             gas=0,
-            payload=b''
+            payload=payload
         )
         
         return tx, utxo_entries
@@ -376,7 +574,11 @@ class KaspaWallet:
             "payload": tx.payload.hex() if tx.payload else ""
         }
 
-    async def send_transaction(self, from_addr: KaspaAddress, to_addr: str, amount: int) -> str:
+    @instrumented("send_transaction", failure=_failed_result)
+    async def send_transaction(
+        self, from_addr: KaspaAddress, to_addr: str, amount: int, label: str = "transfer",
+        payload: bytes = b"",
+    ) -> str:
         """
         Send a real Kaspa transaction.
         
@@ -392,104 +594,263 @@ class KaspaWallet:
             from_addr: Sender's KaspaAddress (with private key)
             to_addr: Recipient's address string
             amount: Amount in sompi
+            label: Message type, for confirmation latency stats
+            payload: Encoded swarm message to carry in the transaction payload
         
         Returns:
             Transaction ID (hash) or "failed"
         """
-        if self.mock_mode:
+        if self.simulated:
             await asyncio.sleep(0.5)
             return f"tx_{secrets.token_hex(8)}"
             
         try:
-            print(f"📤 Building tx: {amount} sompi from {from_addr.address[:20]}... → {to_addr[:20]}...")
-            
-            # 1. Fetch UTXOs
-            utxos = await self.get_utxos(from_addr.address)
-            if not utxos:
-                print(f"❌ No UTXOs found for {from_addr.address}")
+            prepared = await self._prepare_transaction(from_addr, to_addr, amount, payload)
+            if prepared is None:
                 return "failed_no_utxos"
-            
-            print(f"   Found {len(utxos)} UTXOs")
-            
-            # 2. Select UTXOs
-            selected, total_input, change, fee = self._select_utxos(utxos, amount, DEFAULT_FEE)
-            print(f"   Selected {len(selected)} UTXOs, total={total_input}, fee={fee}, change={change}")
-            
-            # 3. Build transaction
-            tx, utxo_entries = self._build_transaction(
-                selected_utxos=selected,
-                to_address=to_addr,
-                amount=amount,
-                change_address=from_addr.address,
-                change_amount=change
+            return await self._submit_prepared(from_addr, prepared, label)
+        except Exception as e:
+            return self._failure_code(e)
+
+    async def submit_transaction(
+        self, from_addr: KaspaAddress, to_addr: str, amount: int, label: str = "transfer",
+        payload: bytes = b"",
+    ) -> asyncio.Future:
+        """
+        Queue a transaction on the submission pipeline.
+        
+        Returns as soon as the transaction is queued (waiting only when the
+        pipeline is full) with a future that resolves to the same result
+        send_transaction would return.
+        """
+        if self.pipeline is None:
+            self.pipeline = SubmissionPipeline(
+                self,
+                prepare_lanes=int(os.getenv("TX_PREPARE_LANES", "4")),
+                rpc_concurrency=int(os.getenv("TX_RPC_CONCURRENCY", "16")),
+                queue_size=int(os.getenv("TX_QUEUE_SIZE", "100")),
             )
-            
-            # 4. Sign all inputs
-            tx = self._sign_transaction(tx, utxo_entries, from_addr.private_key)
-            print(f"   ✅ Signed {len(tx.inputs)} inputs")
-            
-            # 5. Serialize to JSON
-            tx_json = self._tx_to_json(tx)
-            
-            # 6. Broadcast — try wRPC first, then REST API
-            tx_id = None
-            
-            # Try wRPC
-            try:
-                if await self._ensure_rpc():
-                    tx_id = await self._rpc.submit_transaction(tx_json)
-            except Exception as e:
-                print(f"   ⚠️ wRPC broadcast failed: {e}")
-            
-            # Fallback: REST API
-            if not tx_id:
-                rest_urls = [
-                    "https://api-tn10.kaspa.org",
-                    self.rpc_url
-                ]
-                rest_payload = {
-                    "transaction": tx_json,
-                    "allowOrphan": False
-                }
-                for base_url in rest_urls:
-                    try:
-                        resp = await self.client.post(
-                            f"{base_url}/transactions",
-                            json=rest_payload,
-                            timeout=15.0
-                        )
-                        if resp.status_code == 200:
-                            data = resp.json()
-                            tx_id = data.get("transactionId", "")
-                            break
-                    except Exception:
-                        continue
-            
-            if not tx_id:
-                print("❌ All broadcast methods failed (testnet-10 infrastructure may be down)")
-                return "failed_broadcast"
-            
-            print(f"   🎉 Broadcast success! TX: {tx_id}")
-            
-            # Update sender balance
-            from_addr.balance = max(0, from_addr.balance - amount - fee)
-            
+            self.pipeline.start()
+        return await self.pipeline.submit(from_addr, to_addr, amount, label, payload)
+
+    @instrumented("prepare_transaction")
+    async def _prepare_transaction(
+        self, from_addr: KaspaAddress, to_addr: str, amount: int, payload: bytes = b""
+    ) -> Optional[PreparedTransaction]:
+        """
+        Steps 1-5 of send_transaction: fetch, select, build, sign, serialize.
+        
+        Selected UTXOs are reserved so a concurrent send from the same address
+        can't pick them again before this one is accepted. Returns None if the
+        sender has no spendable UTXOs.
+        """
+        print(f"📤 Building tx: {amount} sompi from {from_addr.address[:20]}... → {to_addr[:20]}...")
+        
+        # 1. Fetch UTXOs, skipping ones already spent by our in-flight transactions
+        utxos = await self.get_utxos(from_addr.address)
+        utxos = self._unreserved(from_addr.address, utxos)
+        if not utxos:
+            print(f"❌ No UTXOs found for {from_addr.address}")
+            return None
+        
+        print(f"   Found {len(utxos)} UTXOs")
+        
+        # 2. Select UTXOs
+        selected, total_input, change, fee = self._select_utxos(utxos, amount, DEFAULT_FEE)
+        print(f"   Selected {len(selected)} UTXOs, total={total_input}, fee={fee}, change={change}")
+        
+        # 3. Build transaction
+        tx, utxo_entries = self._build_transaction(
+            selected_utxos=selected,
+            to_address=to_addr,
+            amount=amount,
+            change_address=from_addr.address,
+            change_amount=change,
+            payload=payload
+        )
+        
+        # 4. Sign all inputs
+        tx = self._sign_transaction(tx, utxo_entries, from_addr.private_key)
+        print(f"   ✅ Signed {len(tx.inputs)} inputs")
+        
+        outpoints = [
+            (u["outpoint"]["transactionId"], int(u["outpoint"].get("index", 0)))
+            for u in selected
+        ]
+        self._reserved.setdefault(from_addr.address, set()).update(outpoints)
+        
+        # 5. Serialize to JSON
+        return PreparedTransaction(
+            tx_json=self._tx_to_json(tx),
+            amount=amount,
+            fee=fee,
+            outpoints=outpoints,
+        )
+
+    @instrumented("submit_prepared", failure=_failed_result)
+    async def _submit_prepared(
+        self, from_addr: KaspaAddress, prepared: PreparedTransaction, label: str = "transfer"
+    ) -> str:
+        """Step 6 of send_transaction: broadcast, start tracking, update the sender's balance."""
+        # 6. Broadcast — fastest healthy endpoint first
+        tx_id = await self._broadcast(prepared.tx_json)
+        
+        if tx_id == "failed_rejected":
+            self._release(from_addr.address, prepared.outpoints)
             return tx_id
-            
-        except ValueError as e:
+        if not tx_id:
+            self._release(from_addr.address, prepared.outpoints)
+            print("❌ All broadcast methods failed (testnet-10 infrastructure may be down)")
+            return "failed_broadcast"
+        
+        print(f"   🎉 Broadcast success! TX: {tx_id}")
+        
+        # Follow it to acceptance (releases the reserved UTXOs if it's dropped)
+        self.tracker.track(tx_id, prepared.tx_json, from_addr.address, prepared.outpoints, label)
+        
+        # Update sender balance
+        from_addr.balance = max(0, from_addr.balance - prepared.amount - prepared.fee)
+        
+        return tx_id
+
+    def _unreserved(self, address: str, utxos: List[Dict]) -> List[Dict]:
+        """
+        Filter out UTXOs reserved by in-flight transactions.
+        
+        Reservations whose UTXO no longer shows up have been spent on-chain,
+        so they are dropped here rather than tracked separately.
+        """
+        reserved = self._reserved.get(address)
+        if not reserved:
+            return utxos
+        present = set()
+        free = []
+        for u in utxos:
+            outpoint = (u.get("outpoint", {}).get("transactionId", ""), int(u.get("outpoint", {}).get("index", 0)))
+            present.add(outpoint)
+            if outpoint not in reserved:
+                free.append(u)
+        reserved &= present
+        return free
+
+    def _release(self, address: str, outpoints: List[Tuple[str, int]]):
+        """Return reserved UTXOs to the spendable pool."""
+        reserved = self._reserved.get(address)
+        if reserved:
+            reserved.difference_update(outpoints)
+
+    @staticmethod
+    def _failure_code(e: Exception) -> str:
+        """Map a send failure to the result string returned to callers."""
+        if isinstance(e, ValueError):
             print(f"❌ Tx Failed (insufficient funds): {e}")
             return "failed_insufficient_funds"
-        except ConnectionError as e:
+        if isinstance(e, ConnectionError):
             print(f"❌ Tx Failed (connection): {e}")
             return "failed_connection"
-        except Exception as e:
-            print(f"❌ Tx Failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return "failed"
+        print(f"❌ Tx Failed: {e}")
+        import traceback
+        traceback.print_exception(type(e), e, e.__traceback__)
+        return "failed"
+
+    @instrumented("broadcast", failure=_failed_broadcast)
+    async def _broadcast(self, tx_json: Dict) -> Optional[str]:
+        """
+        Submit a signed transaction via the healthy endpoints, in order.
+        
+        Returns the transaction ID, "failed_rejected" if a node refused the
+        transaction itself (double spend, missing inputs, ...), or None if
+        no endpoint could be reached.
+        """
+        rest_payload = {
+            "transaction": tx_json,
+            "allowOrphan": False
+        }
+        for ep in self.endpoints.candidates():
+            start = time.monotonic()
+            try:
+                if ep.kind in (WRPC, SIMNET):
+                    if not await self._ensure_rpc():
+                        raise ConnectionError("wRPC unavailable")
+                    tx_id = await self._rpc.submit_transaction(tx_json)
+                else:
+                    resp = await self.client.post(
+                        f"{ep.url}/transactions",
+                        json=rest_payload,
+                        timeout=15.0
+                    )
+                    self._check_http(resp)
+                    tx_id = resp.json().get("transactionId", "")
+                if not tx_id:
+                    raise ConnectionError("No transaction ID returned")
+            except _TRANSPORT_ERRORS as e:
+                self._endpoint_failed(ep, e, start)
+                print(f"   ⚠️ {ep.kind} broadcast via {ep.name} failed: {e}")
+                continue
+            except Exception as e:
+                # The node refused the transaction itself; any other endpoint would too
+                self._endpoint_rejected(ep, e, start)
+                print(f"   ❌ Transaction rejected by {ep.name}: {e}")
+                return "failed_rejected"
+            self.endpoints.record_success(ep, time.monotonic() - start)
+            return tx_id
+        return None
 
     async def close(self):
         """Close all connections."""
-        await self.client.aclose()
-        if self._rpc:
-            await self._rpc.close()
+        if self.pipeline:
+            await self.pipeline.stop()
+        await self.tracker.stop()
+        await self.connections.close()
+        if self.ledger:
+            await self.ledger.stop()
+
+
+class AgentWallet:
+    """
+    An agent's scoped view of the shared KaspaWallet.
+    
+    Connections, endpoint health and mode all come from the shared wallet;
+    the view only remembers which keys its agent created and refuses to
+    sign for any other address.
+    """
+    
+    def __init__(self, wallet: KaspaWallet, agent_id: str):
+        self.wallet = wallet
+        self.agent_id = agent_id
+        self._keys: Dict[str, KaspaAddress] = {}
+    
+    @property
+    def mock_mode(self) -> bool:
+        return self.wallet.mock_mode
+    
+    async def create_address(self) -> KaspaAddress:
+        address = await self.wallet.create_address()
+        self._keys[address.address] = address
+        return address
+    
+    async def get_balance(self, address: str) -> int:
+        return await self.wallet.get_balance(address)
+    
+    async def get_utxos(self, address: str) -> List[Dict]:
+        return await self.wallet.get_utxos(address)
+    
+    async def send_transaction(
+        self, from_addr: KaspaAddress, to_addr: str, amount: int, label: str = "transfer",
+        payload: bytes = b"",
+    ) -> str:
+        if from_addr.address not in self._keys:
+            print(f"❌ {self.agent_id} tried to spend from foreign address {from_addr.address[:20]}...")
+            return "failed_unauthorized"
+        return await self.wallet.send_transaction(from_addr, to_addr, amount, label, payload)
+    
+    async def submit_transaction(
+        self, from_addr: KaspaAddress, to_addr: str, amount: int, label: str = "transfer",
+        payload: bytes = b"",
+    ) -> asyncio.Future:
+        if from_addr.address not in self._keys:
+            print(f"❌ {self.agent_id} tried to spend from foreign address {from_addr.address[:20]}...")
+            future = asyncio.get_running_loop().create_future()
+            future.set_result("failed_unauthorized")
+            return future
+        return await self.wallet.submit_transaction(from_addr, to_addr, amount, label, payload)
@@ -1,12 +1,39 @@
 """
 Kaspa wRPC Client — WebSocket JSON-RPC for direct Kaspa node communication.
 
-Simple send/receive pattern — no background tasks, no hanging.
+Multiplexed: a single background reader task owns the socket's receive side
+and dispatches each response to the future of the request with the same ID,
+and each notification to the handlers registered for its method. Any number
+of callers can share one connection with many requests in flight.
+
+Subscriptions (notifyUtxosChanged, notifyVirtualDaaScoreChanged,
+notifyBlockAdded) are exposed as async iterators over bounded buffers:
+
+    sub = await client.subscribe_utxos_changed([address])
+    async for change in sub:
+        ...
+    await sub.close()
+
+A consumer that falls behind loses the oldest notifications (counted in
+`sub.dropped`) rather than growing memory or stalling the reader.
+
+Reconnect: WebSocket pings detect a dead node within `ping_interval +
+ping_timeout`. The client then reconnects with jittered exponential backoff,
+re-subscribes every open subscription, and resends in-flight read requests.
+submitTransaction is never resent: its callers get a ConnectionError, since
+the node may or may not have accepted the transaction. Calls made while
+disconnected fail fast with ConnectionError so callers can fall back.
 """
 
 import asyncio
-import json
-from typing import Dict, List, Optional
+import itertools
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from kaspa import codec
+from kaspa.metrics import CallMetrics, error_kind
 
 try:
     import websockets
@@ -14,24 +41,159 @@ except ImportError:
     websockets = None
 
 
+NotificationHandler = Callable[[Dict], None]
+
+UTXOS_CHANGED = "utxosChangedNotification"
+VIRTUAL_DAA_SCORE_CHANGED = "virtualDaaScoreChangedNotification"
+BLOCK_ADDED = "blockAddedNotification"
+
+# Requests that must not be resent after a reconnect
+_NOT_REPLAYABLE = {"submitTransaction"}
+
+# Notification method → the RPC that starts/stops it
+_SUBSCRIBE_METHODS = {
+    UTXOS_CHANGED: "notifyUtxosChanged",
+    VIRTUAL_DAA_SCORE_CHANGED: "notifyVirtualDaaScoreChanged",
+    BLOCK_ADDED: "notifyBlockAdded",
+}
+
+
+class Subscription:
+    """Async iterator over one notification stream, with a bounded buffer."""
+
+    def __init__(self, client: "KaspaRpcClient", notification: str,
+                 addresses: Optional[Iterable[str]] = None, buffer_size: int = 1000):
+        self.client = client
+        self.notification = notification
+        self.addresses = set(addresses) if addresses is not None else None
+        self.buffer_size = max(1, buffer_size)
+        self.received = 0
+        self.dropped = 0
+        self.closed = False
+        self._buffer: deque = deque()
+        self._ready = asyncio.Event()
+
+    def _push(self, params: Dict):
+        if self.closed:
+            return
+        if self.addresses is not None:
+            # The node subscription is shared; keep only this subscriber's addresses
+            added = [u for u in params.get("added", []) if u.get("address") in self.addresses]
+            removed = [u for u in params.get("removed", []) if u.get("address") in self.addresses]
+            if not added and not removed:
+                return
+            params = {"added": added, "removed": removed}
+        if len(self._buffer) >= self.buffer_size:
+            self._buffer.popleft()
+            self.dropped += 1
+        self._buffer.append(params)
+        self.received += 1
+        self._ready.set()
+
+    def _end(self):
+        self.closed = True
+        self._ready.set()
+
+    def get_nowait(self) -> Optional[Dict]:
+        """Next buffered notification, or None if the buffer is empty."""
+        return self._buffer.popleft() if self._buffer else None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict:
+        while not self._buffer:
+            if self.closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        return self._buffer.popleft()
+
+    async def close(self):
+        await self.client.unsubscribe(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+@dataclass
+class RpcMessage:
+    """A decoded wRPC frame: a response (has `id`) or a notification."""
+    id: Any = None
+    method: str = ""
+    params: Any = None
+    result: Any = None
+    error: Any = None
+
+
+@dataclass
+class _Request:
+    """An in-flight request, kept so it can be resent after a reconnect."""
+    method: str
+    message: str
+    future: asyncio.Future
+
+
 class KaspaRpcClient:
     """WebSocket JSON-RPC client for Kaspa nodes."""
 
-    def __init__(self, ws_url: str = "ws://127.0.0.1:18210"):
+    def __init__(
+        self,
+        ws_url: str = "ws://127.0.0.1:18210",
+        auto_reconnect: bool = True,
+        ping_interval: Optional[float] = 10.0,
+        ping_timeout: Optional[float] = 10.0,
+        reconnect_base: float = 0.5,
+        reconnect_max: float = 30.0,
+        metrics: Optional[CallMetrics] = None,
+    ):
         self.ws_url = ws_url
+        self.auto_reconnect = auto_reconnect
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.reconnect_base = reconnect_base   # first backoff delay, seconds
+        self.reconnect_max = reconnect_max     # backoff cap, seconds
         self._ws = None
-        self._request_id = 0
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, _Request] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._handlers: Dict[str, List[NotificationHandler]] = {}
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+        self.reconnects = 0
+        self.replayed = 0
+        # Per-method latency/errors/in-flight; a pool shares one across its sockets
+        self.metrics = metrics or CallMetrics()
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    @property
+    def reconnecting(self) -> bool:
+        return self._reconnect_task is not None and not self._reconnect_task.done()
+
+    @property
+    def pending_requests(self) -> int:
+        """Requests sent and still awaiting a response."""
+        return len(self._pending)
 
     async def connect(self) -> bool:
         """Connect to the Kaspa node via WebSocket."""
         if websockets is None:
             print("⚠️ websockets not installed")
             return False
+        if self.connected:
+            return True
+        if self.reconnecting:
+            return False
+        self._closing = False
         try:
-            self._ws = await asyncio.wait_for(
-                websockets.connect(self.ws_url, ping_interval=None, close_timeout=3),
-                timeout=5,
-            )
+            self._attach(await self._open())
             print(f"✅ Connected to {self.ws_url}")
             return True
         except Exception as e:
@@ -39,28 +201,207 @@ class KaspaRpcClient:
             self._ws = None
             return False
 
+    async def _open(self):
+        return await asyncio.wait_for(
+            websockets.connect(
+                self.ws_url,
+                ping_interval=self.ping_interval,
+                ping_timeout=self.ping_timeout,
+                close_timeout=3,
+                max_size=None,
+            ),
+            timeout=5,
+        )
+
+    def _attach(self, ws):
+        self._ws = ws
+        self._reader = asyncio.create_task(self._read_loop(ws))
+
+    async def _read_loop(self, ws):
+        """Route every incoming message to its request future or notification handlers."""
+        error: Exception = ConnectionError("Connection closed")
+        try:
+            async for raw in ws:
+                try:
+                    msg = codec.decode(raw, RpcMessage)
+                except ValueError:
+                    continue
+                if msg.id is not None:
+                    request = self._pending.pop(msg.id, None)
+                    if request is None or request.future.done():
+                        continue  # late reply to a request that already timed out
+                    future = request.future
+                    if msg.error:
+                        future.set_exception(Exception(f"RPC error: {msg.error}"))
+                    else:
+                        future.set_result((msg.params if msg.params is not None else msg.result) or {})
+                else:
+                    self._dispatch_notification(msg.method, msg.params or {})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = ConnectionError(f"Connection lost: {e}")
+        finally:
+            if self._ws is ws:
+                self._ws = None
+            if self._closing or not self.auto_reconnect:
+                self._fail_pending(error)
+                self._end_subscriptions()
+            else:
+                # Reads wait to be resent; submissions can't be, so fail them now
+                self._fail_pending(error, only=_NOT_REPLAYABLE)
+                print(f"⚠️ Lost connection to {self.ws_url}; reconnecting")
+                self._reconnect_task = asyncio.create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self):
+        """Reconnect with jittered exponential backoff, then restore subscriptions and requests."""
+        delay = self.reconnect_base
+        while not self._closing:
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            try:
+                ws = await self._open()
+            except Exception:
+                delay = min(delay * 2, self.reconnect_max)
+                continue
+            self._attach(ws)
+            self.reconnects += 1
+            print(f"🔌 Reconnected to {self.ws_url}")
+            await self._replay()
+            await self._resubscribe()
+            return
+
+    async def _replay(self):
+        for request in list(self._pending.values()):
+            if request.future.done():
+                continue
+            try:
+                await self._ws.send(request.message)
+                self.replayed += 1
+            except Exception:
+                return  # dropped again; the next reconnect replays what's left
+
+    async def _resubscribe(self):
+        for notification, subs in list(self._subscriptions.items()):
+            if not subs:
+                continue
+            params = {"command": "Start"}
+            if notification == UTXOS_CHANGED:
+                params["addresses"] = list(set().union(*(sub.addresses for sub in subs)))
+            try:
+                await self._rpc_call(_SUBSCRIBE_METHODS[notification], params)
+            except Exception as e:
+                print(f"⚠️ Re-subscribing to {notification} failed: {e}")
+
+    def _dispatch_notification(self, method: str, params: Dict):
+        for sub in self._subscriptions.get(method, ()):
+            sub._push(params)
+        for handler in list(self._handlers.get(method, ())):
+            try:
+                handler(params)
+            except Exception as e:
+                print(f"⚠️ Notification handler for {method} failed: {e}")
+
+    def _fail_pending(self, error: Exception, only: Optional[set] = None):
+        for rid, request in list(self._pending.items()):
+            if only is not None and request.method not in only:
+                continue
+            del self._pending[rid]
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    def add_notification_handler(self, method: str, handler: NotificationHandler):
+        """Call `handler(params)` for every notification with this method name."""
+        self._handlers.setdefault(method, []).append(handler)
+
+    def remove_notification_handler(self, method: str, handler: NotificationHandler):
+        handlers = self._handlers.get(method, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    # ── Subscriptions ───────────────────────────────────────
+
+    async def subscribe_utxos_changed(self, addresses: List[str], buffer_size: int = 1000) -> Subscription:
+        """Stream UTXO set changes ({"added": [...], "removed": [...]}) for these addresses."""
+        sub = Subscription(self, UTXOS_CHANGED, addresses, buffer_size)
+        await self._rpc_call("notifyUtxosChanged", {"addresses": list(sub.addresses), "command": "Start"})
+        self._subscriptions.setdefault(UTXOS_CHANGED, []).append(sub)
+        return sub
+
+    async def subscribe_virtual_daa_score_changed(self, buffer_size: int = 1000) -> Subscription:
+        """Stream virtual DAA score updates ({"virtualDaaScore": n})."""
+        return await self._subscribe(VIRTUAL_DAA_SCORE_CHANGED, buffer_size)
+
+    async def subscribe_block_added(self, buffer_size: int = 1000) -> Subscription:
+        """Stream every block added to the DAG ({"block": {...}})."""
+        return await self._subscribe(BLOCK_ADDED, buffer_size)
+
+    async def _subscribe(self, notification: str, buffer_size: int) -> Subscription:
+        sub = Subscription(self, notification, buffer_size=buffer_size)
+        if not self._subscriptions.get(notification):
+            await self._rpc_call(_SUBSCRIBE_METHODS[notification], {"command": "Start"})
+        self._subscriptions.setdefault(notification, []).append(sub)
+        return sub
+
+    async def unsubscribe(self, sub: Subscription):
+        """End a subscription; the node-side one stops when nobody else needs it."""
+        subs = self._subscriptions.get(sub.notification, [])
+        sub._end()
+        if sub not in subs:
+            return
+        subs.remove(sub)
+        if not self.connected:
+            return
+
+        if sub.notification == UTXOS_CHANGED:
+            still_wanted = set().union(*(s.addresses for s in subs))
+            unused = sub.addresses - still_wanted
+            if not unused:
+                return
+            params = {"addresses": list(unused), "command": "Stop"}
+        elif subs:
+            return
+        else:
+            params = {"command": "Stop"}
+        try:
+            await self._rpc_call(_SUBSCRIBE_METHODS[sub.notification], params)
+        except Exception as e:
+            print(f"⚠️ Unsubscribe from {sub.notification} failed: {e}")
+
+    def _end_subscriptions(self):
+        subscriptions, self._subscriptions = self._subscriptions, {}
+        for subs in subscriptions.values():
+            for sub in subs:
+                sub._end()
+
     async def _rpc_call(self, method: str, params: Optional[Dict] = None, timeout: float = 10.0) -> Dict:
-        """Send JSON-RPC request and wait for matching response."""
+        """Send JSON-RPC request and wait for its response."""
+        started = self.metrics.start(method)
         if self._ws is None:
+            self.metrics.finish(method, started, "connection")
             raise ConnectionError("Not connected")
 
-        self._request_id += 1
-        rid = self._request_id
-        msg = json.dumps({"id": rid, "method": method, "params": params or {}})
-        await self._ws.send(msg)
-
-        # Read responses until we get the one matching our request id
-        deadline = asyncio.get_event_loop().time() + timeout
-        while True:
-            remaining = deadline - asyncio.get_event_loop().time()
-            if remaining <= 0:
-                raise TimeoutError(f"RPC '{method}' timed out")
-            raw = await asyncio.wait_for(self._ws.recv(), timeout=remaining)
-            data = json.loads(raw)
-            if data.get("id") == rid:
-                if "error" in data and data["error"]:
-                    raise Exception(f"RPC error: {data['error']}")
-                return data.get("params", data.get("result", {}))
+        rid = next(self._ids)
+        message = codec.dumps({"id": rid, "method": method, "params": params or {}})
+        future = asyncio.get_running_loop().create_future()
+        self._pending[rid] = _Request(method, message, future)
+        error = None
+        try:
+            try:
+                await self._ws.send(message)
+            except Exception as e:
+                if method in _NOT_REPLAYABLE or not self.auto_reconnect:
+                    raise ConnectionError(f"Send failed: {e}")
+                # The reader sees the drop too; this request is resent on reconnect
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            error = "timeout"
+            raise TimeoutError(f"RPC '{method}' timed out")
+        except BaseException as e:
+            error = error_kind(e)
+            raise
+        finally:
+            self._pending.pop(rid, None)
+            self.metrics.finish(method, started, error)
 
     # ── High-level API ──────────────────────────────────────
 
@@ -77,11 +418,40 @@ class KaspaRpcClient:
         })
         return r.get("transactionId", "")
 
+    async def get_mempool_entry(self, transaction_id: str) -> Optional[Dict]:
+        """Mempool entry for a transaction, or None if the node doesn't have it."""
+        try:
+            r = await self._rpc_call("getMempoolEntry", {
+                "transactionId": transaction_id,
+                "includeOrphanPool": True,
+                "filterTransactionPool": False,
+            })
+        except Exception as e:
+            # kaspad answers "not found" with an RPC error; any other error
+            # (transport, injected, unsupported params) says nothing about the tx
+            if "not found" in str(e).lower():
+                return None
+            raise
+        return r.get("entry") or None
+
     async def get_balance_by_address(self, address: str) -> int:
         r = await self._rpc_call("getBalanceByAddress", {"address": address})
         return int(r.get("balance", 0))
 
     async def close(self):
-        if self._ws:
-            await self._ws.close()
-            self._ws = None
+        self._closing = True
+        ws, self._ws = self._ws, None
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._reader:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader = None
+        self._fail_pending(ConnectionError("Client closed"))
+        self._end_subscriptions()
+        if ws:
+            await ws.close()
@@ -0,0 +1,193 @@
+"""
+Content-addressed blob store for large task inputs.
+
+Task inputs like DATA_SEARCH datasets or SORTING arrays are too big to copy
+into every announcement (and every transaction payload). Coordinators put
+them here and announce only a reference; solvers resolve the reference when
+they actually start working on the task.
+
+- Blobs are keyed by the SHA-256 of their bytes, so identical datasets are
+  stored once no matter how many tasks use them.
+- Blobs live on local disk (BLOB_STORE_DIR) and in a byte-bounded LRU in
+  memory; reads from disk are re-hashed before they are trusted.
+- Disk reads and writes run in a worker thread, so announcing or solving a
+  task never blocks the event loop on file I/O; a put is in the LRU (and
+  visible to this process) before its file is written.
+- offload()/resolve() swap large values of an input_data dict for
+  {"$blob": digest} references and back.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from backend.kaspa import codec
+
+
+BLOB_REF = "$blob"
+
+
+def digest_of(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and isinstance(value.get(BLOB_REF), str)
+
+
+class BlobStore:
+    """SHA-256 → bytes, on disk with an in-memory LRU in front."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        cache_bytes: int = 64 * 1024 * 1024,
+        min_size: int = 1024,
+    ):
+        self.directory = directory
+        self.cache_bytes = cache_bytes
+        self.min_size = min_size        # values encoding smaller than this stay inline
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cached_bytes = 0
+
+        self.puts = 0
+        self.deduplicated = 0
+        self.hits = 0
+        self.disk_reads = 0
+        self.misses = 0
+        self.corrupt = 0
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def _remember(self, digest: str, data: bytes):
+        if digest in self._cache:
+            self._cache.move_to_end(digest)
+            return
+        if len(data) > self.cache_bytes:
+            return
+        self._cache[digest] = data
+        self._cached_bytes += len(data)
+        while self._cached_bytes > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+
+    # ── Bytes ───────────────────────────────────────────────
+
+    def _write(self, digest: str, data: bytes) -> bool:
+        """Write a blob file unless it exists (worker thread); False if it did."""
+        path = self._path(digest)
+        if os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so a concurrent reader never sees a partial blob
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return True
+
+    def _read(self, digest: str) -> Optional[bytes]:
+        """Read a blob file (worker thread)."""
+        try:
+            with open(self._path(digest), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    async def put(self, data: bytes) -> str:
+        """Store bytes and return their digest (a no-op if already stored)."""
+        digest = digest_of(data)
+        self.puts += 1
+        if digest in self._cache:
+            self.deduplicated += 1
+            self._remember(digest, data)
+            return digest
+        self._remember(digest, data)
+        if self.directory and not await asyncio.to_thread(self._write, digest, data):
+            self.deduplicated += 1
+        return digest
+
+    async def get(self, digest: str) -> Optional[bytes]:
+        """Bytes for a digest, or None if this store doesn't have them."""
+        data = self._cache.get(digest)
+        if data is not None:
+            self._cache.move_to_end(digest)
+            self.hits += 1
+            return data
+        if self.directory:
+            data = await asyncio.to_thread(self._read, digest)
+            if data is not None:
+                if digest_of(data) != digest:
+                    self.corrupt += 1
+                    return None
+                self.disk_reads += 1
+                self._remember(digest, data)
+                return data
+        self.misses += 1
+        return None
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._cache or bool(self.directory and os.path.exists(self._path(digest)))
+
+    # ── Task inputs ─────────────────────────────────────────
+
+    async def offload(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of input_data with every large value replaced by a blob reference."""
+        offloaded = {}
+        for key, value in input_data.items():
+            if isinstance(value, (list, dict)):
+                encoded = codec.dumps_bytes(value)
+                if len(encoded) >= self.min_size:
+                    value = {BLOB_REF: await self.put(encoded)}
+            offloaded[key] = value
+        return offloaded
+
+    async def resolve(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of input_data with blob references replaced by their values; KeyError if one is missing."""
+        resolved = {}
+        for key, value in input_data.items():
+            if is_blob_ref(value):
+                data = await self.get(value[BLOB_REF])
+                if data is None:
+                    raise KeyError(f"blob {value[BLOB_REF][:16]}... not available")
+                value = codec.loads(data)
+            resolved[key] = value
+        return resolved
+
+    def stats(self) -> Dict:
+        return {
+            "directory": self.directory,
+            "cached_blobs": len(self._cache),
+            "cached_bytes": self._cached_bytes,
+            "cache_limit_bytes": self.cache_bytes,
+            "min_size": self.min_size,
+            "puts": self.puts,
+            "deduplicated": self.deduplicated,
+            "hits": self.hits,
+            "disk_reads": self.disk_reads,
+            "misses": self.misses,
+            "corrupt": self.corrupt,
+        }
+
+
+_shared: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Return the process-wide blob store, creating it on first use."""
+    global _shared
+    if _shared is None:
+        directory = os.getenv("BLOB_STORE_DIR", os.path.join(tempfile.gettempdir(), "kaspaswarm-blobs"))
+        _shared = BlobStore(
+            directory=directory or None,   # empty: memory only
+            cache_bytes=int(os.getenv("BLOB_CACHE_MB", "64")) * 1024 * 1024,
+            min_size=int(os.getenv("BLOB_MIN_SIZE", "1024")),
+        )
+    return _shared
@@ -0,0 +1,94 @@
+"""
+Task-scoped message bus.
+
+Bids and solutions used to be handed to every coordinator, each of which
+woke up only to find the task wasn't theirs. Here every open task is a topic
+keyed by (coordinator address, task ID): the owning coordinator subscribes
+when it announces the task and drops the topic when the task completes or
+expires, so a bid reaches exactly the agent that can use it, and one for a
+closed task is discarded without waking anyone.
+
+Task IDs are only unique per coordinator, so the recipient address is part
+of the key. Messages whose recipient isn't known (e.g. legacy transactions)
+fall back to every open topic with that task ID.
+"""
+
+from typing import Dict, Hashable, Optional, Set, Tuple
+
+from backend.agents.base_agent import BaseAgent
+from backend.kaspa.transaction import SwarmMessage
+
+
+def task_topic(coordinator_address: str, task_id: int) -> Tuple[str, str, int]:
+    return ("task", coordinator_address, task_id)
+
+
+class MessageBus:
+    """Topic → subscribed agents, with an index of open task topics by task ID."""
+
+    def __init__(self):
+        self._subscribers: Dict[Hashable, Dict[BaseAgent, None]] = {}
+        self._task_topics: Dict[int, Set[Hashable]] = {}
+
+        self.published = 0
+        self.delivered = 0
+        self.unrouted = 0    # published with no subscriber (closed or unknown task)
+
+    def subscribe(self, topic: Hashable, agent: BaseAgent):
+        self._subscribers.setdefault(topic, {})[agent] = None
+        if topic[0] == "task":
+            self._task_topics.setdefault(topic[2], set()).add(topic)
+
+    def unsubscribe(self, topic: Hashable, agent: BaseAgent):
+        subscribers = self._subscribers.get(topic)
+        if subscribers is not None:
+            subscribers.pop(agent, None)
+            if not subscribers:
+                self.drop(topic)
+
+    def drop(self, topic: Hashable):
+        """Close a topic and forget its subscribers."""
+        self._subscribers.pop(topic, None)
+        if topic[0] == "task":
+            topics = self._task_topics.get(topic[2])
+            if topics is not None:
+                topics.discard(topic)
+                if not topics:
+                    del self._task_topics[topic[2]]
+
+    def subscribers(self, topic: Hashable) -> Tuple[BaseAgent, ...]:
+        return tuple(self._subscribers.get(topic, ()))
+
+    async def publish(self, topic: Hashable, message: SwarmMessage) -> int:
+        """Deliver to a topic's subscribers; returns how many received it."""
+        self.published += 1
+        subscribers = self.subscribers(topic)
+        if not subscribers:
+            self.unrouted += 1
+        for agent in subscribers:
+            await agent.receive_message(message)
+        self.delivered += len(subscribers)
+        return len(subscribers)
+
+    async def publish_task(self, message: SwarmMessage, coordinator_address: Optional[str] = None) -> int:
+        """Deliver a task-scoped message to the task's owner (every owner of that ID if unknown)."""
+        if coordinator_address is not None:
+            return await self.publish(task_topic(coordinator_address, message.task_id), message)
+        topics = tuple(self._task_topics.get(message.task_id, ()))
+        if not topics:
+            self.published += 1
+            self.unrouted += 1
+            return 0
+        delivered = 0
+        for topic in topics:
+            delivered += await self.publish(topic, message)
+        return delivered
+
+    def stats(self) -> Dict:
+        return {
+            "topics": len(self._subscribers),
+            "open_tasks": sum(len(t) for t in self._task_topics.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "unrouted": self.unrouted,
+        }
@@ -0,0 +1,217 @@
+"""
+On-chain message ingestion.
+
+Follows added blocks and turns the swarm transactions in them back into
+messages for the agents, so delivery is driven by what the chain accepted
+rather than by in-process routing:
+
+    blockAdded stream ──► filter ──► dedupe ──► decode ──► orchestrator.deliver_message
+                          (payload magic,  (tx ID LRU)  (binary payload,
+                           swarm outputs)                 per batch)
+
+- Notifications are drained in batches, so a burst of blocks is filtered and
+  decoded in one pass instead of one wakeup per block.
+- Only transactions with a swarm payload paying a watched address (an agent
+  or the broadcast address) are decoded; the payload prefix check is done on
+  the hex string before anything is parsed. The agent address paid is passed
+  on as the recipient, so bids, solutions and assignments reach only it.
+- A transaction can be reported in more than one block (DAG merges, replays
+  after a reconnect), so transaction IDs are deduplicated with a bounded LRU.
+- Messages from senders outside this process are recorded in the swarm
+  history too, which is what lets several processes share one swarm.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.bech32_util import decode_address
+from backend.kaspa.sighash import make_p2pk_script
+from backend.kaspa.simnet import transaction_id
+from backend.kaspa.transaction import PAYLOAD_MAGIC, SwarmMessage, TransactionEncoder
+
+
+_MAGIC_HEX = PAYLOAD_MAGIC.hex()
+
+
+@lru_cache(maxsize=65536)
+def _script_hex(address: str) -> str:
+    return make_p2pk_script(decode_address(address)["payload"]).script.hex()
+
+
+def _output_script(output: Dict) -> str:
+    spk = output.get("scriptPublicKey", "")
+    if isinstance(spk, dict):
+        return spk.get("scriptPublicKey", "")
+    # Node JSON may serialize it as a single hex string: 2-byte version + script
+    return spk[4:]
+
+
+class ChainIngestor:
+    """Streams swarm messages from added blocks into the orchestrator's agents."""
+
+    def __init__(
+        self,
+        orchestrator,
+        batch_size: int = 64,
+        dedupe_size: int = 100_000,
+        buffer_size: int = 1000,
+        address_prefix: str = "kaspatest",
+    ):
+        self.orchestrator = orchestrator
+        self.batch_size = max(1, batch_size)
+        self.dedupe_size = dedupe_size
+        self.buffer_size = buffer_size
+        self.address_prefix = address_prefix
+        self.running = False
+
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._scripts: Dict[str, Optional[str]] = {}   # output script → agent address (None: broadcast)
+        self._local: Set[str] = set()
+        self._watch_version = -1
+        self._subscription = None
+
+        self.blocks = 0
+        self.batches = 0
+        self.transactions = 0
+        self.matched = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.delivered = 0
+        self.foreign = 0
+        self.last_daa_score = 0
+        self.last_block_at = 0.0
+
+    # ── Lifecycle ───────────────────────────────────────────
+
+    async def run(self):
+        """Follow the chain until stopped, resubscribing if the stream ends."""
+        self.running = True
+        print("⛓️ Chain ingestion active")
+        while self.running:
+            try:
+                self._subscription = await self.orchestrator.wallet.subscribe_block_added(self.buffer_size)
+                async for notification in self._subscription:
+                    batch = [notification]
+                    while len(batch) < self.batch_size:
+                        more = self._subscription.get_nowait()
+                        if more is None:
+                            break
+                        batch.append(more)
+                    await self.ingest(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Chain ingestion error: {e}")
+            if self.running:
+                await asyncio.sleep(1.0)
+
+    async def stop(self):
+        self.running = False
+        if self._subscription is not None:
+            await self._subscription.close()
+            self._subscription = None
+
+    # ── Pipeline ────────────────────────────────────────────
+
+    def _refresh_watchlist(self):
+        """Rebuild the watched output scripts when the agent registry changes."""
+        agents = self.orchestrator.agents
+        if agents.version == self._watch_version:
+            return
+        addresses = agents.addresses()
+        self._local = set(addresses)
+        self._scripts = {_script_hex(TransactionEncoder.create_broadcast_address()): None}
+        for address in addresses:
+            try:
+                self._scripts[_script_hex(address)] = address
+            except (ValueError, KeyError, AssertionError):
+                pass  # simulated-mode address, never on chain
+        self._watch_version = agents.version
+
+    def _is_duplicate(self, tx_id: str) -> bool:
+        if tx_id in self._seen:
+            self._seen.move_to_end(tx_id)
+            return True
+        self._seen[tx_id] = None
+        if len(self._seen) > self.dedupe_size:
+            self._seen.popitem(last=False)
+        return False
+
+    def _select(self, notifications: List[Dict]) -> List[Tuple[str, str, Optional[str]]]:
+        """Swarm transactions in a batch of blocks, as (tx ID, payload hex, recipient)."""
+        self._refresh_watchlist()
+        scripts = self._scripts
+        selected = []
+        for notification in notifications:
+            block = notification.get("block") or {}
+            header = block.get("header") or {}
+            self.blocks += 1
+            self.last_daa_score = max(self.last_daa_score, int(header.get("daaScore", 0)))
+            for tx in block.get("transactions", ()):
+                self.transactions += 1
+                payload = tx.get("payload") or ""
+                if not payload.startswith(_MAGIC_HEX):
+                    continue
+                watched = False
+                recipient = None
+                for out in tx.get("outputs", ()):
+                    script = _output_script(out)
+                    if script in scripts:
+                        watched = True
+                        recipient = scripts[script]
+                        if recipient is not None:
+                            break
+                if not watched:
+                    continue
+                tx_id = (tx.get("verboseData") or {}).get("transactionId") or transaction_id(tx)
+                if self._is_duplicate(tx_id):
+                    self.duplicates += 1
+                    continue
+                self.matched += 1
+                selected.append((tx_id, payload, recipient))
+        return selected
+
+    def _decode(self, selected: List[Tuple[str, str, Optional[str]]]) -> List[Tuple[SwarmMessage, Optional[str]]]:
+        messages = []
+        decode = TransactionEncoder.decode_payload
+        for tx_id, payload, recipient in selected:
+            message = decode(bytes.fromhex(payload), self.address_prefix)
+            if message is None:
+                self.invalid += 1
+                continue
+            message.tx_id = tx_id
+            messages.append((message, recipient))
+        return messages
+
+    async def ingest(self, notifications: List[Dict]) -> List[SwarmMessage]:
+        """Filter, dedupe, decode and deliver one batch of block notifications."""
+        self.batches += 1
+        self.last_block_at = time.time()
+        messages = self._decode(self._select(notifications))
+        for message, recipient in messages:
+            if message.sender not in self._local:
+                self.foreign += 1
+                self.orchestrator.record_message(message, message.sender, message.sender)
+            await self.orchestrator.deliver_message(message, recipient)
+            self.delivered += 1
+        return [message for message, _ in messages]
+
+    def stats(self) -> Dict:
+        return {
+            "running": self.running,
+            "blocks": self.blocks,
+            "batches": self.batches,
+            "transactions": self.transactions,
+            "matched": self.matched,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "delivered": self.delivered,
+            "foreign": self.foreign,
+            "dropped_notifications": self._subscription.dropped if self._subscription else 0,
+            "watched_addresses": len(self._scripts),
+            "last_daa_score": self.last_daa_score,
+            "last_block_at": self.last_block_at,
+        }
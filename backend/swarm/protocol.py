@@ -9,7 +9,7 @@ This is the central controller that:
 """
 
 import asyncio
-from typing import List, Dict
+from typing import Dict, Optional
 from collections import deque
 import time
 
@@ -18,6 +18,14 @@ from backend.agents.coordinator_agent import CoordinatorAgent
 from backend.agents.solver_agent import SolverAgent
 from backend.kaspa.wallet import KaspaWallet
 from backend.kaspa.transaction import SwarmMessage, MessageType
+from backend.swarm.bus import MessageBus, task_topic
+from backend.swarm.ingestion import ChainIngestor
+from backend.swarm.registry import AgentRegistry
+from backend.swarm.remote import RemoteSolverServer
+from backend.swarm.scheduler import AgentScheduler
+from backend.swarm.stats import SwarmStats
+from backend.swarm.task_history import TaskHistory
+from backend.swarm.timer_wheel import TimerWheel
 
 
 class SwarmOrchestrator:
@@ -32,53 +40,64 @@ class SwarmOrchestrator:
         wallet: KaspaWallet,
         num_coordinators: int = 2,
         num_solvers: int = 8,
-        mock_mode: bool = True
+        mock_mode: bool = True,
+        balance_refresh_interval: float = 10.0,
+        balance_refresh_chunk: int = 500,
+        chain_ingestion: bool = False,
+        task_history_size: int = 1000,
+        task_archive_path: Optional[str] = None,
+        shard: int = 0,
+        shard_count: int = 1,
+        remote_workers_port: int = 0,
+        remote_workers_host: str = "0.0.0.0",
+        remote_workers_token: Optional[str] = None,
+        use_scheduler: bool = False,
+        scheduler_workers: int = 32,
     ):
         self.wallet = wallet
-        self.agents: List[BaseAgent] = []
+        self.agents = AgentRegistry()  # indexed by ID, role and address
+        self.bus = MessageBus()  # task-scoped topics for bids and solutions
+        self.timers = TimerWheel()  # bidding windows and deadlines of every task
+        self.stats = SwarmStats(self.agents)  # totals updated as agents change
         self.num_coordinators = num_coordinators
         self.num_solvers = num_solvers
         self.mock_mode = mock_mode
         self.running = False
         self.transaction_history = deque(maxlen=30)  # Last 30 transactions
-        self.task_history: List[Dict] = []  # All tasks with lifecycle
+        # Recent tasks with lifecycle, older ones evicted to the archive file
+        self.task_history = TaskHistory(hot_size=task_history_size, archive_path=task_archive_path)
         
         # Message routing for mock mode
         self.message_relay_enabled = mock_mode
         
-    def log_task_event(self, task_id: int, event: str, data: Dict):
-        """Log task lifecycle events for history panel."""
-        # Find existing task or create new entry
-        task_entry = next((t for t in self.task_history if t["task_id"] == task_id), None)
-        
-        if not task_entry:
-            task_entry = {
-               "task_id": task_id,
-                "status": event,
-                "events": [],
-                "created_at": time.time(),
-            }
-            self.task_history.append(task_entry)
+        # Batched on-chain balance refresh for every agent address (0 disables)
+        self.balance_refresh_interval = balance_refresh_interval
+        self.balance_refresh_chunk = balance_refresh_chunk
         
-        # Update task entry
-        task_entry["status"] = event
-        task_entry["events"].append({
-            "type": event,
-            "timestamp": time.time(),
-            "data": data
-        })
+        # Deliver messages from accepted transactions instead of in-process routing
+        self.chain_ingestion = chain_ingestion
+        self.ingestor: Optional[ChainIngestor] = None
         
-        # Store relevant metadata
-        if event == "created":
-            task_entry["description"] = data.get("description", "")
-            task_entry["reward"] = data.get("reward", 0)
-            task_entry["coordinator"] = data.get("coordinator", "")
-        elif event == "assigned":
-            task_entry["assigned_to"] = data.get("solver", "")
-            task_entry["bid_amount"] = data.get("bid_amount", 0)
-        elif event == "completed":
-            task_entry["solution"] = data.get("solution", 0)
-            task_entry["completed_at"] = time.time()
+        # Sharded mode: this process runs agents shard, shard + shard_count, ...
+        # and exchanges messages for the other shards' agents over shard_link
+        self.shard = shard
+        self.shard_count = max(1, shard_count)
+        self.shard_link = None
+        
+        # Accept solver agents running on worker nodes (0 disables)
+        self.remote_workers_port = remote_workers_port
+        self.remote_workers_host = remote_workers_host
+        self.remote_workers_token = remote_workers_token
+        self.remote: Optional[RemoteSolverServer] = None
+        
+        # Run agents as callbacks on a shared worker pool instead of two loops each
+        self.use_scheduler = use_scheduler
+        self.scheduler_workers = scheduler_workers
+        self.scheduler: Optional[AgentScheduler] = None
+        
+    def log_task_event(self, task_id: int, event: str, data: Dict):
+        """Log task lifecycle events for history panel."""
+        self.task_history.record(task_id, event, data)
         
     async def initialize_swarm(self):
         """Create and initialize all agents."""
@@ -86,30 +105,38 @@ class SwarmOrchestrator:
         print(f"   Mode: {'MOCK (Development)' if self.mock_mode else 'LIVE (Testnet)'}")
         print(f"   Coordinators: {self.num_coordinators}")
         print(f"   Solvers: {self.num_solvers}")
+        if self.shard_count > 1:
+            print(f"   Shard: {self.shard + 1}/{self.shard_count}")
         print("=" * 60)
         
         # Create coordinator agents
-        for i in range(self.num_coordinators):
+        for i in range(self.shard, self.num_coordinators, self.shard_count):
             agent = CoordinatorAgent(
-                wallet=self.wallet,
+                wallet=self.wallet.for_agent(f"coordinator_{i}"),
                 agent_id=f"coordinator_{i}"
             )
             await agent.initialize()
             agent.orchestrator = self
-            self.agents.append(agent)
+            self.agents.add(agent)
+            self.stats.track(agent)
         
         # Create solver agents with varying skill levels
-        for i in range(self.num_solvers):
+        for i in range(self.shard, self.num_solvers, self.shard_count):
             # Distribute skill levels from 0.5 to 1.5
             skill = 0.5 + (i / max(self.num_solvers - 1, 1)) * 1.0
             agent = SolverAgent(
-                wallet=self.wallet,
+                wallet=self.wallet.for_agent(f"solver_{i}"),
                 agent_id=f"solver_{i}",
                 skill_level=skill
             )
             await agent.initialize()
             agent.orchestrator = self
-            self.agents.append(agent)
+            self.agents.add(agent)
+            self.stats.track(agent)
+        
+        # Counts from here on are for this process's agents
+        self.num_coordinators = self.agents.count("coordinator")
+        self.num_solvers = self.agents.count("solver")
         
         print("=" * 60)
         print(f"✅ Swarm initialized: {len(self.agents)} agents ready")
@@ -119,16 +146,56 @@ class SwarmOrchestrator:
         """Start all agents and message relay."""
         self.running = True
         
-        # Start all agent decision loops
-        agent_tasks = [asyncio.create_task(agent.start()) for agent in self.agents]
+        if self.use_scheduler:
+            # Agents only run when a message or timer wakes them
+            self.scheduler = AgentScheduler(workers=self.scheduler_workers)
+            for agent in self.agents:
+                self.scheduler.add(agent)
+            agent_tasks = [asyncio.create_task(self.scheduler.run())]
+        else:
+            # Start all agent decision loops
+            agent_tasks = [asyncio.create_task(agent.start()) for agent in self.agents]
         
         # Start message relay if in mock mode
         if self.message_relay_enabled:
             relay_task = asyncio.create_task(self.message_relay_loop())
             agent_tasks.append(relay_task)
         
+        # Real balances only exist on a node or the simulated ledger
+        if self.balance_refresh_interval > 0 and not self.wallet.simulated:
+            agent_tasks.append(asyncio.create_task(self.balance_refresh_loop()))
+        
+        # Only a node or the simulated ledger has blocks to follow
+        if self.chain_ingestion and not self.wallet.simulated:
+            self.ingestor = ChainIngestor(self)
+            agent_tasks.append(asyncio.create_task(self.ingestor.run()))
+        
+        if self.remote_workers_port:
+            self.remote = RemoteSolverServer(
+                self, self.remote_workers_host, self.remote_workers_port, token=self.remote_workers_token
+            )
+            await self.remote.start()
+        
         await asyncio.gather(*agent_tasks)
     
+    async def balance_refresh_loop(self):
+        """Refresh every agent's balance with one batched UTXO query per cycle."""
+        while self.running:
+            addressed = self.agents.addressed()
+            if addressed:
+                try:
+                    balances = await self.wallet.refresh_balances(
+                        [a.state.address.address for a in addressed],
+                        chunk_size=self.balance_refresh_chunk,
+                    )
+                except Exception as e:
+                    print(f"⚠️ Balance refresh failed: {e}")
+                else:
+                    for agent in addressed:
+                        if agent.state.address.address in balances:
+                            agent.state.address.balance = balances[agent.state.address.address]
+            await asyncio.sleep(self.balance_refresh_interval)
+    
     async def message_relay_loop(self):
         """
         In mock mode, simulate blockchain message passing.
@@ -144,8 +211,21 @@ class SwarmOrchestrator:
             # For simplicity, we'll use a broadcast approach where certain
             # message types are delivered to all relevant agents
     
-    async def broadcast_message(self, message: SwarmMessage, sender: BaseAgent):
-        """Broadcast a message to all relevant agents."""
+    async def broadcast_message(self, message: SwarmMessage, sender: BaseAgent, recipient: Optional[str] = None):
+        """Broadcast a message to all relevant agents (recipient: the address it was sent to)."""
+        self.record_message(
+            message,
+            sender.state.agent_id,
+            sender.state.address.address if sender.state.address else "",
+        )
+        # With chain ingestion, agents hear about it once the transaction is accepted
+        if self.ingestor is None:
+            await self.deliver_message(message, recipient)
+            if self.shard_link is not None:
+                await self.shard_link.forward(message, recipient)
+    
+    def record_message(self, message: SwarmMessage, sender_id: str, sender_address: str):
+        """Log a message for the task history and edge visualization."""
         # Record transaction for edge visualization
         task_type = None
         if message.msg_type == MessageType.TASK_ANNOUNCEMENT:
@@ -157,7 +237,7 @@ class SwarmOrchestrator:
                 "description": message.data.get("description", ""),
                 "reward": message.data.get("reward", 0),
                 "task_type": message.data.get("task_type", ""),
-                "coordinator": sender.state.agent_id
+                "coordinator": sender_id
             })
             
         elif message.msg_type == MessageType.TASK_BID:
@@ -165,58 +245,71 @@ class SwarmOrchestrator:
             # but we could update the task status if we wanted to show "bidding in progress"
             pass
             
-        elif message.msg_type == MessageType.SOLUTION_SUBMISSION:
+        elif message.msg_type == MessageType.SOLUTION_SUBMISSION and message.task_id in self.task_history:
+            # (a solver in another shard than its task's coordinator has no entry for it)
             self.log_task_event(message.task_id, "completed", {
                 "solution": message.data.get("solution", ""),
-                "solver": sender.state.agent_id
+                "solver": sender_id
             })
 
         self.transaction_history.append({
             "timestamp": time.time(),
-            "from": sender.state.agent_id,
-            "from_address": sender.state.address.address if sender.state.address else "",
+            "from": sender_id,
+            "from_address": sender_address,
             "msg_type": message.msg_type.value,
             "task_id": message.task_id,
             "task_type": task_type
         })
+    
+    async def deliver_message(self, message: SwarmMessage, recipient: Optional[str] = None):
+        """
+        Route a message to the agents that should act on it.
         
+        recipient is the address the transaction paid, when known; bids and
+        solutions without one go to every open task with that ID.
+        """
         if message.msg_type == MessageType.TASK_ANNOUNCEMENT:
             # Deliver to all solver agents
-            for agent in self.agents:
-                if agent.state.role == "solver" and agent != sender:
+            sender = self.agents.by_address(message.sender)
+            for agent in self.agents.role("solver"):
+                if agent is not sender:
                     await agent.receive_message(message)
         
-        elif message.msg_type == MessageType.TASK_BID:
-            # Deliver to the coordinator who posted the task
-            for agent in self.agents:
-                if (agent.state.role == "coordinator" and 
-                    agent.state.address and 
-                    message.sender != agent.state.address.address):
-                    await agent.receive_message(message)
+        elif message.msg_type in (MessageType.TASK_BID, MessageType.SOLUTION_SUBMISSION):
+            # Only the coordinator that owns the (still open) task
+            await self.bus.publish_task(message, recipient)
         
-        elif message.msg_type == MessageType.SOLUTION_SUBMISSION:
-            # Deliver to coordinator
-            for agent in self.agents:
-                if agent.state.role == "coordinator":
-                    await agent.receive_message(message)
+        elif message.msg_type == MessageType.TASK_ASSIGNMENT:
+            # Only the winning solver
+            agent = self.agents.by_address(recipient) if recipient else None
+            if agent is not None and agent.state.role == "solver":
+                await agent.receive_message(message)
     
     async def stop_swarm(self):
         """Stop all agents."""
         self.running = False
+        if self.ingestor:
+            await self.ingestor.stop()
+        if self.remote:
+            await self.remote.close()
         for agent in self.agents:
             await agent.stop()
+        if self.scheduler:
+            self.scheduler.stop()
+        self.task_history.flush()
     
     def get_swarm_stats(self) -> Dict:
         """Get current swarm statistics for visualization."""
-        coordinator_stats = [a.get_stats() for a in self.agents if a.state.role == "coordinator"]
-        solver_stats = [a.get_stats() for a in self.agents if a.state.role == "solver"]
+        # Everything here is maintained at event time; this only assembles it
+        coordinator_stats = self.stats.records("coordinator")
+        solver_stats = self.stats.records("solver")
         
-        total_active_tasks = sum(len(a.state.active_tasks) for a in self.agents)
-        total_completed = sum(a.state.completed_tasks for a in self.agents)
+        total_active_tasks = self.stats.active_tasks
+        total_completed = self.stats.completed_tasks
         
         # Calculate global success rate based on task history
-        completed_count = sum(1 for t in self.task_history if t.get("status") == "completed")
-        failed_count = sum(1 for t in self.task_history if t.get("status") == "failed")
+        completed_count = self.task_history.count("completed")
+        failed_count = self.task_history.count("failed")
         total_finished = completed_count + failed_count
         
         success_rate = (completed_count / total_finished * 100) if total_finished > 0 else 0.0
@@ -231,7 +324,7 @@ class SwarmOrchestrator:
             "success_rate": success_rate,
             "mode": "mock" if self.mock_mode else "live",
             "transactions": list(self.transaction_history),  # Last 30 transactions
-            "task_history": self.task_history[-50:],  # Last 50 tasks
+            "task_history": self.task_history.recent(50),  # Last 50 tasks
             "agents": {
                 "coordinators": coordinator_stats,
                 "solvers": solver_stats
@@ -249,12 +342,14 @@ class SwarmOrchestrator:
         """Resume swarm operations."""
         for agent in self.agents:
             agent.running = True
+        if self.scheduler:
+            self.scheduler.wake_all()
         print("▶️  Swarm resumed")
     
     async def manual_task_creation(self, target: int, reward: int, task_type_str: str = "prime_finding"):
         """Manually create a task (for testing)."""
         # Find first coordinator
-        coordinator = next((a for a in self.agents if a.state.role == "coordinator"), None)
+        coordinator = self.agents.first("coordinator")
         if coordinator:
             from backend.swarm.task_types import Task, TaskType
             import random
@@ -307,26 +402,25 @@ class SwarmOrchestrator:
             })
             
             await coordinator.broadcast_task(task)
-            asyncio.create_task(coordinator.handle_task_lifecycle(task))
+            coordinator.start_lifecycle(task)
             print(f"✅ Manually created task {task.task_id}")
             return {"status": "success", "task_id": task.task_id}
 
     async def add_agent(self, role: str, skill_level: float = 1.0):
         """Dynamically add a new agent to the swarm."""
-        from backend.agents.coordinator_agent import CoordinatorAgent
-        from backend.agents.solver_agent import SolverAgent
-        from backend.kaspa.wallet import KaspaWallet
-        
         agent_id = f"{role}_{int(time.time()*1000)}"
-        wallet = KaspaWallet() # In real app, would need new keypair
+        # Scoped view of the shared wallet: same connections and mode, own keypair
+        wallet = self.wallet.for_agent(agent_id)
         
         if role == "coordinator":
             agent = CoordinatorAgent(wallet, agent_id)
         else:
             agent = SolverAgent(wallet, agent_id, skill_level)
-            
+        
+        await agent.initialize()
         agent.orchestrator = self
-        self.agents.append(agent)
+        self.agents.add(agent)
+        self.stats.track(agent)
         
         if role == "coordinator":
             self.num_coordinators += 1
@@ -334,22 +428,29 @@ class SwarmOrchestrator:
             self.num_solvers += 1
             
         # Start agent loop
-        asyncio.create_task(agent.start())
+        if self.scheduler:
+            self.scheduler.add(agent)
+        else:
+            asyncio.create_task(agent.start())
         print(f"➕ Added new agent: {agent_id} (Role: {role}, Skill: {skill_level})")
         return agent_id
 
     async def remove_agent(self, agent_id: str):
         """Dynamically remove an agent from the swarm."""
-        agent = next((a for a in self.agents if a.state.agent_id == agent_id), None)
+        agent = self.agents.remove(agent_id)
         if not agent:
             print(f"❌ Cannot remove agent {agent_id}: Not found")
             return False
+        self.stats.untrack(agent)
             
         # Stop agent
         await agent.stop()
-        self.agents.remove(agent)
+        if self.scheduler:
+            self.scheduler.remove(agent)
         
         if agent.state.role == "coordinator":
+            for task_id in agent.active_tasks:
+                self.bus.drop(task_topic(agent.state.address.address, task_id))
             self.num_coordinators -= 1
         else:
             self.num_solvers -= 1
@@ -380,5 +481,10 @@ class SwarmOrchestrator:
             agent.state.successful_bids = 0
             if hasattr(agent, 'active_tasks'):
                 agent.active_tasks.clear()
+            if hasattr(agent, 'task_timers'):
+                agent.task_timers.clear()
+            agent.refresh_stats()
+        self.bus = MessageBus()
+        self.timers.clear()
         
         print("✅ Swarm reset complete")
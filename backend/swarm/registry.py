@@ -0,0 +1,80 @@
+"""
+Indexed agent registry.
+
+The orchestrator used to keep its agents in a list and scan it for every
+routed message, lookup and removal. The registry keeps the same agents
+indexed by agent ID, role and address, updated on add and remove, so
+routing a message costs as much as its recipients rather than the whole
+swarm.
+
+Iterating the registry yields agents in the order they were added, so it
+can stand in wherever the plain list was iterated.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from backend.agents.base_agent import BaseAgent
+
+
+class AgentRegistry:
+    """Agents indexed by ID, role and address."""
+
+    def __init__(self):
+        self._by_id: Dict[str, BaseAgent] = {}
+        self._by_role: Dict[str, Dict[str, BaseAgent]] = {}
+        self._by_address: Dict[str, BaseAgent] = {}
+        # Bumped on every change, so caches built from the registry know when to rebuild
+        self.version = 0
+
+    def add(self, agent: BaseAgent):
+        """Register an initialized agent (its address must already be set)."""
+        agent_id = agent.state.agent_id
+        if agent_id in self._by_id:
+            raise ValueError(f"Agent {agent_id} is already registered")
+        self._by_id[agent_id] = agent
+        self._by_role.setdefault(agent.state.role, {})[agent_id] = agent
+        if agent.state.address:
+            self._by_address[agent.state.address.address] = agent
+        self.version += 1
+
+    def remove(self, agent_id: str) -> Optional[BaseAgent]:
+        """Unregister an agent; returns it, or None if it wasn't registered."""
+        agent = self._by_id.pop(agent_id, None)
+        if agent is None:
+            return None
+        self._by_role.get(agent.state.role, {}).pop(agent_id, None)
+        if agent.state.address and self._by_address.get(agent.state.address.address) is agent:
+            del self._by_address[agent.state.address.address]
+        self.version += 1
+        return agent
+
+    def get(self, agent_id: str) -> Optional[BaseAgent]:
+        return self._by_id.get(agent_id)
+
+    def by_address(self, address: str) -> Optional[BaseAgent]:
+        return self._by_address.get(address)
+
+    def role(self, role: str) -> Tuple[BaseAgent, ...]:
+        """Agents with a role (a snapshot, safe to await while iterating)."""
+        return tuple(self._by_role.get(role, {}).values())
+
+    def first(self, role: str) -> Optional[BaseAgent]:
+        return next(iter(self._by_role.get(role, {}).values()), None)
+
+    def count(self, role: str) -> int:
+        return len(self._by_role.get(role, ()))
+
+    def addresses(self) -> List[str]:
+        return list(self._by_address)
+
+    def addressed(self) -> List[BaseAgent]:
+        return list(self._by_address.values())
+
+    def __iter__(self) -> Iterator[BaseAgent]:
+        return iter(tuple(self._by_id.values()))
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._by_id
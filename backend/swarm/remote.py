@@ -0,0 +1,559 @@
+"""
+Remote solver workers.
+
+Lets solver agents run on other machines: a worker node runs its own
+SolverAgents and connects them to the orchestrator over TCP, so capacity is
+added by starting more workers rather than by growing the orchestrator.
+
+    orchestrator process                            worker node
+    RemoteSolverServer ◄──── TCP (frames) ────► RemoteWorker
+    RemoteSolver proxies                            SolverAgents
+    (one per remote solver,
+     in the agent registry)
+
+- The worker registers its solvers in HELLO. Each gets a RemoteSolver proxy
+  in the orchestrator's registry, so announcements and assignments are
+  routed to it like to any local solver. A proxy forwards them over the
+  connection; an announcement goes once per worker, which fans it out to
+  its own solvers.
+- Bids and solutions come back as MESSAGE frames and enter the swarm
+  exactly as if a local agent had sent them (sender checked against the
+  connection's solvers).
+- Flow control is credit-based: the worker grants credits for messages its
+  solvers have taken off their queues, and the server sends only while it
+  holds credits, queueing (bounded, oldest dropped) otherwise. A slow
+  worker therefore backs up in its own queue rather than in the server.
+- Both sides send heartbeats; a connection silent for three intervals is
+  closed. The worker reconnects with backoff, re-registering the same
+  solvers, which keep running meanwhile.
+- Workers fetch blob-store task inputs they don't have from the server.
+
+Frames use the sharding layout (u32 length, u8 kind, body), and messages
+travel as binary transaction payloads.
+
+Run a worker:
+    python -m backend.swarm.remote --host 127.0.0.1 --port 8765 --solvers 4
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from backend.agents.base_agent import BaseAgent
+from backend.agents.solver_agent import SolverAgent
+from backend.kaspa import codec
+from backend.kaspa.transaction import MessageType, SwarmMessage
+from backend.kaspa.wallet import KaspaAddress, KaspaWallet
+from backend.swarm.blob_store import BLOB_REF, digest_of, get_blob_store, is_blob_ref
+from backend.swarm.sharding import encode_frame, pack_message, read_frame, unpack_message
+
+
+HELLO = 1       # worker → server: {"worker", "token", "credits", "agents": [...]}
+MESSAGE = 2     # both ways: a SwarmMessage to route
+STATS = 3       # worker → server: {agent_id: stats record}
+WELCOME = 4     # server → worker: {"heartbeat"} (or {"error"} and close)
+HEARTBEAT = 5   # both ways, empty
+CREDIT = 6      # worker → server: {"credits": n}
+BLOB_GET = 7    # worker → server: digest
+BLOB = 8        # server → worker: digest + bytes (no bytes: not found)
+
+_DIGEST_LEN = 64
+
+
+# ── Orchestrator side ───────────────────────────────────────
+
+class RemoteSolver(BaseAgent):
+    """Stands in for a solver on a worker node; messages for it go over the connection."""
+
+    def __init__(self, connection: "WorkerConnection", info: Dict):
+        super().__init__(connection.server.orchestrator.wallet, info["agent_id"], role="solver")
+        self.connection = connection
+        self.state.address = KaspaAddress(address=info["address"], private_key="", public_key="")
+        self.remote_stats: Dict = {}
+
+    async def receive_message(self, message: SwarmMessage):
+        await self.connection.deliver(message, self.state.address.address)
+
+    async def decision_loop(self):
+        pass    # decisions are made on the worker
+
+    async def process_message(self, message: SwarmMessage):
+        pass
+
+    def update_remote_stats(self, record: Dict):
+        self.remote_stats = record
+        self.refresh_stats()
+
+    def _build_stats(self) -> Dict:
+        stats = super()._build_stats()
+        stats.update(self.remote_stats)
+        stats["worker"] = self.connection.worker_id
+        return stats
+
+
+class WorkerConnection:
+    """Server end of one worker node's connection."""
+
+    def __init__(self, server: "RemoteSolverServer", worker_id: str, reader, writer, credits: int):
+        self.server = server
+        self.worker_id = worker_id
+        self.reader = reader
+        self.writer = writer
+        self.credits = credits
+        self.pending: deque = deque()
+        self.proxies: Dict[str, RemoteSolver] = {}    # address → proxy
+        self.connected_at = time.time()
+        self._last_announcement = None
+
+        self.sent = 0
+        self.received = 0
+        self.queued = 0
+        self.dropped = 0
+
+    async def _send(self, kind: int, body: bytes = b""):
+        self.writer.write(encode_frame(kind, body))
+        await self.writer.drain()
+
+    async def deliver(self, message: SwarmMessage, recipient: str):
+        """Send a message for one of this worker's solvers, within the worker's credits."""
+        if message.msg_type == MessageType.TASK_ANNOUNCEMENT:
+            # Delivered to every proxy in turn; the worker fans it out itself
+            if message is self._last_announcement:
+                return
+            self._last_announcement = message
+            recipient = None
+        body = pack_message(message, recipient)
+        if self.credits > 0 and not self.pending:
+            self.credits -= 1
+            self.sent += 1
+            await self._send(MESSAGE, body)
+            return
+        if len(self.pending) >= self.server.queue_size:
+            self.pending.popleft()
+            self.dropped += 1
+        self.pending.append(body)
+        self.queued += 1
+
+    async def _grant(self, credits: int):
+        self.credits += credits
+        while self.credits > 0 and self.pending:
+            self.credits -= 1
+            self.sent += 1
+            await self._send(MESSAGE, self.pending.popleft())
+
+    async def _handle_message(self, body: bytes):
+        message, recipient = unpack_message(body)
+        if message is None:
+            return
+        sender = self.proxies.get(message.sender)
+        if sender is None:
+            return    # only this worker's own solvers may speak through it
+        self.received += 1
+        await self.server.orchestrator.broadcast_message(message, sender, recipient)
+
+    async def _send_blob(self, digest: str):
+        data = await self.server.blobs.get(digest)
+        await self._send(BLOB, digest.encode() + (data or b""))
+
+    async def run(self):
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        timeout = self.server.heartbeat_interval * 3
+        try:
+            while True:
+                kind, body = await asyncio.wait_for(read_frame(self.reader), timeout)
+                if kind == MESSAGE:
+                    await self._handle_message(body)
+                elif kind == CREDIT:
+                    await self._grant(codec.loads(body)["credits"])
+                elif kind == STATS:
+                    for agent_id, record in codec.loads(body).items():
+                        proxy = self.server.orchestrator.agents.get(agent_id)
+                        if isinstance(proxy, RemoteSolver) and proxy.connection is self:
+                            proxy.update_remote_stats(record)
+                elif kind == BLOB_GET:
+                    await self._send_blob(body.decode())
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.server.heartbeat_interval)
+            await self._send(HEARTBEAT)
+
+    def stats(self) -> Dict:
+        return {
+            "solvers": len(self.proxies),
+            "connected_at": self.connected_at,
+            "credits": self.credits,
+            "pending": len(self.pending),
+            "sent": self.sent,
+            "received": self.received,
+            "queued": self.queued,
+            "dropped": self.dropped,
+        }
+
+
+class RemoteSolverServer:
+    """Accepts worker nodes and registers their solvers with the orchestrator."""
+
+    def __init__(
+        self,
+        orchestrator,
+        host: str = "0.0.0.0",
+        port: int = 8765,
+        token: Optional[str] = None,
+        heartbeat_interval: float = 5.0,
+        queue_size: int = 1000,
+    ):
+        self.orchestrator = orchestrator
+        self.host = host
+        self.port = port
+        self.token = token or None
+        self.heartbeat_interval = heartbeat_interval
+        self.queue_size = queue_size
+        self.connections: Dict[str, WorkerConnection] = {}
+        self._server = None
+        self._handlers: Set[asyncio.Task] = set()    # one _serve task per connection
+        self.blobs = get_blob_store()
+
+        self.rejected = 0
+        self.disconnects = 0
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        print(f"🛰️ Remote solver workers accepted on {self.host}:{self.port}")
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        handlers = list(self._handlers)
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = None
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            kind, body = await asyncio.wait_for(read_frame(reader), self.heartbeat_interval * 3)
+            hello = codec.loads(body) if kind == HELLO else {}
+            if kind != HELLO or (self.token and hello.get("token") != self.token):
+                self.rejected += 1
+                writer.write(encode_frame(WELCOME, codec.dumps_bytes({"error": "rejected"})))
+                await writer.drain()
+                return
+
+            worker_id = hello["worker"]
+            previous = self.connections.get(worker_id)
+            if previous is not None:
+                # Reconnected before we noticed the old connection die
+                previous.writer.close()
+                self._unregister(previous)
+
+            connection = WorkerConnection(self, worker_id, reader, writer, int(hello.get("credits", 64)))
+            self.connections[worker_id] = connection
+            self._register(connection, hello.get("agents", []))
+            await connection._send(WELCOME, codec.dumps_bytes({"heartbeat": self.heartbeat_interval}))
+            print(f"🛰️ Worker {worker_id} connected with {len(connection.proxies)} solvers")
+            await connection.run()
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # close(): end quietly, the stream server logs handlers that finish cancelled
+            pass
+        finally:
+            self._handlers.discard(handler)
+            if connection is not None and self.connections.get(connection.worker_id) is connection:
+                del self.connections[connection.worker_id]
+                self._unregister(connection)
+                self.disconnects += 1
+                print(f"🛰️ Worker {connection.worker_id} disconnected")
+            writer.close()
+
+    def _register(self, connection: WorkerConnection, agents: List[Dict]):
+        orchestrator = self.orchestrator
+        for info in agents:
+            if info["agent_id"] in orchestrator.agents:
+                continue
+            proxy = RemoteSolver(connection, info)
+            orchestrator.agents.add(proxy)
+            orchestrator.stats.track(proxy)
+            orchestrator.num_solvers += 1
+            connection.proxies[proxy.state.address.address] = proxy
+
+    def _unregister(self, connection: WorkerConnection):
+        orchestrator = self.orchestrator
+        for proxy in connection.proxies.values():
+            if orchestrator.agents.get(proxy.state.agent_id) is proxy:
+                orchestrator.stats.untrack(proxy)
+                orchestrator.agents.remove(proxy.state.agent_id)
+                orchestrator.num_solvers -= 1
+        connection.proxies.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "listening": f"{self.host}:{self.port}",
+            "workers": {worker_id: c.stats() for worker_id, c in self.connections.items()},
+            "remote_solvers": sum(len(c.proxies) for c in self.connections.values()),
+            "rejected": self.rejected,
+            "disconnects": self.disconnects,
+        }
+
+
+# ── Worker side ─────────────────────────────────────────────
+
+class RemoteWorker:
+    """A worker node: runs solver agents and connects them to a remote orchestrator."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        num_solvers: int = 4,
+        worker_id: Optional[str] = None,
+        token: Optional[str] = None,
+        credits: int = 64,
+        mock_mode: bool = True,
+        rpc_url: str = "https://api.kaspa.org",
+    ):
+        self.host = host
+        self.port = port
+        self.num_solvers = num_solvers
+        self.worker_id = worker_id or f"worker_{os.getpid()}"
+        self.token = token
+        self.window = max(1, credits)
+        self.wallet = KaspaWallet(rpc_url=rpc_url, mock_mode=mock_mode, address_namespace=f"{self.worker_id}/")
+        self.solvers: Dict[str, SolverAgent] = {}     # address → solver
+        self.blobs = get_blob_store()
+        self.running = False
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._consumed = 0
+        self._blob_requests: Dict[str, asyncio.Future] = {}
+
+        self.connects = 0
+        self.forwarded = 0
+        self.dropped = 0
+
+    async def initialize(self):
+        for i in range(self.num_solvers):
+            skill = 0.5 + (i / max(self.num_solvers - 1, 1)) * 1.0
+            agent = SolverAgent(
+                wallet=self.wallet.for_agent(f"{self.worker_id}_solver_{i}"),
+                agent_id=f"{self.worker_id}_solver_{i}",
+                skill_level=skill,
+            )
+            await agent.initialize()
+            agent.orchestrator = self
+            self.solvers[agent.state.address.address] = agent
+        print(f"🛰️ Worker {self.worker_id}: {len(self.solvers)} solvers ready")
+
+    # What the solvers see as their orchestrator
+
+    async def broadcast_message(self, message: SwarmMessage, sender: BaseAgent, recipient: Optional[str] = None):
+        if self._writer is None:
+            self.dropped += 1   # not connected; the swarm never hears it
+            return
+        self.forwarded += 1
+        await self._send(MESSAGE, pack_message(message, recipient))
+
+    def log_task_event(self, task_id: int, event: str, data: Dict):
+        pass
+
+    # Connection
+
+    async def _send(self, kind: int, body: bytes = b""):
+        self._writer.write(encode_frame(kind, body))
+        await self._writer.drain()
+
+    async def run(self):
+        """Run the solvers and keep them connected until stopped."""
+        self.running = True
+        agents = [asyncio.create_task(agent.start()) for agent in self.solvers.values()]
+        backoff = 1.0
+        try:
+            while self.running:
+                try:
+                    await self._session()
+                    backoff = 1.0
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError) as e:
+                    print(f"⚠️ Worker {self.worker_id}: connection lost ({e.__class__.__name__})")
+                if self.running:
+                    await asyncio.sleep(backoff * random.uniform(0.8, 1.2))
+                    backoff = min(backoff * 2, 30.0)
+        finally:
+            for agent in self.solvers.values():
+                await agent.stop()
+            for task in agents:
+                task.cancel()
+            await self.wallet.close()
+
+    async def stop(self):
+        self.running = False
+        if self._writer is not None:
+            self._writer.close()
+
+    async def _session(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(encode_frame(HELLO, codec.dumps_bytes({
+                "worker": self.worker_id,
+                "token": self.token,
+                "credits": self.window,
+                "agents": [
+                    {"agent_id": a.state.agent_id, "address": address}
+                    for address, a in self.solvers.items()
+                ],
+            })))
+            await writer.drain()
+            kind, body = await asyncio.wait_for(read_frame(reader), 30.0)
+            welcome = codec.loads(body)
+            if kind != WELCOME or "error" in welcome:
+                raise ConnectionError(welcome.get("error", "no welcome"))
+            interval = welcome["heartbeat"]
+
+            self._writer = writer
+            self._consumed = 0
+            self.connects += 1
+            print(f"🛰️ Worker {self.worker_id} connected to {self.host}:{self.port}")
+            helpers = [
+                asyncio.create_task(self._heartbeat_loop(interval)),
+                asyncio.create_task(self._credit_loop()),
+                asyncio.create_task(self._stats_loop()),
+            ]
+            try:
+                while self.running:
+                    kind, body = await asyncio.wait_for(read_frame(reader), interval * 3)
+                    if kind == MESSAGE:
+                        message, recipient = unpack_message(body)
+                        if message is None:
+                            self._consumed += 1
+                        elif self._missing_blobs(message):
+                            # Can't wait here: the blobs arrive on this same loop
+                            asyncio.create_task(self._deliver(message, recipient))
+                        else:
+                            await self._deliver(message, recipient)
+                    elif kind == BLOB:
+                        await self._blob_arrived(body)
+            finally:
+                for task in helpers:
+                    task.cancel()
+        finally:
+            self._writer = None
+            writer.close()
+            for future in self._blob_requests.values():
+                future.cancel()
+            self._blob_requests.clear()
+
+    async def _heartbeat_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self._send(HEARTBEAT)
+
+    async def _credit_loop(self):
+        """Return credits for delivered messages while the solvers keep up with them."""
+        while True:
+            await asyncio.sleep(0.05)
+            backlog = sum(agent.message_queue.qsize() for agent in self.solvers.values())
+            if self._consumed and backlog < self.window:
+                credits, self._consumed = self._consumed, 0
+                await self._send(CREDIT, codec.dumps_bytes({"credits": credits}))
+
+    async def _stats_loop(self):
+        while True:
+            await self._send(STATS, codec.dumps_bytes({
+                agent.state.agent_id: agent.get_stats() for agent in self.solvers.values()
+            }))
+            await asyncio.sleep(1.0)
+
+    # Delivery
+
+    async def _deliver(self, message: SwarmMessage, recipient: Optional[str]):
+        try:
+            await self._fetch_blobs(message)
+            if recipient is None:
+                for agent in self.solvers.values():
+                    await agent.receive_message(message)
+            else:
+                agent = self.solvers.get(recipient)
+                if agent is not None:
+                    await agent.receive_message(message)
+        finally:
+            self._consumed += 1
+
+    def _missing_blobs(self, message: SwarmMessage) -> List[str]:
+        input_data = message.data.get("input_data")
+        if not isinstance(input_data, dict):
+            return []
+        return [
+            value[BLOB_REF] for value in input_data.values()
+            if is_blob_ref(value) and value[BLOB_REF] not in self.blobs
+        ]
+
+    async def _fetch_blobs(self, message: SwarmMessage):
+        """Pull task inputs this node's blob store doesn't have from the server."""
+        for digest in self._missing_blobs(message):
+            future = self._blob_requests.get(digest)
+            if future is None:
+                future = self._blob_requests[digest] = asyncio.get_running_loop().create_future()
+                await self._send(BLOB_GET, digest.encode())
+            try:
+                await asyncio.wait_for(asyncio.shield(future), 10.0)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass    # the solver drops the task when it can't resolve the input
+
+    async def _blob_arrived(self, body: bytes):
+        digest, data = body[:_DIGEST_LEN].decode(), body[_DIGEST_LEN:]
+        future = self._blob_requests.pop(digest, None)
+        if data and digest_of(data) == digest:
+            await self.blobs.put(data)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    def stats(self) -> Dict:
+        return {
+            "worker": self.worker_id,
+            "connected": self._writer is not None,
+            "connects": self.connects,
+            "solvers": len(self.solvers),
+            "forwarded": self.forwarded,
+            "dropped": self.dropped,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a remote solver worker node.")
+    parser.add_argument("--host", default=os.getenv("REMOTE_WORKERS_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("REMOTE_WORKERS_PORT", "8765")))
+    parser.add_argument("--solvers", type=int, default=4)
+    parser.add_argument("--worker-id", default=None)
+    parser.add_argument("--credits", type=int, default=64, help="messages in flight before the server waits")
+    args = parser.parse_args()
+
+    async def run():
+        worker = RemoteWorker(
+            args.host,
+            args.port,
+            num_solvers=args.solvers,
+            worker_id=args.worker_id,
+            token=os.getenv("REMOTE_WORKERS_TOKEN") or None,
+            credits=args.credits,
+            mock_mode=os.getenv("MOCK_MODE", "true").lower() == "true",
+            rpc_url=os.getenv("KASPA_RPC_URL", "https://api.kaspa.org"),
+        )
+        await worker.initialize()
+        await worker.run()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Event-driven agent scheduler.
+
+In the default mode every agent runs two coroutines of its own: a message
+loop that wakes once a second even when idle, and a decision loop that
+polls on a sleep. At 10k agents that is 20k coroutines waking for nothing,
+and a solver waits up to 2s before starting work it has already been given.
+
+Under the scheduler, agents are callbacks:
+
+- receive_message() queues the message and wakes the agent; a fixed pool of
+  worker coroutines drains woken agents from one ready queue, a few
+  messages at a time so one busy agent can't starve the rest. An agent is
+  never drained by two workers at once, so its messages stay in order.
+- Periodic behaviour (a coordinator posting its next task) is a timer on
+  the event loop, armed from on_scheduled() and re-armed by the callback.
+- Work a solver has been given starts when the bid or assignment lands,
+  not on the next poll.
+
+Idle agents cost nothing: no coroutine of theirs is scheduled until a
+message or timer arrives.
+"""
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Set
+
+from backend.agents.base_agent import BaseAgent
+
+
+class AgentScheduler:
+    """Runs agents' message handling and timers on a shared pool of workers."""
+
+    def __init__(self, workers: int = 32, batch: int = 8):
+        self.workers = max(1, workers)
+        self.batch = max(1, batch)     # messages handled per wakeup before yielding the worker
+        self.running = False
+        self._stopped = False
+
+        self._ready: Deque = deque()   # agents with messages, and due timer callbacks
+        self._scheduled: Set[BaseAgent] = set()
+        self._wakeup = asyncio.Event()
+        self._agents: Dict[str, BaseAgent] = {}
+
+        self.wakeups = 0
+        self.messages = 0
+        self.timers = 0
+        self.errors = 0
+
+    # ── Agents ──────────────────────────────────────────────
+
+    def add(self, agent: BaseAgent):
+        """Take over an agent: from now on it only runs when woken."""
+        if self._stopped:
+            return    # picked up by the next scheduler start_swarm() creates
+        self._agents[agent.state.agent_id] = agent
+        agent.scheduler = self
+        agent.running = True
+        agent.on_scheduled()
+        if not agent.message_queue.empty():
+            self.wake(agent)
+
+    def remove(self, agent: BaseAgent):
+        self._agents.pop(agent.state.agent_id, None)
+        agent.scheduler = None
+
+    def wake(self, agent: BaseAgent):
+        """Mark an agent as having messages to handle."""
+        if agent in self._scheduled:
+            return
+        self._scheduled.add(agent)
+        self._ready.append(agent)
+        self._wakeup.set()
+
+    def wake_all(self):
+        """Wake every agent with queued messages (e.g. after a pause)."""
+        for agent in self._agents.values():
+            if not agent.message_queue.empty():
+                self.wake(agent)
+
+    def call_later(self, delay: float, callback: Callable[..., Awaitable], *args) -> asyncio.TimerHandle:
+        """Run a coroutine function on the worker pool after `delay` seconds."""
+        return asyncio.get_running_loop().call_later(delay, self._due, callback, args)
+
+    def _due(self, callback: Callable[..., Awaitable], args: tuple):
+        if self._stopped:
+            return    # timer armed before stop(); nobody drains the queue anymore
+        self._ready.append((callback, args))
+        self._wakeup.set()
+
+    # ── Workers ─────────────────────────────────────────────
+
+    async def run(self):
+        """Run the worker pool until stopped."""
+        self.running = True
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    def stop(self):
+        """Stop the workers and detach every agent, so their timers stop re-arming."""
+        self.running = False
+        self._stopped = True
+        for agent in self._agents.values():
+            if agent.scheduler is self:
+                agent.scheduler = None
+        self._agents.clear()
+        self._ready.clear()
+        self._scheduled.clear()
+        self._wakeup.set()
+
+    async def _worker(self):
+        while self.running:
+            if not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            job = self._ready.popleft()
+            if isinstance(job, tuple):
+                self.timers += 1
+                callback, args = job
+                try:
+                    await callback(*args)
+                except Exception as e:
+                    self.errors += 1
+                    print(f"Error in scheduled callback {getattr(callback, '__qualname__', callback)}: {e}")
+            else:
+                await self._drain(job)
+
+    async def _drain(self, agent: BaseAgent):
+        self.wakeups += 1
+        queue = agent.message_queue
+        handled = 0
+        while agent.running and handled < self.batch and not queue.empty():
+            message = queue.get_nowait()
+            handled += 1
+            try:
+                await agent.process_message(message)
+            except Exception as e:
+                self.errors += 1
+                print(f"Error processing message in {agent.state.agent_id}: {e}")
+        self.messages += handled
+        if agent.running and not queue.empty() and agent.scheduler is self:
+            # More to do: back of the line, so other agents get a turn
+            self._ready.append(agent)
+        else:
+            # Paused agents keep their messages until wake_all()
+            self._scheduled.discard(agent)
+
+    def stats(self) -> Dict:
+        return {
+            "agents": len(self._agents),
+            "workers": self.workers,
+            "ready": len(self._ready),
+            "wakeups": self.wakeups,
+            "messages": self.messages,
+            "timers": self.timers,
+            "errors": self.errors,
+        }
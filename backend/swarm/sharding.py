@@ -0,0 +1,490 @@
+"""
+Sharded swarm: agents partitioned across worker processes.
+
+A single SwarmOrchestrator runs every agent, all signing and every
+solve_task on one event loop, so the swarm never uses more than one core.
+In sharded mode (SWARM_SHARDS > 1) the API process runs no agents itself:
+
+    API process                              worker processes (spawned)
+    ShardedSwarm ── ShardHub ◄─ Unix socket ─► ShardLink ── SwarmOrchestrator
+                    (routes by address,                     (agents i, i+N, i+2N…)
+                     aggregates stats)
+
+- Each worker runs a normal SwarmOrchestrator over its slice of the agents,
+  on its own loop. Messages between its own agents never leave the process.
+- Messages for agents elsewhere are forwarded to the hub as frames carrying
+  the binary transaction payload and the recipient address. The hub sends
+  them to the shard that owns the recipient; announcements (and messages
+  for unknown recipients) go to every other shard.
+- Workers push their swarm stats to the hub twice a second; the API reads
+  the merged snapshot, so a dashboard poll never waits on a worker.
+- Control calls (pause, add agent, …) are forwarded as request/reply frames.
+
+Task inputs offloaded to the blob store are shared through BLOB_STORE_DIR,
+which all workers on one machine read.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import struct
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from backend.kaspa import codec
+from backend.kaspa.transaction import SwarmMessage, TransactionEncoder
+
+
+# Frame: u32 body length, u8 kind, body
+_FRAME = struct.Struct("<IB")
+# Message body: u16 recipient length, recipient, binary payload
+_ROUTE = struct.Struct("<H")
+
+HELLO = 1      # worker → hub: {"shard", "addresses"} (resent when its agents change)
+MESSAGE = 2    # both ways: a SwarmMessage to route
+STATS = 3      # worker → hub: {"swarm", "completed", "failed"}
+CALL = 4       # hub → worker: {"id", "op", "args"}
+REPLY = 5      # worker → hub: {"id", "result"}
+
+# Orchestrator methods the API may call on every shard
+_CALLS = {
+    "pause", "resume", "set_task_frequency", "reset_swarm",
+    "manual_task_creation", "add_agent", "remove_agent",
+}
+
+
+def encode_frame(kind: int, body: bytes) -> bytes:
+    return _FRAME.pack(len(body), kind) + body
+
+
+async def read_frame(reader: asyncio.StreamReader):
+    """(kind, body) of the next frame; IncompleteReadError once the peer is gone."""
+    length, kind = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    return kind, await reader.readexactly(length)
+
+
+def pack_message(message: SwarmMessage, recipient: Optional[str]) -> bytes:
+    recipient_bytes = (recipient or "").encode()
+    return _ROUTE.pack(len(recipient_bytes)) + recipient_bytes + TransactionEncoder.encode_payload(message)
+
+
+def unpack_recipient(body: bytes) -> str:
+    (length,) = _ROUTE.unpack_from(body)
+    return body[_ROUTE.size:_ROUTE.size + length].decode()
+
+
+def unpack_message(body: bytes):
+    """(message, recipient or None) from a MESSAGE body; message is None if undecodable."""
+    (length,) = _ROUTE.unpack_from(body)
+    start = _ROUTE.size + length
+    recipient = body[_ROUTE.size:start].decode() or None
+    return TransactionEncoder.decode_payload(body[start:]), recipient
+
+
+# ── Worker side ─────────────────────────────────────────────
+
+class ShardLink:
+    """A worker's connection to the hub: forwards outbound messages, serves inbound ones."""
+
+    def __init__(self, orchestrator, socket_path: str, stats_interval: float = 0.5):
+        self.orchestrator = orchestrator
+        self.socket_path = socket_path
+        self.stats_interval = stats_interval
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._announced_version = -1
+        self._stopped = asyncio.Event()
+
+        self.forwarded = 0
+        self.received = 0
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+        await self._hello()
+
+    async def _send(self, kind: int, body: bytes):
+        self._writer.write(encode_frame(kind, body))
+        await self._writer.drain()
+
+    async def _hello(self):
+        agents = self.orchestrator.agents
+        self._announced_version = agents.version
+        await self._send(HELLO, codec.dumps_bytes({
+            "shard": self.orchestrator.shard,
+            "addresses": agents.addresses(),
+        }))
+
+    async def forward(self, message: SwarmMessage, recipient: Optional[str]):
+        """Send a locally sent message to the hub, unless its recipient is local."""
+        if recipient and self.orchestrator.agents.by_address(recipient) is not None:
+            return
+        self.forwarded += 1
+        await self._send(MESSAGE, pack_message(message, recipient))
+
+    async def run(self):
+        """Serve hub frames until the hub closes the connection or asks us to stop."""
+        stats_task = asyncio.create_task(self._stats_loop())
+        try:
+            while not self._stopped.is_set():
+                kind, body = await read_frame(self._reader)
+                if kind == MESSAGE:
+                    message, recipient = unpack_message(body)
+                    if message is not None:
+                        self.received += 1
+                        await self.orchestrator.deliver_message(message, recipient)
+                elif kind == CALL:
+                    asyncio.create_task(self._call(codec.loads(body)))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            stats_task.cancel()
+
+    async def _call(self, request: Dict):
+        op, args = request["op"], request.get("args", [])
+        try:
+            if op == "start":
+                asyncio.create_task(self.orchestrator.start_swarm())
+                result = True
+            elif op == "stop":
+                await self.orchestrator.stop_swarm()
+                self._stopped.set()
+                result = True
+            elif op in _CALLS:
+                result = await getattr(self.orchestrator, op)(*args)
+            else:
+                result = {"error": f"unknown call {op}"}
+        except Exception as e:
+            result = {"error": str(e)}
+        if self.orchestrator.agents.version != self._announced_version:
+            await self._hello()
+        await self._send(REPLY, codec.dumps_bytes({"id": request["id"], "result": result}))
+        if self._stopped.is_set():
+            self._writer.close()
+
+    async def _stats_loop(self):
+        history = self.orchestrator.task_history
+        while True:
+            if self.orchestrator.agents.version != self._announced_version:
+                await self._hello()
+            await self._send(STATS, codec.dumps_bytes({
+                "swarm": self.orchestrator.get_swarm_stats(),
+                "completed": history.count("completed"),
+                "failed": history.count("failed"),
+                "forwarded": self.forwarded,
+                "received": self.received,
+            }))
+            await asyncio.sleep(self.stats_interval)
+
+
+def run_shard(shard: int, shard_count: int, socket_path: str, config: Dict):
+    """Worker process entry point: run one shard of the swarm until told to stop."""
+    asyncio.run(_run_shard(shard, shard_count, socket_path, config))
+
+
+async def _run_shard(shard: int, shard_count: int, socket_path: str, config: Dict):
+    from backend.kaspa.wallet import KaspaWallet
+    from backend.swarm.protocol import SwarmOrchestrator
+
+    wallet = KaspaWallet(
+        rpc_url=config.get("rpc_url", "https://api.kaspa.org"),
+        mock_mode=config.get("mock_mode", True),
+        address_namespace=f"shard{shard}/",
+        # Shard 0 creates agent 0, the one that gets the funded env key unsharded
+        use_env_credentials=shard == 0,
+    )
+    archive_path = config.get("task_archive_path")
+    orchestrator = SwarmOrchestrator(
+        wallet=wallet,
+        num_coordinators=config.get("num_coordinators", 2),
+        num_solvers=config.get("num_solvers", 8),
+        mock_mode=config.get("mock_mode", True),
+        balance_refresh_interval=config.get("balance_refresh_interval", 10.0),
+        balance_refresh_chunk=config.get("balance_refresh_chunk", 500),
+        task_history_size=config.get("task_history_size", 1000),
+        task_archive_path=f"{archive_path}.shard{shard}" if archive_path else None,
+        shard=shard,
+        shard_count=shard_count,
+        use_scheduler=config.get("use_scheduler", False),
+    )
+    await orchestrator.initialize_swarm()
+
+    link = ShardLink(orchestrator, socket_path)
+    await link.connect()
+    orchestrator.shard_link = link
+    try:
+        await link.run()
+    finally:
+        if orchestrator.running:
+            await orchestrator.stop_swarm()
+        await wallet.close()
+
+
+# ── API side ────────────────────────────────────────────────
+
+class ShardHub:
+    """Unix-socket hub the workers connect to: routes their messages and keeps their stats."""
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self._server = None
+        self._writers: Dict[int, asyncio.StreamWriter] = {}
+        self._handlers: Set[asyncio.Task] = set()    # one _serve task per connected worker
+        self._owner: Dict[str, int] = {}             # agent address → shard
+        self._addresses: Dict[int, List[str]] = {}
+        self._calls: Dict[int, asyncio.Future] = {}
+        self._next_call = 0
+        self.shard_stats: Dict[int, Dict] = {}
+
+        self.routed = 0
+        self.fanned_out = 0
+        self.dropped = 0
+
+    async def start(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._serve, path=self.socket_path)
+
+    async def close(self):
+        handlers = list(self._handlers)
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    @property
+    def connected(self) -> List[int]:
+        return sorted(self._writers)
+
+    def _set_addresses(self, shard: int, addresses: List[str]):
+        for address in self._addresses.get(shard, ()):
+            if self._owner.get(address) == shard:
+                del self._owner[address]
+        self._addresses[shard] = addresses
+        for address in addresses:
+            self._owner[address] = shard
+
+    async def _send(self, shard: int, kind: int, body: bytes) -> bool:
+        writer = self._writers.get(shard)
+        if writer is None:
+            return False
+        try:
+            writer.write(encode_frame(kind, body))
+            await writer.drain()
+            return True
+        except ConnectionError:
+            return False
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        shard = None
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            kind, body = await read_frame(reader)
+            if kind != HELLO:
+                return
+            hello = codec.loads(body)
+            shard = hello["shard"]
+            self._writers[shard] = writer
+            self._set_addresses(shard, hello["addresses"])
+            print(f"🧩 Shard {shard} connected ({len(hello['addresses'])} agents)")
+
+            while True:
+                kind, body = await read_frame(reader)
+                if kind == MESSAGE:
+                    await self._route(shard, body)
+                elif kind == STATS:
+                    self.shard_stats[shard] = codec.loads(body)
+                elif kind == HELLO:
+                    self._set_addresses(shard, codec.loads(body)["addresses"])
+                elif kind == REPLY:
+                    reply = codec.loads(body)
+                    future = self._calls.pop(reply["id"], None)
+                    if future is not None and not future.done():
+                        future.set_result(reply["result"])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # close(): end quietly, the stream server logs handlers that finish cancelled
+            pass
+        finally:
+            self._handlers.discard(handler)
+            if shard is not None and self._writers.get(shard) is writer:
+                del self._writers[shard]
+                self._set_addresses(shard, [])
+                print(f"🧩 Shard {shard} disconnected")
+            writer.close()
+
+    async def _route(self, origin: int, body: bytes):
+        owner = self._owner.get(unpack_recipient(body))
+        if owner is not None:
+            # Addressed to an agent: only its shard
+            if owner != origin and await self._send(owner, MESSAGE, body):
+                self.routed += 1
+            else:
+                self.dropped += 1
+            return
+        # Broadcast (or recipient unknown): every other shard
+        self.fanned_out += 1
+        for shard in list(self._writers):
+            if shard != origin:
+                await self._send(shard, MESSAGE, body)
+
+    async def call(self, shard: int, op: str, *args, timeout: float = 10.0) -> Any:
+        """Run an orchestrator method on one shard and return its result."""
+        self._next_call += 1
+        call_id = self._next_call
+        future = asyncio.get_running_loop().create_future()
+        self._calls[call_id] = future
+        if not await self._send(shard, CALL, codec.dumps_bytes({"id": call_id, "op": op, "args": list(args)})):
+            self._calls.pop(call_id, None)
+            return {"error": f"shard {shard} not connected"}
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._calls.pop(call_id, None)
+            return {"error": f"shard {shard} timed out"}
+
+    async def call_all(self, op: str, *args) -> List[Any]:
+        return await asyncio.gather(*(self.call(shard, op, *args) for shard in self.connected))
+
+    def stats(self) -> Dict:
+        return {
+            "socket": self.socket_path,
+            "connected": self.connected,
+            "agents": {str(shard): len(addresses) for shard, addresses in self._addresses.items()},
+            "routed": self.routed,
+            "fanned_out": self.fanned_out,
+            "dropped": self.dropped,
+            "shards": {
+                str(shard): {"forwarded": s.get("forwarded", 0), "received": s.get("received", 0)}
+                for shard, s in self.shard_stats.items()
+            },
+        }
+
+
+class ShardedSwarm:
+    """
+    Stands in for SwarmOrchestrator in the API process when the swarm is
+    sharded: spawns the workers, forwards control calls and merges their
+    stats.
+    """
+
+    def __init__(
+        self,
+        shard_count: int,
+        num_coordinators: int = 2,
+        num_solvers: int = 8,
+        mock_mode: bool = True,
+        socket_path: Optional[str] = None,
+        shard_config: Optional[Dict] = None,
+    ):
+        self.shard_count = max(1, shard_count)
+        self.num_coordinators = num_coordinators
+        self.num_solvers = num_solvers
+        self.mock_mode = mock_mode
+        self.socket_path = socket_path or os.path.join(tempfile.gettempdir(), f"kaspaswarm-{os.getpid()}.sock")
+        self.config = dict(shard_config or {}, num_coordinators=num_coordinators,
+                           num_solvers=num_solvers, mock_mode=mock_mode)
+        self.hub = ShardHub(self.socket_path)
+        self.processes: List[multiprocessing.Process] = []
+        self.running = False
+        self.ingestor = None   # each shard routes over the hub instead
+
+    async def initialize_swarm(self, timeout: float = 60.0):
+        """Start the hub, spawn the workers and wait for all of them to connect."""
+        await self.hub.start()
+        # spawn, not fork: the parent already has a running event loop
+        context = multiprocessing.get_context("spawn")
+        for shard in range(self.shard_count):
+            process = context.Process(
+                target=run_shard,
+                args=(shard, self.shard_count, self.socket_path, self.config),
+                name=f"kaspaswarm-shard-{shard}",
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+        deadline = time.time() + timeout
+        while len(self.hub.connected) < self.shard_count:
+            if time.time() > deadline or not any(p.is_alive() for p in self.processes):
+                raise RuntimeError(f"Only {len(self.hub.connected)}/{self.shard_count} shards came up")
+            await asyncio.sleep(0.1)
+        print(f"✅ Sharded swarm ready: {self.shard_count} worker processes")
+
+    async def start_swarm(self):
+        self.running = True
+        await self.hub.call_all("start")
+
+    async def stop_swarm(self):
+        self.running = False
+        await self.hub.call_all("stop")
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        await self.hub.close()
+
+    def get_swarm_stats(self) -> Dict:
+        """Merge the latest stats each shard pushed (no round trip to the workers)."""
+        shards = [self.hub.shard_stats[s] for s in sorted(self.hub.shard_stats)]
+        swarms = [s["swarm"] for s in shards]
+        completed = sum(s["completed"] for s in shards)
+        failed = sum(s["failed"] for s in shards)
+        finished = completed + failed
+        transactions = sorted(
+            (tx for swarm in swarms for tx in swarm["transactions"]), key=lambda tx: tx["timestamp"]
+        )
+        task_history = sorted(
+            (task for swarm in swarms for task in swarm["task_history"]), key=lambda task: task["created_at"]
+        )
+        return {
+            "timestamp": time.time(),
+            "total_agents": sum(swarm["total_agents"] for swarm in swarms),
+            "coordinators_count": sum(swarm["coordinators_count"] for swarm in swarms),
+            "solvers_count": sum(swarm["solvers_count"] for swarm in swarms),
+            "active_tasks": sum(swarm["active_tasks"] for swarm in swarms),
+            "completed_tasks": sum(swarm["completed_tasks"] for swarm in swarms),
+            "success_rate": (completed / finished * 100) if finished > 0 else 0.0,
+            "mode": "mock" if self.mock_mode else "live",
+            "shards": len(swarms),
+            "transactions": transactions[-30:],
+            "task_history": task_history[-50:],
+            "agents": {
+                "coordinators": [a for swarm in swarms for a in swarm["agents"]["coordinators"]],
+                "solvers": [a for swarm in swarms for a in swarm["agents"]["solvers"]],
+            },
+        }
+
+    # Control methods
+
+    async def pause(self):
+        await self.hub.call_all("pause")
+
+    async def resume(self):
+        await self.hub.call_all("resume")
+
+    async def set_task_frequency(self, min_interval: float, max_interval: float):
+        await self.hub.call_all("set_task_frequency", min_interval, max_interval)
+
+    async def reset_swarm(self):
+        await self.hub.call_all("reset_swarm")
+
+    async def manual_task_creation(self, target: int, reward: int, task_type_str: str = "prime_finding"):
+        # coordinator_0 lives in shard 0
+        return await self.hub.call(0, "manual_task_creation", target, reward, task_type_str)
+
+    async def add_agent(self, role: str, skill_level: float = 1.0):
+        # Onto the shard with the fewest agents
+        agents = self.hub.stats()["agents"]
+        shard = min(self.hub.connected, key=lambda s: agents.get(str(s), 0))
+        return await self.hub.call(shard, "add_agent", role, skill_level)
+
+    async def remove_agent(self, agent_id: str):
+        results = await self.hub.call_all("remove_agent", agent_id)
+        return any(result is True for result in results)
@@ -0,0 +1,59 @@
+"""
+Incrementally maintained swarm statistics.
+
+get_swarm_stats used to rebuild every agent's stats dict and re-sum the
+swarm totals for each dashboard broadcast. Here each agent keeps one stats
+record that it updates in place when its state changes, reporting the
+change in its active/completed counts, so:
+
+- swarm totals are adjusted at event time, never re-summed;
+- the per-role lists of records are built once per registry change and
+  reused, since the records in them update themselves.
+"""
+
+from typing import Dict, List
+
+from backend.agents.base_agent import BaseAgent
+from backend.swarm.registry import AgentRegistry
+
+
+class SwarmStats:
+    """Swarm-wide totals and per-role agent stat records, kept current by the agents."""
+
+    def __init__(self, agents: AgentRegistry):
+        self.agents = agents
+        self.active_tasks = 0
+        self.completed_tasks = 0
+
+        self._records: Dict[str, List[Dict]] = {}
+        self._records_version = -1
+
+    def track(self, agent: BaseAgent):
+        """Start counting an agent (call once it's in the registry)."""
+        record = agent.get_stats()
+        self.active_tasks += record["active_tasks"]
+        self.completed_tasks += record["completed_tasks"]
+        agent.stats_listener = self
+
+    def untrack(self, agent: BaseAgent):
+        if agent.stats_listener is not self:
+            return
+        record = agent.get_stats()
+        self.active_tasks -= record["active_tasks"]
+        self.completed_tasks -= record["completed_tasks"]
+        agent.stats_listener = None
+
+    def changed(self, active_delta: int, completed_delta: int):
+        """Called by an agent after it refreshed its record."""
+        self.active_tasks += active_delta
+        self.completed_tasks += completed_delta
+
+    def records(self, role: str) -> List[Dict]:
+        """Live stat records of the agents with a role."""
+        if self._records_version != self.agents.version:
+            self._records = {}
+            self._records_version = self.agents.version
+        records = self._records.get(role)
+        if records is None:
+            records = self._records[role] = [a.get_stats() for a in self.agents.role(role)]
+        return records
@@ -0,0 +1,228 @@
+"""
+Task lifecycle history.
+
+The orchestrator used to keep every task it ever saw in a list, scanned
+linearly for each lifecycle event, with an event log per task that never
+stopped growing. This store keeps:
+
+- a hot window of the most recent tasks, indexed by task ID, so recording an
+  event is O(1) however long the swarm has been running;
+- at most max_events events per task (the newest);
+- an append-only JSONL archive that tasks are evicted to once the hot window
+  is full, with a byte-offset index so archived tasks can be paged through
+  without reading the whole file, and a task ID index so an archived task
+  is found with a single seek;
+- running counts of finished tasks, so the success rate still covers tasks
+  that have left the hot window.
+"""
+
+import os
+import re
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+
+from backend.kaspa import codec
+
+
+FINISHED = ("completed", "failed")
+
+# Entries are created with task_id as their first key
+_TASK_ID = re.compile(rb'\{"task_id":(\d+),')
+
+
+class TaskHistory:
+    """Task-ID-indexed hot window of task lifecycles, evicting to a JSONL archive."""
+
+    def __init__(
+        self,
+        hot_size: int = 1000,
+        max_events: int = 50,
+        archive_path: Optional[str] = None,
+    ):
+        self.hot_size = max(1, hot_size)
+        self.max_events = max(1, max_events)
+        self.archive_path = archive_path or None   # None: evicted tasks are dropped
+
+        self._hot: "OrderedDict[int, Dict]" = OrderedDict()
+        self._counts: Dict[str, int] = {}
+        self._archive = None
+        self._offsets = array("Q")   # start of each archived line, oldest first
+        self._archived_at: Dict[int, int] = {}   # task ID → offset of its newest archived line
+        self._reader = None
+        self._archive_end = 0
+
+        self.events = 0
+        self.evicted = 0
+
+        if self.archive_path:
+            self._open_archive()
+
+    # ── Archive ─────────────────────────────────────────────
+
+    def _open_archive(self):
+        directory = os.path.dirname(self.archive_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Index what earlier runs archived, so paging covers them too
+        offset = 0
+        if os.path.exists(self.archive_path):
+            with open(self.archive_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break   # last line cut short by a crash
+                    self._offsets.append(offset)
+                    match = _TASK_ID.match(line)
+                    task_id = int(match.group(1)) if match else codec.loads(line).get("task_id")
+                    self._archived_at[task_id] = offset
+                    offset += len(line)
+            os.truncate(self.archive_path, offset)
+        self._archive = open(self.archive_path, "ab")
+        self._archive_end = offset
+
+    def _evict(self):
+        _, entry = self._hot.popitem(last=False)
+        self.evicted += 1
+        if self._archive is None:
+            return
+        line = codec.dumps_bytes(entry) + b"\n"
+        self._archive.write(line)
+        self._offsets.append(self._archive_end)
+        self._archived_at[entry["task_id"]] = self._archive_end
+        self._archive_end += len(line)
+
+    def _read_at(self, offset: int) -> Dict:
+        """Parse the archived line starting at `offset`."""
+        self._archive.flush()
+        if self._reader is None:
+            self._reader = open(self.archive_path, "rb")
+        self._reader.seek(offset)
+        return codec.loads(self._reader.readline())
+
+    # ── Recording ───────────────────────────────────────────
+
+    def record(self, task_id: int, event: str, data: Dict) -> Dict:
+        """Add a lifecycle event to a task's entry, creating the entry if needed."""
+        now = time.time()
+        entry = self._hot.get(task_id)
+        if entry is None:
+            entry = {
+                "task_id": task_id,
+                "status": event,
+                "events": [],
+                "created_at": now,
+            }
+            self._hot[task_id] = entry
+            if len(self._hot) > self.hot_size:
+                self._evict()
+        elif entry["status"] in FINISHED:
+            self._counts[entry["status"]] -= 1
+
+        # Update task entry
+        entry["status"] = event
+        if event in FINISHED:
+            self._counts[event] = self._counts.get(event, 0) + 1
+        events = entry["events"]
+        events.append({
+            "type": event,
+            "timestamp": now,
+            "data": data
+        })
+        if len(events) > self.max_events:
+            del events[:-self.max_events]
+        self.events += 1
+
+        # Store relevant metadata
+        if event == "created":
+            entry["description"] = data.get("description", "")
+            entry["reward"] = data.get("reward", 0)
+            entry["coordinator"] = data.get("coordinator", "")
+        elif event == "assigned":
+            entry["assigned_to"] = data.get("solver", "")
+            entry["bid_amount"] = data.get("bid_amount", 0)
+        elif event == "completed":
+            entry["solution"] = data.get("solution", 0)
+            entry["completed_at"] = now
+        return entry
+
+    # ── Lookup ──────────────────────────────────────────────
+
+    def get(self, task_id: int) -> Optional[Dict]:
+        """A task's entry from the hot window, else its newest archived record."""
+        entry = self._hot.get(task_id)
+        if entry is not None or self._archive is None:
+            return entry
+        offset = self._archived_at.get(task_id)
+        return self._read_at(offset) if offset is not None else None
+
+    def recent(self, limit: int = 50) -> List[Dict]:
+        """The newest `limit` tasks in the hot window, oldest first."""
+        if limit <= 0:
+            return []
+        entries = []
+        for entry in reversed(self._hot.values()):
+            entries.append(entry)
+            if len(entries) == limit:
+                break
+        entries.reverse()
+        return entries
+
+    def archived(self, offset: int = 0, limit: int = 50) -> Dict:
+        """One page of archived tasks, newest first."""
+        total = len(self._offsets)
+        offset = max(0, offset)
+        limit = max(0, min(limit, 500))
+        tasks = []
+        if self._archive is not None and offset < total and limit:
+            for index in range(total - 1 - offset, max(total - 1 - offset - limit, -1), -1):
+                tasks.append(self._read_at(self._offsets[index]))
+        return {"total": total, "offset": offset, "limit": limit, "tasks": tasks}
+
+    def count(self, status: str) -> int:
+        """Tasks whose last event is `status` (finished statuses include archived tasks)."""
+        if status in FINISHED:
+            return self._counts.get(status, 0)
+        return sum(1 for entry in self._hot.values() if entry["status"] == status)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(tuple(self._hot.values()))
+
+    def __len__(self) -> int:
+        return len(self._hot)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._hot
+
+    # ── Maintenance ─────────────────────────────────────────
+
+    def clear(self):
+        """Forget the hot window and counts (the archive is kept)."""
+        self._hot.clear()
+        self._counts.clear()
+
+    def flush(self):
+        if self._archive is not None:
+            self._archive.flush()
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def stats(self) -> Dict:
+        return {
+            "hot": len(self._hot),
+            "hot_size": self.hot_size,
+            "max_events": self.max_events,
+            "events": self.events,
+            "evicted": self.evicted,
+            "archived": len(self._offsets),
+            "archive_bytes": self._archive_end,
+            "archive_path": self.archive_path,
+            "completed": self._counts.get("completed", 0),
+            "failed": self._counts.get("failed", 0),
+        }
@@ -8,6 +8,7 @@ from enum import Enum
 from typing import Dict, Any, List
 import hashlib
 import random
+import time
 
 class TaskType(Enum):
     PRIME_FINDING = "prime_finding"
@@ -56,10 +57,15 @@ class Task:
             return None
         return min(self.bids, key=lambda x: x["amount"])
     
-    def is_expired(self) -> bool:
-        """Check if deadline has passed (with 5s grace period)."""
-        import time
-        return time.time() > (self.deadline + 5.0)
+    def is_expired(self, now: float = None) -> bool:
+        """Check if deadline has passed (with 5s grace period).
+        
+        Pass `now` when a recent timestamp is already at hand (e.g. the timer
+        wheel's clock) to skip reading the system clock.
+        """
+        if now is None:
+            now = time.time()
+        return now > (self.deadline + 5.0)
 
 # --- Task Verification Logic ---
 
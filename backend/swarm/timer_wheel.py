@@ -0,0 +1,177 @@
+"""
+Hierarchical timer wheel for task deadlines and bidding windows.
+
+Each posted task used to get its own coroutine sleeping through the bidding
+window, the deadline and a grace buffer, and it kept sleeping after the task
+completed. At high task rates that is thousands of parked coroutines and
+timer-heap entries. Here all of them share one wheel:
+
+- schedule() drops a timer into a bucket in O(1); level 0 holds the next
+  `slots` ticks, each level above covers `slots` times the span of the one
+  below, and buckets cascade down a level as the wheel reaches them.
+- cancel() removes the timer from its bucket in O(1), so a task that
+  completes early leaves nothing behind.
+- One event-loop callback per tick drives the wheel, and only while timers
+  are pending: an idle wheel costs nothing.
+
+Timers fire at tick resolution (never early). A callback may be a coroutine
+function; its coroutine is run as a task.
+"""
+
+import asyncio
+import inspect
+import math
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+
+class Timer:
+    """Handle of a scheduled timer."""
+
+    __slots__ = ("wheel", "expires", "callback", "args", "bucket", "cancelled")
+
+    def __init__(self, wheel: "TimerWheel", expires: int, callback: Callable, args: tuple):
+        self.wheel = wheel
+        self.expires = expires          # absolute tick
+        self.callback = callback
+        self.args = args
+        self.bucket: Optional[Set["Timer"]] = None
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop the timer from firing (no-op once fired)."""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self.bucket is not None:
+            self.bucket.discard(self)
+            self.bucket = None
+            self.wheel.pending -= 1
+            self.wheel.cancelled += 1
+
+
+class TimerWheel:
+    """Shared timers with O(1) schedule, cancel and per-tick expiry."""
+
+    def __init__(self, tick: float = 0.1, slots: int = 64, levels: int = 4):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._wheels: List[List[Set[Timer]]] = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._span = [slots ** level for level in range(levels + 1)]   # ticks per bucket at each level
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._started = 0.0     # loop time of tick 0
+        self._now = 0           # ticks processed so far
+        self.clock = time.time()   # wall time as of the last tick, for cheap expiry checks
+
+        self.pending = 0
+        self.fired = 0
+        self.cancelled = 0
+        self.errors = 0
+
+    def schedule(self, delay: float, callback: Callable, *args) -> Timer:
+        """Call `callback(*args)` once `delay` seconds have passed."""
+        if self._handle is None:
+            self._start()
+        elapsed = self._loop.time() - self._started
+        expires = max(self._now + 1, math.ceil((elapsed + max(delay, 0.0)) / self.tick))
+        timer = Timer(self, expires, callback, args)
+        self._insert(timer)
+        return timer
+
+    def clear(self):
+        """Cancel every pending timer."""
+        for wheel in self._wheels:
+            for bucket in wheel:
+                for timer in bucket:
+                    timer.bucket = None
+                    timer.cancelled = True
+                bucket.clear()
+        self.cancelled += self.pending
+        self.pending = 0
+
+    # ── Wheel ───────────────────────────────────────────────
+
+    def _insert(self, timer: Timer):
+        distance = timer.expires - self._now
+        level = 0
+        while level < self.levels - 1 and distance >= self._span[level + 1]:
+            level += 1
+        # Beyond the top level's range: park in its farthest bucket, re-placed on cascade
+        expires = min(timer.expires, self._now + self._span[self.levels] - 1)
+        bucket = self._wheels[level][(expires // self._span[level]) % self.slots]
+        bucket.add(timer)
+        timer.bucket = bucket
+        self.pending += 1
+
+    def _start(self):
+        self._loop = asyncio.get_running_loop()
+        self._started = self._loop.time() - self._now * self.tick
+        self._arm()
+
+    def _arm(self):
+        self._handle = self._loop.call_at(self._started + (self._now + 1) * self.tick, self._advance)
+
+    def _advance(self):
+        self.clock = time.time()
+        due = int((self._loop.time() - self._started) / self.tick)
+        while self._now < due and self.pending:
+            self._now += 1
+            self._cascade()
+            bucket = self._wheels[0][self._now % self.slots]
+            if bucket:
+                expired = list(bucket)
+                bucket.clear()
+                for timer in expired:
+                    timer.bucket = None
+                    self.pending -= 1
+                    self._fire(timer)
+        if self.pending:
+            self._now = max(self._now, due)
+            self._arm()
+        else:
+            # Idle: stop ticking; the next schedule() restarts from the current time
+            self._handle = None
+            self._now = due
+
+    def _cascade(self):
+        """Move timers down from higher levels as the wheel reaches their bucket."""
+        top = 0
+        while top < self.levels - 1 and self._now % self._span[top + 1] == 0:
+            top += 1
+        # Highest level first, so what it hands down is cascaded again this tick
+        for level in range(top, 0, -1):
+            bucket = self._wheels[level][(self._now // self._span[level]) % self.slots]
+            if bucket:
+                moved = list(bucket)
+                bucket.clear()
+                self.pending -= len(moved)
+                for timer in moved:
+                    self._insert(timer)
+
+    def _fire(self, timer: Timer):
+        self.fired += 1
+        try:
+            result = timer.callback(*timer.args)
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(result).add_done_callback(self._check)
+        except Exception as e:
+            self.errors += 1
+            print(f"Error in timer callback {getattr(timer.callback, '__qualname__', timer.callback)}: {e}")
+
+    def _check(self, future: asyncio.Future):
+        if not future.cancelled() and future.exception() is not None:
+            self.errors += 1
+            print(f"Error in timer callback: {future.exception()}")
+
+    def stats(self) -> Dict:
+        return {
+            "tick": self.tick,
+            "pending": self.pending,
+            "fired": self.fired,
+            "cancelled": self.cancelled,
+            "errors": self.errors,
+            "ticking": self._handle is not None,
+        }